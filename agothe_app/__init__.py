@@ -1,6 +1,7 @@
 """Agothe Quantum Consciousness package."""
 
 from .core.quantum_consciousness import (
+    AgentPopulation,
     ConsciousnessAxiom,
     QuantumLearningNetwork,
     QuantumMemoryNetwork,
@@ -10,6 +11,7 @@ from .core.quantum_consciousness import (
 from .services.quantum_environment import QuantumEnvironment, create_environment
 
 __all__ = [
+    "AgentPopulation",
     "ConsciousnessAxiom",
     "QuantumLearningNetwork",
     "QuantumMemoryNetwork",
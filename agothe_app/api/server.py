@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import json
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from .schemas import (
     APIMessage,
@@ -76,6 +79,13 @@ async def evolution(payload: EvolutionRequest) -> dict:
     return environment.run_evolution(payload.generations, payload.mutation_rate)
 
 
+@app.post("/api/evolution/stream")
+async def evolution_stream(payload: EvolutionRequest) -> StreamingResponse:
+    events = environment.stream_evolution(payload.generations, payload.mutation_rate)
+    lines = (json.dumps(event) + "\n" for event in events)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @app.get("/")
 async def root() -> APIMessage:
     return APIMessage(message="Agothe quantum API is alive")
@@ -0,0 +1,4 @@
+"""Performance benchmarks for the Agothe core.
+
+Each module can be executed with ``python -m agothe_app.benchmarks.<name>``.
+"""
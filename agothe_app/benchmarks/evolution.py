@@ -0,0 +1,220 @@
+"""Scaling benchmark for :class:`~agothe_app.core.darwin_evolution_protocol.DarwinEvolutionProtocol`.
+
+For every population size and evolution depth the benchmark times
+``spawn_population`` and ``recursive_consciousness_evolution`` and reports
+wall time, generations per second, agent-generations per second and the peak
+resident set size.  Each case runs in a fresh worker process so the peak RSS
+belongs to that case alone.  The default grid runs every case up to a
+million agents for 100 generations (about two minutes on one core);
+``--max-work`` skips cases whose ``size × depth`` exceeds it for a quicker
+run, and the skipped cases are listed in the output and the report.
+
+``--output`` writes the JSON report and ``--baseline`` compares the run with
+a report written earlier: any case whose evolution time or peak RSS grew by
+more than ``--tolerance`` is listed and the command exits with status 1.
+:data:`REFERENCE_REPORT` (``evolution_baseline.json`` next to this module)
+is the report of the full default grid on the reference machine it records.
+
+Run with ``python -m agothe_app.benchmarks.evolution``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.darwin_evolution_protocol import DarwinEvolutionProtocol
+
+try:  # Not available on Windows.
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_DEPTHS = [1, 10, 100]
+# Metrics compared against the baseline; larger values are worse.
+REGRESSION_METRICS = ("evolve_s", "peak_rss_mb")
+REFERENCE_REPORT = os.path.join(os.path.dirname(__file__), "evolution_baseline.json")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if the platform reports it."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_case(size: int, depth: int, seed: int = 0, repeat: int = 1) -> Dict[str, Any]:
+    """Spawn and evolve one population; times are the best of ``repeat`` runs."""
+
+    spawn_times: List[float] = []
+    evolve_times: List[float] = []
+    for _ in range(repeat):
+        protocol = DarwinEvolutionProtocol(seed=seed)
+        start = time.perf_counter()
+        population = protocol.spawn_population(size)
+        spawn_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        protocol.recursive_consciousness_evolution(population, depth=depth)
+        evolve_times.append(time.perf_counter() - start)
+        del population
+
+    evolve = min(evolve_times)
+    return {
+        "agents": size,
+        "depth": depth,
+        "spawn_s": min(spawn_times),
+        "evolve_s": evolve,
+        "generations_per_s": depth / evolve,
+        "agent_generations_per_s": size * depth / evolve,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _isolated(case: Tuple[int, int, int, int]) -> Dict[str, Any]:
+    return run_case(*case)
+
+
+def skipped_cases(sizes: List[int], depths: List[int], max_work: Optional[float]) -> List[Dict[str, int]]:
+    """Cases of the grid that :func:`run` leaves out under ``max_work``."""
+
+    if max_work is None:
+        return []
+    return [
+        {"agents": size, "depth": depth}
+        for size in sizes
+        for depth in depths
+        if size * depth > max_work
+    ]
+
+
+def run(
+    sizes: List[int],
+    depths: List[int],
+    max_work: Optional[float] = None,
+    seed: int = 0,
+    repeat: int = 1,
+    isolate: bool = True,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        for depth in depths:
+            if max_work is not None and size * depth > max_work:
+                continue
+            case = (size, depth, seed, repeat)
+            if isolate:
+                # A fresh interpreter per case keeps peak RSS from leaking between cases.
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    results.append(executor.submit(_isolated, case).result())
+            else:
+                results.append(run_case(*case))
+    return results
+
+
+def report(
+    results: List[Dict[str, Any]], skipped: Optional[List[Dict[str, int]]] = None
+) -> Dict[str, Any]:
+    """Wrap ``results`` with enough context to judge a later comparison."""
+
+    return {
+        "benchmark": "evolution",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+        "skipped": skipped or [],
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float = 0.25
+) -> List[Dict[str, Any]]:
+    """Cases where a :data:`REGRESSION_METRICS` value grew by more than ``tolerance``."""
+
+    previous = {(row["agents"], row["depth"]): row for row in baseline.get("results", [])}
+    regressions: List[Dict[str, Any]] = []
+    for row in results:
+        old = previous.get((row["agents"], row["depth"]))
+        if old is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = old.get(metric), row.get(metric)
+            if before and after is not None and after > before * (1.0 + tolerance):
+                regressions.append(
+                    {
+                        "agents": row["agents"],
+                        "depth": row["depth"],
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "ratio": after / before,
+                    }
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark evolution scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS)
+    parser.add_argument("--max-work", type=float, help="skip cases with more agent-generations")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-process", action="store_true", help="do not isolate cases (peak RSS accumulates)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument(
+        "--baseline", help=f"compare with a report written by --output, e.g. {REFERENCE_REPORT}"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.depths, args.max_work, args.seed, args.repeat, not args.in_process)
+    print(
+        f"{'agents':>10} {'depth':>6} {'spawn_s':>9} {'evolve_s':>10} "
+        f"{'gen/s':>10} {'agent-gen/s':>12} {'peak_rss_mb':>12}"
+    )
+    for row in results:
+        rss = f"{row['peak_rss_mb']:12.1f}" if row["peak_rss_mb"] is not None else f"{'-':>12}"
+        print(
+            f"{row['agents']:>10} {row['depth']:>6} {row['spawn_s']:9.4f} {row['evolve_s']:10.4f} "
+            f"{row['generations_per_s']:10.2f} {row['agent_generations_per_s']:12.4g} {rss}"
+        )
+    skipped = skipped_cases(args.sizes, args.depths, args.max_work)
+    for case in skipped:
+        print(f"{case['agents']:>10} {case['depth']:>6}  skipped (over --max-work {args.max_work:g})")
+    document = report(results, skipped)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+    print(json.dumps(document))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for item in regressions:
+            print(
+                f"REGRESSION agents={item['agents']} depth={item['depth']} {item['metric']}: "
+                f"{item['baseline']:.4g} -> {item['current']:.4g} ({item['ratio']:.2f}x)"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Memory footprint benchmark for agent populations.
+
+Reports bytes per agent for ``QuantumLearningNetwork``, ``QuantumMemoryNetwork``
+and ``RealityCollapseAxiom`` populations at several sizes, under both the
+``double`` and ``single`` precision policies.  Standalone agents (each created
+on its own, outside any population) are measured as well up to
+``--standalone-limit`` agents for comparison, together with the time per agent
+of constructing them, of ``measure`` and, for learners, of ``quantum_learn``.
+
+Run with ``python -m agothe_app.benchmarks.memory``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from ..core.precision import precision
+from ..core.quantum_consciousness import (
+    AgentPopulation,
+    QuantumLearningNetwork,
+    QuantumMemoryNetwork,
+    RealityCollapseAxiom,
+)
+
+AGENT_CLASSES = (QuantumLearningNetwork, QuantumMemoryNetwork, RealityCollapseAxiom)
+
+
+def _traced_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by ``build`` once its result is alive."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def population_bytes_per_agent(cls: type, size: int, policy: str, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    states = rng.standard_normal((size, 2)) + 1j * rng.standard_normal((size, 2))
+    intents = rng.standard_normal((size, 3))
+    with precision(policy):
+        used = _traced_bytes(lambda: AgentPopulation.from_arrays(states, intents, kinds=cls))
+    return used / size
+
+
+def standalone_bytes_per_agent(cls: type, size: int, policy: str, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    states = rng.standard_normal((size, 2)) + 1j * rng.standard_normal((size, 2))
+    intents = rng.standard_normal((size, 3))
+    with precision(policy):
+        used = _traced_bytes(lambda: [cls(state, intent) for state, intent in zip(states, intents)])
+    return used / size
+
+
+def standalone_timings(cls: type, size: int, policy: str, seed: int = 0) -> Dict[str, float]:
+    """Microseconds per agent spent in the classic single-agent API."""
+
+    rng = np.random.default_rng(seed)
+    states = rng.standard_normal((size, 2)) + 1j * rng.standard_normal((size, 2))
+    intents = rng.standard_normal((size, 3))
+    timings: Dict[str, float] = {}
+    with precision(policy):
+        start = time.perf_counter()
+        agents = [cls(state, intent) for state, intent in zip(states, intents)]
+        timings["construct_us"] = 1e6 * (time.perf_counter() - start) / size
+        if hasattr(cls, "quantum_learn"):
+            start = time.perf_counter()
+            for agent in agents:
+                agent.quantum_learn(0.1)
+            timings["learn_us"] = 1e6 * (time.perf_counter() - start) / size
+        start = time.perf_counter()
+        for agent in agents:
+            agent.measure()
+        timings["measure_us"] = 1e6 * (time.perf_counter() - start) / size
+    return timings
+
+
+def run(sizes: List[int], standalone_limit: int = 100_000) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    for cls in AGENT_CLASSES:
+        for size in sizes:
+            for policy in ("double", "single"):
+                row: Dict[str, object] = {
+                    "class": cls.__name__,
+                    "agents": size,
+                    "precision": policy,
+                    "population": population_bytes_per_agent(cls, size, policy),
+                }
+                if size <= standalone_limit:
+                    row["standalone"] = standalone_bytes_per_agent(cls, size, policy)
+                    row.update(standalone_timings(cls, size, policy))
+                results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bytes per agent")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--standalone-limit", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.standalone_limit)
+    print(
+        f"{'class':>24} {'agents':>10} {'precision':>9} {'population':>11} {'standalone':>11} "
+        f"{'construct_us':>13} {'learn_us':>9} {'measure_us':>11}"
+    )
+
+    def cell(row: Dict[str, object], key: str, width: int) -> str:
+        return f"{row[key]:{width}.1f}" if key in row else f"{'-':>{width}}"
+
+    for row in results:
+        print(
+            f"{row['class']:>24} {row['agents']:>10} {row['precision']:>9} "
+            f"{row['population']:11.1f} {cell(row, 'standalone', 11)} {cell(row, 'construct_us', 13)} "
+            f"{cell(row, 'learn_us', 9)} {cell(row, 'measure_us', 11)}"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Recall and query time of :class:`~agothe_app.core.memory_index.MemoryIndex`.
+
+For every memory count and dimensionality the benchmark indexes random
+Gaussian memories, runs ``--queries`` random queries and compares the top
+``k`` with exact cosine search.  It reports recall@k, the number of probes the
+calibration picked (``-`` when the group stayed on brute force) and the mean
+query time of the index and of a brute-force matrix product.  With
+``--clusters C`` memories and queries are drawn around ``C`` random centres
+instead, the kind of data LSH pays off on.
+
+Run with ``python -m agothe_app.benchmarks.memory_index``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.memory_index import MemoryIndex
+
+
+def run_case(
+    size: int,
+    dim: int,
+    queries: int = 200,
+    k: int = 10,
+    recall_target: Optional[float] = 0.9,
+    seed: int = 0,
+    clusters: int = 0,
+) -> Dict[str, object]:
+    rng = np.random.default_rng(seed)
+
+    def draw(count: int) -> np.ndarray:
+        if not clusters:
+            return rng.standard_normal((count, dim))
+        return centres[rng.integers(clusters, size=count)] + 0.15 * rng.standard_normal((count, dim))
+
+    centres = rng.standard_normal((clusters, dim))
+    vectors = draw(size)
+    units = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = MemoryIndex(recall_target=recall_target)
+    index.extend((row, "memory", vector) for row, vector in enumerate(vectors))
+    group = index._groups[dim]
+
+    probes = draw(queries)
+    hits = 0
+    start = time.perf_counter()
+    found = [{row for row, _, _ in index.query(query, k)} for query in probes]
+    index_s = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for query, rows in zip(probes, found):
+        scores = units @ query
+        exact = np.argpartition(-scores, k - 1)[:k]
+        hits += len(rows.intersection(exact.tolist()))
+    exact_s = (time.perf_counter() - start) / queries
+    lsh = group.tables is not None and group.use_tables and size > index.exact_threshold
+    return {
+        "memories": size,
+        "dim": dim,
+        "clusters": clusters,
+        "recall": hits / (queries * k),
+        "probes": group.probes if lsh else None,
+        "query_ms": 1e3 * index_s,
+        "exact_ms": 1e3 * exact_s,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark memory index recall")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--dims", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--recall-target", type=float, default=0.9, help="0 disables the calibration")
+    parser.add_argument("--clusters", type=int, default=0, help="draw memories around this many centres")
+    args = parser.parse_args()
+
+    target = args.recall_target or None
+    results: List[Dict[str, object]] = [
+        run_case(size, dim, args.queries, args.k, target, clusters=args.clusters)
+        for size in args.sizes
+        for dim in args.dims
+    ]
+    print(f"{'memories':>10} {'dim':>5} {'recall':>8} {'probes':>7} {'query_ms':>9} {'exact_ms':>9}")
+    for row in results:
+        probes = "-" if row["probes"] is None else str(row["probes"])
+        print(
+            f"{row['memories']:>10} {row['dim']:>5} {row['recall']:8.3f} {probes:>7} "
+            f"{row['query_ms']:9.3f} {row['exact_ms']:9.3f}"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
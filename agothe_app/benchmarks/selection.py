@@ -0,0 +1,83 @@
+"""Wall time and convergence benchmark for the selection operators.
+
+For every operator in :data:`~agothe_app.core.selection.SELECTION_OPERATORS`
+and population size, the benchmark times one selection step on its own and a
+run of ``--generations`` full generations, then reports the best and mean
+fitness of the final population.
+
+Run with ``python -m agothe_app.benchmarks.selection``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.darwin_evolution_protocol import DarwinEvolutionProtocol
+from ..core.quantum_consciousness import AgentPopulation
+from ..core.selection import SELECTION_OPERATORS
+
+
+def _population(size: int, rng: np.random.Generator) -> AgentPopulation:
+    states = rng.standard_normal((size, 2)) + 1j * rng.standard_normal((size, 2))
+    return AgentPopulation.from_arrays(states, rng.standard_normal((size, 3)))
+
+
+def run(
+    sizes: List[int],
+    generations: int = 10,
+    operators: Optional[List[str]] = None,
+    pressure: float = 0.65,
+    seed: int = 0,
+) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    for size in sizes:
+        population = _population(size, np.random.default_rng(seed))
+        for name in operators or sorted(SELECTION_OPERATORS):
+            protocol = DarwinEvolutionProtocol(pressure, seed=seed, selection=name)
+            fitness = protocol.evaluate_population(population)
+            start = time.perf_counter()
+            protocol.selection.select(fitness, pressure, protocol.rng)
+            select_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            evolved = protocol.evolve_population(population, generations)
+            elapsed = time.perf_counter() - start
+            final = protocol.evaluate_population(evolved)
+            results.append(
+                {
+                    "operator": name,
+                    "agents": size,
+                    "select_s": select_time,
+                    "generation_s": elapsed / max(generations, 1),
+                    "best": float(final.max()),
+                    "mean": float(final.mean()),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark selection operators")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--operators", nargs="+", choices=sorted(SELECTION_OPERATORS))
+    parser.add_argument("--pressure", type=float, default=0.65)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.generations, args.operators, args.pressure)
+    print(f"{'operator':>11} {'agents':>10} {'select_s':>10} {'generation_s':>13} {'best':>8} {'mean':>8}")
+    for row in results:
+        print(
+            f"{row['operator']:>11} {row['agents']:>10} {row['select_s']:10.4f} "
+            f"{row['generation_s']:13.4f} {row['best']:8.4f} {row['mean']:8.4f}"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
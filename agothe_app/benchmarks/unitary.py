@@ -0,0 +1,78 @@
+"""Throughput benchmark for batched unitary evolution.
+
+Reports agent-gates per second for three strategies:
+
+* ``per_agent`` – ``ConsciousnessAxiom.apply_unitary`` in a Python loop,
+* ``population`` – one ``AgentPopulation.apply_unitary`` call per gate,
+* ``fused`` – a precompiled :class:`~agothe_app.core.gate_engine.GateSequence`.
+
+Run with ``python -m agothe_app.benchmarks.unitary``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from ..core.gate_engine import GateSequence, random_unitary
+from ..core.quantum_consciousness import AgentPopulation
+
+PER_AGENT_LIMIT = 20_000
+
+
+def _population(size: int, dim: int, rng: np.random.Generator) -> AgentPopulation:
+    states = rng.standard_normal((size, dim)) + 1j * rng.standard_normal((size, dim))
+    return AgentPopulation.from_arrays(states)
+
+
+def run(sizes: List[int], gates: int = 16, dim: int = 2, seed: int = 0) -> List[Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    unitaries = [random_unitary(dim, rng) for _ in range(gates)]
+    results: List[Dict[str, float]] = []
+    for size in sizes:
+        population = _population(size, dim, rng)
+        row: Dict[str, float] = {"agents": size, "gates": gates}
+
+        if size <= PER_AGENT_LIMIT:
+            agents = list(population)
+            start = time.perf_counter()
+            for agent in agents:
+                for gate in unitaries:
+                    agent.apply_unitary(gate)
+            row["per_agent"] = size * gates / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for gate in unitaries:
+            population.apply_unitary(gate)
+        row["population"] = size * gates / (time.perf_counter() - start)
+
+        sequence = GateSequence(unitaries, renormalize_every=64)
+        sequence.compile()
+        start = time.perf_counter()
+        sequence.apply(population)
+        row["fused"] = size * gates / (time.perf_counter() - start)
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched unitary evolution")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--gates", type=int, default=16)
+    parser.add_argument("--dim", type=int, default=2)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.gates, args.dim)
+    print(f"{'agents':>10} {'per_agent':>14} {'population':>14} {'fused':>14}  (agent-gates/s)")
+    for row in results:
+        per_agent = f"{row['per_agent']:14.3e}" if "per_agent" in row else f"{'-':>14}"
+        print(f"{row['agents']:>10} {per_agent} {row['population']:14.3e} {row['fused']:14.3e}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
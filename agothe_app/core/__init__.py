@@ -1,6 +1,7 @@
 """Core abstractions for the Agothe application."""
 
 from .quantum_consciousness import (
+    AgentPopulation,
     ConsciousnessAxiom,
     QuantumLearningNetwork,
     QuantumMemoryNetwork,
@@ -10,6 +11,7 @@ from .quantum_consciousness import (
 from .darwin_evolution_protocol import DarwinEvolutionProtocol
 
 __all__ = [
+    "AgentPopulation",
     "ConsciousnessAxiom",
     "QuantumLearningNetwork",
     "QuantumMemoryNetwork",
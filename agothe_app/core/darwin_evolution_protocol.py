@@ -1,20 +1,100 @@
-"""Evolutionary routines for the Agothe quantum agents."""
+"""Evolutionary routines for the Agothe quantum agents.
+
+Generations run directly on the arrays of an :class:`AgentPopulation`:
+fitness is evaluated for every row at once, survivors and parents are picked
+by a vectorised selection operator (see :mod:`agothe_app.core.selection`) and
+all offspring are produced by blending and jittering ``(N, d)`` blocks of
+parent rows.  Fitness values are cached by genome hash, so unchanged
+survivors are not scored again by expensive custom fitness functions.  Agent
+objects are only created when a caller asks for one, such as the best agent
+returned by :meth:`DarwinEvolutionProtocol.recursive_consciousness_evolution`.
+
+:meth:`DarwinEvolutionProtocol.evolve_iter` yields one
+:class:`EvolutionEvent` per generation so progress can be watched live.  For
+long runs the in-memory history can be bounded to the most recent events and
+every event can be appended to a JSON Lines log on disk.
+
+Long experiments can be checkpointed every few generations or every few
+seconds of wall time.  A checkpoint is a population snapshot (see
+:mod:`agothe_app.core.snapshot`) whose header also carries the generation
+counter, the history and the state of the random generator, so
+:meth:`DarwinEvolutionProtocol.resume` continues the run exactly where it
+stopped.
+
+Every event carries diversity metrics in its annotations (see
+:mod:`agothe_app.core.diversity`), and a :class:`NoveltySearch` term can be
+added to the fitness to keep the population from collapsing onto one intent.
+
+With ``objectives`` the protocol runs in a multi-objective (NSGA-II style)
+mode: rows are ranked by Pareto front and crowding distance (see
+:mod:`agothe_app.core.pareto`) instead of a fixed weighting of the
+objectives, and the Pareto front of the final population is reported by
+:meth:`DarwinEvolutionProtocol.summary`.
+"""
 
 from __future__ import annotations
 
+import json
+import os
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Sequence
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
+from .diversity import DEFAULT_SAMPLE, NoveltySearch, diversity_metrics
+from .fitness_cache import FitnessCache, genome_hash
+from .pareto import first_front, pareto_fitness
+from .island_model import evolve_islands
+from .snapshot import load_population, read_header, save_population
+from .selection import SelectionOperator, get_selection, top_rows
 from .quantum_consciousness import (
+    AgentPopulation,
     ConsciousnessAxiom,
     QuantumLearningNetwork,
     QuantumMemoryNetwork,
-    RealityCollapseAxiom,
-    create_bloch_state,
+    _normalize_rows,
+    as_population,
 )
 
+DEFAULT_CACHE_SIZE = 1_000_000
+
+# Maps ``(states, intents)`` row blocks to one fitness value per row.
+FitnessFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+# Maps ``(states, intents)`` row blocks to an ``(N, M)`` array of objectives to maximise.
+ObjectiveFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def default_fitness(states: np.ndarray, intents: np.ndarray) -> np.ndarray:
+    """Blend of coherence (0.7) and squashed intent magnitude (0.3)."""
+
+    probabilities = np.abs(states) ** 2
+    entropy = -np.sum(probabilities * np.log(probabilities + 1e-12), axis=1)
+    intent_norm = np.linalg.norm(intents, axis=1) + 1e-9
+    return 0.7 * np.exp(-entropy) + 0.3 * np.tanh(intent_norm)
+
+
+def default_objectives(states: np.ndarray, intents: np.ndarray) -> np.ndarray:
+    """The two terms of :func:`default_fitness` as separate objectives."""
+
+    probabilities = np.abs(states) ** 2
+    entropy = -np.sum(probabilities * np.log(probabilities + 1e-12), axis=1)
+    intent_norm = np.linalg.norm(intents, axis=1) + 1e-9
+    return np.column_stack([np.exp(-entropy), np.tanh(intent_norm)])
+
 
 @dataclass
 class EvolutionEvent:
@@ -26,20 +106,164 @@ class EvolutionEvent:
     best_fitness: float
     annotations: Dict[str, float] = field(default_factory=dict)
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "population_size": self.population_size,
+            "mean_coherence": self.mean_coherence,
+            "best_fitness": self.best_fitness,
+            "annotations": dict(self.annotations),
+        }
+
 
 class DarwinEvolutionProtocol:
-    """Simplified evolutionary protocol for quantum consciousness agents."""
+    """Simplified evolutionary protocol for quantum consciousness agents.
+
+    ``fitness`` replaces :func:`default_fitness` with any vectorised
+    :data:`FitnessFunction`; use a module-level function when evolving
+    islands in worker processes.  ``cache_size`` bounds the fitness cache and
+    ``0`` disables it.  By default the cache holds a million genomes when a
+    custom fitness is given and is off for :func:`default_fitness`, which is
+    cheaper to recompute than to hash.
+
+    ``selection`` names a selection operator (``"truncation"``,
+    ``"tournament"``, ``"sus"``, ``"rank"``, ``"plus"`` or ``"comma"``) or is
+    a :class:`~agothe_app.core.selection.SelectionOperator` instance; the
+    operators read :attr:`selection_pressure`.
+
+    ``history_size`` keeps only the most recent events in :attr:`history`
+    and ``log_path`` appends every event to a JSON Lines file.
+
+    ``checkpoint_path`` enables checkpoints, written after every
+    ``checkpoint_every`` generations and/or once ``checkpoint_seconds`` of wall
+    time have passed since the previous one; see :meth:`resume`.
+
+    ``diversity_sample`` is the sample size of the per-generation diversity
+    metrics (``0`` turns them off) and ``novelty`` adds a novelty-search bonus
+    to every fitness evaluation.
+
+    ``objectives`` switches to multi-objective mode: the scalar fitness of a
+    row becomes its Pareto front and crowding distance among the rows scored
+    together (see :func:`~agothe_app.core.pareto.pareto_fitness`), so any
+    selection operator performs NSGA-II's crowded comparison; ``"plus"``
+    gives NSGA-II's elitist replacement.  A novelty search then counts as an
+    extra objective and the fitness cache is not used.
+    """
 
-    def __init__(self, selection_pressure: float = 0.65) -> None:
+    def __init__(
+        self,
+        selection_pressure: float = 0.65,
+        seed: Optional[int] = None,
+        fitness: Optional[FitnessFunction] = None,
+        cache_size: Optional[int] = None,
+        selection: Union[str, SelectionOperator] = "truncation",
+        history_size: Optional[int] = None,
+        log_path: Union[None, str, "os.PathLike[str]"] = None,
+        checkpoint_path: Union[None, str, "os.PathLike[str]"] = None,
+        checkpoint_every: Optional[int] = None,
+        checkpoint_seconds: Optional[float] = None,
+        diversity_sample: int = DEFAULT_SAMPLE,
+        novelty: Optional[NoveltySearch] = None,
+        objectives: Optional[ObjectiveFunction] = None,
+    ) -> None:
         self.selection_pressure = selection_pressure
-        self.history: List[EvolutionEvent] = []
+        self.selection = get_selection(selection)
+        self.history: MutableSequence[EvolutionEvent] = (
+            [] if history_size is None else deque(maxlen=history_size)
+        )
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.diversity_sample = diversity_sample
+        self.novelty = novelty
+        self.objectives = objectives
+        # Pareto front of the last evolved population in multi-objective mode.
+        self.pareto_front: Optional[List[Dict[str, Any]]] = None
+        self.rng = np.random.default_rng(seed)
+        if cache_size is None:
+            cache_size = 0 if fitness is None else DEFAULT_CACHE_SIZE
+        self.fitness_cache: Optional[FitnessCache] = FitnessCache(cache_size) if cache_size else None
+        self._fitness: FitnessFunction = fitness or default_fitness
+
+    @property
+    def fitness(self) -> FitnessFunction:
+        return self._fitness
+
+    @fitness.setter
+    def fitness(self, function: FitnessFunction) -> None:
+        """Swap the fitness function; cached values of the old one are dropped."""
+
+        self._fitness = function
+        if self.fitness_cache is not None:
+            self.fitness_cache.clear()
 
     # ------------------------------------------------------------------
     def evaluate_agent(self, agent: ConsciousnessAxiom) -> float:
-        """Fitness is a blend of coherence and intent magnitude."""
+        """Fitness of a single agent, by default a blend of coherence and intent magnitude.
+
+        In multi-objective mode a lone agent has no front to be ranked on, so
+        this raises; use :meth:`evaluate_objectives` for its objective vector.
+        """
+
+        if self.objectives is not None:
+            raise ValueError(
+                "evaluate_agent is undefined in multi-objective mode; use evaluate_objectives"
+            )
+        return float(self.evaluate_genomes(agent.state[None, :], np.asarray(agent.intent)[None, :])[0])
+
+    def evaluate_population(self, population: AgentPopulation) -> np.ndarray:
+        """Fitness of every row of ``population``."""
+
+        return self.evaluate_genomes(population.states, population.intents)
+
+    def evaluate_genomes(self, states: np.ndarray, intents: np.ndarray) -> np.ndarray:
+        """Score ``(states, intents)`` rows, calling the fitness function on cache misses only.
+
+        The novelty bonus depends on the rest of the population, so it is
+        added on top of the cached values.
+        """
 
-        intent_norm = float(np.linalg.norm(agent.intent) + 1e-9)
-        return 0.7 * agent.coherence() + 0.3 * np.tanh(intent_norm)
+        if self.objectives is not None:
+            values = self.evaluate_objectives(states, intents)
+            if self.novelty is not None:
+                values = np.column_stack([values, self.novelty.score(intents)])
+            return pareto_fitness(values)
+        cache = self.fitness_cache
+        if cache is None:
+            values = np.asarray(self._fitness(states, intents), dtype=float)
+        else:
+            keys = genome_hash(states, intents)
+            values, hit = cache.lookup(keys)
+            if not hit.all():
+                miss = ~hit
+                values[miss] = self._fitness(states[miss], intents[miss])
+                cache.store(keys[miss], values[miss])
+        if self.novelty is not None:
+            values = values + self.novelty.weight * self.novelty.score(intents)
+        return values
+
+    def evaluate_objectives(self, states: np.ndarray, intents: np.ndarray) -> np.ndarray:
+        """``(N, M)`` objective values of ``(states, intents)`` rows."""
+
+        if self.objectives is None:
+            raise ValueError("The protocol has no objectives; pass objectives=... to enable them")
+        values = np.asarray(self.objectives(states, intents), dtype=float)
+        return values[:, None] if values.ndim == 1 else values
+
+    def front(self, population: AgentPopulation) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of the Pareto front of ``population`` and their objective values."""
+
+        values = self.evaluate_objectives(population.states, population.intents)
+        rows = first_front(values)
+        return rows, values[rows]
+
+    def _record_front(self, population: AgentPopulation) -> None:
+        rows, values = self.front(population)
+        self.pareto_front = [
+            {"row": int(row), "label": population.labels[row], "objectives": value}
+            for row, value in zip(rows.tolist(), values.tolist())
+        ]
 
     def mutate_agent(
         self, agent: ConsciousnessAxiom, mutation_rate: float = 0.1
@@ -71,57 +295,292 @@ class DarwinEvolutionProtocol:
     # ------------------------------------------------------------------
     def recursive_consciousness_evolution(
         self,
-        population: Sequence[ConsciousnessAxiom],
+        population: Union[AgentPopulation, Sequence[ConsciousnessAxiom]],
         depth: int = 1,
         mutation_rate: float = 0.1,
     ) -> ConsciousnessAxiom:
         """Run ``depth`` rounds of simulated evolution and return the best agent."""
 
-        agents = list(population)
-        for generation in range(depth):
-            fitness = np.array([self.evaluate_agent(agent) for agent in agents])
-            order = np.argsort(fitness)[::-1]
-            survivors = [agents[i] for i in order[: max(2, int(len(agents) * 0.6))]]
-            # Re-populate via crossover and mutation
-            children: List[ConsciousnessAxiom] = []
-            while len(survivors) + len(children) < len(agents):
-                idx_a, idx_b = np.random.choice(len(survivors), size=2, replace=True)
-                parent_a = survivors[idx_a]
-                parent_b = survivors[idx_b]
-                child = self.crossover_agents(parent_a, parent_b)  # type: ignore[arg-type]
-                children.append(self.mutate_agent(child, mutation_rate))
-            agents = survivors + children
-
-            event = EvolutionEvent(
-                generation=generation,
-                population_size=len(agents),
-                mean_coherence=float(np.mean([agent.coherence() for agent in agents])),
-                best_fitness=float(np.max(fitness)),
-            )
-            self.history.append(event)
-
-        best_index = int(np.argmax([self.evaluate_agent(agent) for agent in agents]))
-        return agents[best_index]
-
-    def spawn_population(self, size: int) -> List[ConsciousnessAxiom]:
-        """Create a diverse starting population."""
-
-        population: List[ConsciousnessAxiom] = []
-        for i in range(size):
-            theta, phi = np.random.rand(2) * np.pi
-            state = create_bloch_state(theta, phi)
-            intent = _normalize(np.random.randn(3))
-            if i % 3 == 0:
-                agent = QuantumLearningNetwork(state, intent, label=f"learner_{i}")
-            elif i % 3 == 1:
-                agent = QuantumMemoryNetwork(state, intent, label=f"memory_{i}")
-            else:
-                agent = RealityCollapseAxiom(state, intent, label=f"collapser_{i}")
-            population.append(agent)
+        return self.best_agent(self.evolve_population(population, depth, mutation_rate))
+
+    def evolve_population(
+        self,
+        population: Union[AgentPopulation, Sequence[ConsciousnessAxiom]],
+        generations: int = 1,
+        mutation_rate: float = 0.1,
+    ) -> AgentPopulation:
+        """Run ``generations`` array-native generations and return the result.
+
+        The input population is left untouched; every generation builds a new
+        population holding the survivors followed by their offspring.
+        """
+
+        events = self.evolve_iter(population, generations, mutation_rate)
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+
+    def evolve_iter(
+        self,
+        population: Union[AgentPopulation, Sequence[ConsciousnessAxiom]],
+        generations: int = 1,
+        mutation_rate: float = 0.1,
+    ) -> Generator[EvolutionEvent, None, AgentPopulation]:
+        """Evolve generation by generation, yielding each :class:`EvolutionEvent`.
+
+        The final population is the generator's return value, so
+        ``final = yield from protocol.evolve_iter(...)`` picks it up.
+        """
+
+        population, rows = as_population(population)
+        if rows is not None:
+            population = population.take(rows)
+        return (yield from self._run(population, 0, generations, mutation_rate))
+
+    def _run(
+        self, population: AgentPopulation, start: int, generations: int, mutation_rate: float
+    ) -> Generator[EvolutionEvent, None, AgentPopulation]:
+        last_checkpoint = time.monotonic()
+        for generation in range(start, generations):
+            population, event = self._generation(population, generation, mutation_rate)
+            self._record(event)
+            if self.checkpoint_path is not None and self._checkpoint_due(generation + 1, last_checkpoint):
+                self.checkpoint(self.checkpoint_path, population, generation + 1, generations, mutation_rate)
+                last_checkpoint = time.monotonic()
+            yield event
+        if self.objectives is not None:
+            self._record_front(population)
         return population
 
-    def summary(self) -> List[Dict[str, float]]:
-        return [event.__dict__ for event in self.history]
+    def _checkpoint_due(self, done: int, last_checkpoint: float) -> bool:
+        if self.checkpoint_every and done % self.checkpoint_every == 0:
+            return True
+        return self.checkpoint_seconds is not None and (
+            time.monotonic() - last_checkpoint >= self.checkpoint_seconds
+        )
+
+    def checkpoint(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        population: AgentPopulation,
+        generation: int,
+        generations: int,
+        mutation_rate: float = 0.1,
+    ) -> None:
+        """Atomically write the state of a run after ``generation`` of ``generations``.
+
+        The snapshot goes to a temporary file next to ``path`` which then
+        replaces ``path``, so an interrupted write never clobbers the previous
+        checkpoint.  Fitness cache entries are not saved, only its counters.
+        """
+
+        cache = self.fitness_cache
+        state = {
+            "generation": generation,
+            "generations": generations,
+            "mutation_rate": mutation_rate,
+            "rng": self.rng.bit_generator.state,
+            "history": [event.as_dict() for event in self.history],
+            "fitness_cache": [cache.hits, cache.misses] if cache is not None else None,
+            "novelty_archive": self.novelty.archive.tolist()
+            if self.novelty is not None and self.novelty.archive is not None
+            else None,
+        }
+        path = os.fspath(path)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            save_population(population, temporary, extra={"checkpoint": state})
+            with open(temporary, "rb+") as handle:
+                os.fsync(handle.fileno())
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def resume(self, path: Union[str, "os.PathLike[str]"]) -> AgentPopulation:
+        """Continue the run checkpointed at ``path`` and return the final population.
+
+        Construct the protocol with the same selection, fitness and pressure
+        as the interrupted run; the result is then identical to a run that was
+        never interrupted.  Events after the checkpoint are logged again.
+        """
+
+        events = self.resume_iter(path)
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+
+    def resume_iter(
+        self, path: Union[str, "os.PathLike[str]"]
+    ) -> Generator[EvolutionEvent, None, AgentPopulation]:
+        """Like :meth:`resume`, yielding each remaining :class:`EvolutionEvent`."""
+
+        state = (read_header(path).get("extra") or {}).get("checkpoint")
+        if state is None:
+            raise ValueError(f"{os.fspath(path)} is a snapshot without checkpoint state")
+        population = load_population(path)
+        self.rng.bit_generator.state = state["rng"]
+        self.history.clear()
+        self.history.extend(EvolutionEvent(**event) for event in state["history"])
+        if self.fitness_cache is not None and state["fitness_cache"] is not None:
+            self.fitness_cache.hits, self.fitness_cache.misses = state["fitness_cache"]
+        if self.novelty is not None and state.get("novelty_archive") is not None:
+            self.novelty.archive = np.asarray(state["novelty_archive"], dtype=float)
+        return (
+            yield from self._run(population, state["generation"], state["generations"], state["mutation_rate"])
+        )
+
+    def _record(self, event: EvolutionEvent) -> None:
+        self.history.append(event)
+        if self.log_path is not None:
+            with open(self.log_path, "a", encoding="utf-8") as log:
+                log.write(json.dumps(event.as_dict()) + "\n")
+
+    def evolve_islands(
+        self,
+        population: Union[AgentPopulation, Sequence[ConsciousnessAxiom]],
+        islands: int = 4,
+        generations: int = 10,
+        migration_interval: int = 5,
+        migrants: int = 1,
+        topology: str = "ring",
+        mutation_rate: float = 0.1,
+        processes: Optional[int] = None,
+    ) -> AgentPopulation:
+        """Evolve ``islands`` sub-populations in parallel worker processes.
+
+        See :mod:`agothe_app.core.island_model` for the migration topologies
+        and what is carried between islands.  Island runs are not
+        checkpointed, so ``checkpoint_path`` must be unset.
+        """
+
+        population, rows = as_population(population)
+        if rows is not None:
+            population = population.take(rows)
+        evolved = evolve_islands(
+            self,
+            population,
+            islands=islands,
+            generations=generations,
+            migration_interval=migration_interval,
+            migrants=migrants,
+            topology=topology,
+            mutation_rate=mutation_rate,
+            processes=processes,
+        )
+        if self.objectives is not None:
+            self._record_front(evolved)
+        return evolved
+
+    def best_agent(self, population: AgentPopulation) -> ConsciousnessAxiom:
+        """Materialise the fittest agent of ``population``."""
+
+        return population.agent(int(np.argmax(self.evaluate_population(population))))
+
+    def _generation(
+        self, population: AgentPopulation, generation: int, mutation_rate: float
+    ) -> Tuple[AgentPopulation, EvolutionEvent]:
+        size = len(population)
+        if size == 0:
+            raise ValueError("Cannot evolve an empty population")
+        rng = self.rng
+        if self.novelty is not None:
+            self.novelty.observe(population.intents, rng)
+        fitness = self.evaluate_population(population)
+        selection = self.selection.select(fitness, self.selection_pressure, rng)
+        parents = selection.parents
+
+        # Crossover: blend the parent pairs, one alpha per child.
+        count = len(parents)
+        alpha = rng.random((count, 1), dtype=population.real_dtype)
+        states, intents = population.states, population.intents
+        child_states = alpha * states[parents[:, 0]] + (1 - alpha) * states[parents[:, 1]]
+        child_intents = alpha * intents[parents[:, 0]] + (1 - alpha) * intents[parents[:, 1]]
+        child_states = _normalize_rows(child_states)
+        child_intents = _normalize_vectors(child_intents)
+
+        # Mutation: Gaussian jitter, renormalised like ``mutate_agent``.
+        dtype = population.real_dtype
+        child_states = child_states + rng.standard_normal(child_states.shape, dtype=dtype) * mutation_rate
+        child_intents = _normalize_vectors(
+            child_intents + rng.standard_normal(child_intents.shape, dtype=dtype) * mutation_rate
+        )
+
+        offspring = population.take(selection.survivors)
+        rows = offspring.extend(child_states, child_intents, kind=QuantumLearningNetwork, labels="offspring")
+        self._inherit_memories(population, offspring, parents, alpha[:, 0], rows.start)
+        if selection.trim:
+            offspring = offspring.take(top_rows(self.evaluate_population(offspring), size))
+
+        event = EvolutionEvent(
+            generation=generation,
+            population_size=len(offspring),
+            mean_coherence=offspring.mean_coherence(),
+            best_fitness=float(np.max(fitness)),
+        )
+        if self.objectives is not None:
+            # Pareto fitness is non-negative exactly on the first front.
+            event.annotations["front_size"] = float(np.count_nonzero(fitness >= 0))
+        if self.diversity_sample:
+            # A generator of its own keeps the evolution stream independent of the metrics.
+            event.annotations.update(
+                diversity_metrics(
+                    offspring.states,
+                    offspring.intents,
+                    self.diversity_sample,
+                    rng=np.random.default_rng(generation),
+                )
+            )
+        return offspring, event
+
+    def _inherit_memories(
+        self,
+        population: AgentPopulation,
+        offspring: AgentPopulation,
+        parents: np.ndarray,
+        alpha: np.ndarray,
+        first: int,
+    ) -> None:
+        """Blend one memory of both parents into each child, as in :meth:`crossover_agents`."""
+
+        has_memory = np.zeros(len(population), dtype=bool)
+        for row, memory in population.iter_memories():
+            has_memory[row] = bool(memory)
+        if not has_memory.any():
+            return
+        for child in np.flatnonzero(has_memory[parents[:, 0]] & has_memory[parents[:, 1]]).tolist():
+            memory_a = population.memory_of(int(parents[child, 0]))
+            memory_b = population.memory_of(int(parents[child, 1]))
+            key = list(memory_a)[self.rng.integers(len(memory_a))]
+            if key in memory_b:
+                weight = alpha[child]
+                offspring.store_memory(
+                    first + child, key, _normalize(weight * memory_a[key] + (1 - weight) * memory_b[key])
+                )
+
+    def spawn_population(
+        self, size: int, mix: Union[None, Sequence[type], Mapping[type, float]] = None
+    ) -> AgentPopulation:
+        """Create a diverse starting population from the protocol's generator.
+
+        ``mix`` weighs the agent classes (see :meth:`AgentPopulation.spawn`);
+        by default learners, memory networks and collapsers get equal shares.
+        """
+
+        return AgentPopulation.spawn(size, mix, rng=self.rng, normalize_intents=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """Generation history plus fitness cache counters."""
+
+        return {
+            "history": [event.as_dict() for event in self.history],
+            "fitness_cache": self.fitness_cache.stats() if self.fitness_cache is not None else None,
+            "pareto_front": self.pareto_front,
+        }
 
 
 def _jitter_state(state: np.ndarray, magnitude: float) -> np.ndarray:
@@ -141,4 +600,20 @@ def _normalize(vector: np.ndarray) -> np.ndarray:
     return vector / norm
 
 
-__all__ = ["DarwinEvolutionProtocol", "EvolutionEvent"]
+def _normalize_vectors(rows: np.ndarray) -> np.ndarray:
+    """Row-wise :func:`_normalize`; zero rows are left unchanged."""
+
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return rows / norms
+
+
+__all__ = [
+    "DarwinEvolutionProtocol",
+    "EvolutionEvent",
+    "FitnessFunction",
+    "NoveltySearch",
+    "ObjectiveFunction",
+    "default_fitness",
+    "default_objectives",
+]
@@ -0,0 +1,148 @@
+"""Population diversity metrics and a novelty-search fitness term.
+
+The metrics reported with every generation stay sub-quadratic in the
+population size:
+
+* ``intent_distance`` – mean Euclidean distance between intents, estimated
+  from ``sample`` random pairs (exact for small populations),
+* ``fidelity_spread`` – mean pairwise infidelity ``1 - |<a|b>|^2`` of the
+  states.  It equals ``1 - Tr(ρ²)`` of the mean density matrix ``ρ``, so it
+  is computed exactly in ``O(N d²)``,
+* ``novelty`` – mean distance from ``sample`` intents to their ``k`` nearest
+  neighbours within a random subset of ``4 · sample`` intents.  The estimate
+  depends on the sample size, so compare it across generations of one run.
+
+:class:`NoveltySearch` rewards agents whose intent lies far from the
+population and from an archive of previously novel intents.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import pdist
+
+ArrayLike = np.ndarray
+
+DEFAULT_SAMPLE = 1024
+
+
+def mean_pairwise_distance(vectors: ArrayLike, sample: int, rng: np.random.Generator) -> float:
+    """Mean distance between rows of ``vectors`` over ``sample`` random pairs."""
+
+    size = len(vectors)
+    if size < 2:
+        return 0.0
+    if size * (size - 1) // 2 <= sample:
+        return float(pdist(vectors).mean())
+    first = rng.integers(size, size=sample)
+    # A non-zero offset never pairs a row with itself.
+    second = (first + rng.integers(1, size, size=sample)) % size
+    return float(np.linalg.norm(vectors[first] - vectors[second], axis=1).mean())
+
+
+def fidelity_spread(states: ArrayLike) -> float:
+    """Mean ``1 - |<a|b>|^2`` over all ordered pairs of normalised states."""
+
+    if not len(states):
+        return 0.0
+    density = states.T @ states.conj() / len(states)
+    return float(1.0 - np.sum(np.abs(density) ** 2))
+
+
+def knn_novelty(queries: ArrayLike, reference: ArrayLike, k: int, exclude_self: bool = False) -> ArrayLike:
+    """Mean distance from every query row to its ``k`` nearest ``reference`` rows.
+
+    With ``exclude_self`` the queries are rows of ``reference`` and the
+    nearest neighbour of each (itself) is skipped.
+    """
+
+    k = min(k, len(reference) - int(exclude_self))
+    if k <= 0:
+        return np.zeros(len(queries))
+    distances, _ = cKDTree(reference).query(queries, k=k + int(exclude_self))
+    distances = distances.reshape(len(queries), -1)
+    return distances[:, int(exclude_self) :].mean(axis=1)
+
+
+def diversity_metrics(
+    states: ArrayLike,
+    intents: ArrayLike,
+    sample: int = DEFAULT_SAMPLE,
+    k: int = 15,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, float]:
+    """The three metrics described in the module docs."""
+
+    rng = rng if rng is not None else np.random.default_rng()
+    size = len(intents)
+    # Random rows, so the queries are not biased towards the survivors up front.
+    reference = intents[rng.choice(size, min(size, 4 * sample), replace=False)]
+    queries = reference[:sample]
+    novelty = knn_novelty(queries, reference, k, exclude_self=True) if size > 1 else np.zeros(1)
+    return {
+        "intent_distance": mean_pairwise_distance(intents, sample, rng),
+        "fidelity_spread": fidelity_spread(states),
+        "novelty": float(novelty.mean()),
+    }
+
+
+class NoveltySearch:
+    """Novelty bonus ``weight · (mean distance to the k nearest intents)``.
+
+    Before each generation :meth:`observe` builds the reference set from
+    ``sample`` intents of the population plus the archive, then adds the
+    ``additions`` most novel of them to the archive, which keeps the latest
+    ``archive_size`` entries.  :meth:`score` queries a k-d tree over that
+    reference set, so scoring ``N`` agents costs ``O(N log R)`` spread over
+    every CPU; at a million agents that is still a few seconds per generation.
+    """
+
+    def __init__(
+        self,
+        weight: float = 0.1,
+        k: int = 15,
+        sample: int = DEFAULT_SAMPLE,
+        archive_size: int = 1024,
+        additions: int = 8,
+    ) -> None:
+        self.weight = weight
+        self.k = k
+        self.sample = sample
+        self.archive_size = archive_size
+        self.additions = additions
+        self.archive: Optional[ArrayLike] = None
+        self._tree: Optional[cKDTree] = None
+
+    def observe(self, intents: ArrayLike, rng: np.random.Generator) -> None:
+        size = len(intents)
+        rows = rng.choice(size, self.sample, replace=False) if size > self.sample else np.arange(size)
+        current = np.asarray(intents[rows], dtype=float)
+        reference = current if self.archive is None else np.concatenate([self.archive, current])
+        self._tree = cKDTree(reference)
+
+        if self.additions and len(current):
+            novel = current[np.argsort(-self.score(current))[: self.additions]]
+            archive = novel if self.archive is None else np.concatenate([self.archive, novel])
+            self.archive = archive[-self.archive_size :]
+
+    def score(self, intents: ArrayLike) -> ArrayLike:
+        """Novelty of every intent row; zero before the first :meth:`observe`."""
+
+        if self._tree is None:
+            return np.zeros(len(intents))
+        k = min(self.k, self._tree.n)
+        distances, _ = self._tree.query(np.asarray(intents, dtype=float), k=k, workers=-1)
+        return distances.reshape(len(intents), -1).mean(axis=1)
+
+
+__all__ = [
+    "DEFAULT_SAMPLE",
+    "NoveltySearch",
+    "diversity_metrics",
+    "fidelity_spread",
+    "knn_novelty",
+    "mean_pairwise_distance",
+]
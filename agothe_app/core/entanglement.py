@@ -0,0 +1,263 @@
+"""Shared registry of memory entanglements between agents of a population.
+
+Entangling two agents used to copy the combined memory vector into both
+agents' ``memory_entangled`` dicts.  The registry instead stores every
+entanglement once, as an edge ``(row_a, row_b, key)`` with a single vector, in
+growable COO arrays.  Per-row adjacency dicts give O(1) partner lookup and the
+COO arrays convert to a SciPy CSR matrix for graph queries such as connected
+components.  Memory grows with the number of edges only.
+
+An agent's ``memory_entangled`` view maps every key to the vector of the most
+recent edge touching it under that key, which reproduces the old
+last-writer-wins behaviour of the per-agent dicts.  Entangled memories that
+have no partner in the population (for instance when they were passed to an
+agent constructor) are stored as self-loops.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Union
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+ArrayLike = np.ndarray
+
+
+class EntanglementRegistry:
+    """Sparse entanglement graph with one stored vector per edge and key."""
+
+    def __init__(self) -> None:
+        self._src = np.zeros(0, dtype=np.int64)
+        self._dst = np.zeros(0, dtype=np.int64)
+        self._key = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._count = 0
+        self._vectors: List[Optional[ArrayLike]] = []
+        self.keys: List[str] = []
+        self._key_ids: Dict[str, int] = {}
+        # row -> partner -> edge ids, and row -> key -> most recent edge id.
+        self._adjacency: Dict[int, Dict[int, Set[int]]] = {}
+        self._latest: Dict[int, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        """Number of live edges."""
+
+        return int(self._alive[: self._count].sum())
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def entangle(self, row_a: int, row_b: int, key: str, vector: ArrayLike) -> int:
+        """Record one entanglement and return its edge id."""
+
+        edge = self._append(int(row_a), int(row_b), key)
+        self._vectors.append(np.asarray(vector))
+        self._link(edge)
+        return edge
+
+    def entangle_many(
+        self,
+        rows_a: Sequence[int],
+        rows_b: Sequence[int],
+        key: Union[str, Sequence[str]],
+        vectors: ArrayLike,
+    ) -> ArrayLike:
+        """Record many entanglements at once; ``vectors`` has one row per edge.
+
+        The vectors are kept as views over the single ``vectors`` block.
+        Returns the new edge ids.
+        """
+
+        rows_a = np.asarray(rows_a, dtype=np.int64)
+        rows_b = np.asarray(rows_b, dtype=np.int64)
+        keys = [key] * len(rows_a) if isinstance(key, str) else list(key)
+        vectors = np.asarray(vectors)
+        start = self._count
+        self._reserve(start + len(rows_a))
+        self._src[start : start + len(rows_a)] = rows_a
+        self._dst[start : start + len(rows_a)] = rows_b
+        self._key[start : start + len(rows_a)] = [self._key_id(name) for name in keys]
+        self._alive[start : start + len(rows_a)] = True
+        self._count += len(rows_a)
+        self._vectors.extend(vectors)
+        for edge in range(start, self._count):
+            self._link(edge)
+        return np.arange(start, self._count)
+
+    def disentangle(self, row_a: int, row_b: int, key: Optional[str] = None) -> int:
+        """Remove the edges between two rows (optionally for one key only).
+
+        Returns the number of removed edges.
+        """
+
+        edges = list(self._adjacency.get(row_a, {}).get(row_b, ()))
+        if key is not None:
+            key_id = self._key_ids.get(key)
+            edges = [edge for edge in edges if self._key[edge] == key_id]
+        for edge in edges:
+            self._remove(edge)
+        return len(edges)
+
+    def clear_row(self, row: int) -> None:
+        """Remove every edge touching ``row``."""
+
+        for edges in list(self._adjacency.get(row, {}).values()):
+            for edge in list(edges):
+                self._remove(edge)
+
+    def set_memories(self, row: int, memories: Mapping[str, ArrayLike]) -> None:
+        """Replace the entangled memories of ``row`` with partner-less entries."""
+
+        self.clear_row(row)
+        for key, vector in memories.items():
+            self.entangle(row, row, key, vector)
+
+    def absorb(self, other: "EntanglementRegistry", mapping: Mapping[int, int]) -> None:
+        """Copy the edges of ``other`` whose rows appear in ``mapping``.
+
+        Edges with a single mapped endpoint become self-loops so that the
+        mapped agent keeps its entangled memory.
+        """
+
+        for edge in np.flatnonzero(other._alive[: other._count]).tolist():
+            row_a = mapping.get(int(other._src[edge]))
+            row_b = mapping.get(int(other._dst[edge]))
+            if row_a is None and row_b is None:
+                continue
+            row_a = row_b if row_a is None else row_a
+            row_b = row_a if row_b is None else row_b
+            key = other.keys[other._key[edge]]
+            self.entangle(row_a, row_b, key, other._vectors[edge])  # type: ignore[arg-type]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def partners(self, row: int) -> List[int]:
+        """Rows entangled with ``row`` (self-loops excluded)."""
+
+        return [partner for partner in self._adjacency.get(row, {}) if partner != row]
+
+    def memories(self, row: int) -> Dict[str, ArrayLike]:
+        """The ``key -> vector`` entangled memories visible to ``row``."""
+
+        return {
+            key: self._vectors[edge]  # type: ignore[misc]
+            for key, edge in self._latest.get(row, {}).items()
+        }
+
+    def has_memories(self, row: int) -> bool:
+        return row in self._latest
+
+    def entangled_count(self) -> int:
+        """Number of rows holding at least one entangled memory."""
+
+        return len(self._latest)
+
+    def edges(self) -> Dict[str, ArrayLike]:
+        """COO view of the live edges: ``src``, ``dst`` and ``key`` id arrays."""
+
+        alive = self._alive[: self._count]
+        return {
+            "src": self._src[: self._count][alive],
+            "dst": self._dst[: self._count][alive],
+            "key": self._key[: self._count][alive],
+        }
+
+    def adjacency(self, size: int) -> csr_matrix:
+        """Symmetric ``size × size`` CSR adjacency matrix of edge multiplicities."""
+
+        edges = self.edges()
+        rows = np.concatenate([edges["src"], edges["dst"]])
+        cols = np.concatenate([edges["dst"], edges["src"]])
+        data = np.ones(len(rows), dtype=np.int32)
+        return coo_matrix((data, (rows, cols)), shape=(size, size)).tocsr()
+
+    def components(self, size: int) -> ArrayLike:
+        """Connected component label of every row in ``range(size)``."""
+
+        _, labels = connected_components(self.adjacency(size), directed=False)
+        return labels
+
+    def component_of(self, row: int) -> List[int]:
+        """All rows reachable from ``row`` through entanglements."""
+
+        seen = {row}
+        frontier = [row]
+        while frontier:
+            current = frontier.pop()
+            for partner in self._adjacency.get(current, {}):
+                if partner not in seen:
+                    seen.add(partner)
+                    frontier.append(partner)
+        return sorted(seen)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _key_id(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self.keys)
+            self.keys.append(key)
+        return key_id
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._src):
+            return
+        capacity = max(capacity, 2 * len(self._src), 16)
+        for name in ("_src", "_dst", "_key", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self._count] = old[: self._count]
+            setattr(self, name, new)
+
+    def _append(self, row_a: int, row_b: int, key: str) -> int:
+        self._reserve(self._count + 1)
+        edge = self._count
+        self._src[edge] = row_a
+        self._dst[edge] = row_b
+        self._key[edge] = self._key_id(key)
+        self._alive[edge] = True
+        self._count += 1
+        return edge
+
+    def _link(self, edge: int) -> None:
+        row_a, row_b = int(self._src[edge]), int(self._dst[edge])
+        key = self.keys[self._key[edge]]
+        for row, partner in ((row_a, row_b), (row_b, row_a)):
+            self._adjacency.setdefault(row, {}).setdefault(partner, set()).add(edge)
+            self._latest.setdefault(row, {})[key] = edge
+
+    def _remove(self, edge: int) -> None:
+        self._alive[edge] = False
+        self._vectors[edge] = None
+        row_a, row_b = int(self._src[edge]), int(self._dst[edge])
+        key = self.keys[self._key[edge]]
+        for row, partner in ((row_a, row_b), (row_b, row_a)):
+            neighbours = self._adjacency.get(row, {})
+            edges = neighbours.get(partner)
+            if edges is not None:
+                edges.discard(edge)
+                if not edges:
+                    del neighbours[partner]
+            if not neighbours:
+                self._adjacency.pop(row, None)
+            latest = self._latest.get(row, {})
+            if latest.get(key) == edge:
+                del latest[key]
+                # Fall back to the newest remaining edge of this row and key.
+                remaining = [
+                    other
+                    for edges in neighbours.values()
+                    for other in edges
+                    if self.keys[self._key[other]] == key
+                ]
+                if remaining:
+                    latest[key] = max(remaining)
+            if not latest:
+                self._latest.pop(row, None)
+
+
+__all__ = ["EntanglementRegistry"]
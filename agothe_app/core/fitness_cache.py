@@ -0,0 +1,176 @@
+"""Fitness cache keyed by a hash of each agent's genome.
+
+Survivors of a generation keep their state and intent unchanged, so their
+fitness does not need to be evaluated again.  :func:`genome_hash` folds the
+raw bytes of every state and intent row into one ``uint64`` with a
+multiply-xor hash computed column by column over the whole population, and
+:class:`FitnessCache` maps those hashes to fitness values.
+
+The cache is an open-addressing hash table held in NumPy arrays, so a whole
+population is looked up with a few vectorised probe rounds.  Eviction is
+least-recently-used at the granularity of lookup calls: every hit and insert
+stamps the entry with the current call number and, when the cache would
+outgrow its capacity, the entries with the oldest stamps are dropped.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+ArrayLike = np.ndarray
+
+_PRIME = np.uint64(0x100000001B3)
+_OFFSET = np.uint64(0xCBF29CE484222325)
+
+
+def _words(rows: ArrayLike) -> ArrayLike:
+    """View the bytes of every row as ``uint64`` (or widened ``uint32``) words."""
+
+    rows = np.ascontiguousarray(rows)
+    flat = rows.reshape(len(rows), -1).view(np.uint8)
+    if flat.shape[1] % 8 == 0:
+        return flat.view(np.uint64)
+    return flat.view(np.uint32).astype(np.uint64)
+
+
+def genome_hash(states: ArrayLike, intents: ArrayLike) -> ArrayLike:
+    """64-bit hash of every ``(state, intent)`` row pair."""
+
+    keys = np.full(len(states), _OFFSET, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for block in (_words(states), _words(intents)):
+            for column in block.T:
+                keys ^= column
+                keys *= _PRIME
+        # Final avalanche so nearby genomes spread over the key space.
+        keys ^= keys >> np.uint64(33)
+        keys *= np.uint64(0xFF51AFD7ED558CCD)
+        keys ^= keys >> np.uint64(33)
+    return keys
+
+
+def _power_of_two(count: int) -> int:
+    return max(8, 1 << int(np.ceil(np.log2(max(count, 1)))))
+
+
+class FitnessCache:
+    """Bounded ``hash -> fitness`` map with vectorised lookups.
+
+    Entries live in an open-addressing table with linear probing whose size is
+    kept at least twice the number of entries, so a lookup of ``N`` keys takes
+    a handful of vectorised probe rounds.
+    """
+
+    def __init__(self, capacity: int = 1_000_000) -> None:
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._clock = 0
+        self._count = 0
+        self._allocate(8)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _allocate(self, slots: int) -> None:
+        self._mask = np.uint64(slots - 1)
+        self._keys = np.zeros(slots, dtype=np.uint64)
+        self._used = np.zeros(slots, dtype=bool)
+        self._values = np.zeros(slots, dtype=np.float64)
+        self._stamps = np.zeros(slots, dtype=np.int64)
+
+    def lookup(self, keys: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+        """Return ``(values, hit)``; ``values`` is ``NaN`` wherever ``hit`` is false."""
+
+        self._clock += 1
+        keys = np.asarray(keys, dtype=np.uint64)
+        values = np.full(len(keys), np.nan)
+        hit = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys)) if self._count else np.zeros(0, dtype=np.intp)
+        slots = (keys & self._mask).astype(np.intp)
+        while len(pending):
+            probe = slots[pending]
+            used = self._used[probe]
+            match = used & (self._keys[probe] == keys[pending])
+            found = probe[match]
+            hit[pending[match]] = True
+            values[pending[match]] = self._values[found]
+            self._stamps[found] = self._clock
+            pending = pending[used & ~match]
+            slots[pending] = (slots[pending] + 1) & int(self._mask)
+        found = int(hit.sum())
+        self.hits += found
+        self.misses += len(keys) - found
+        return values, hit
+
+    def store(self, keys: ArrayLike, values: ArrayLike) -> None:
+        """Insert entries for keys that missed, evicting the least recently used."""
+
+        if self.capacity <= 0 or not len(keys):
+            return
+        keys = np.asarray(keys, dtype=np.uint64)
+        values = np.asarray(values, dtype=np.float64)
+        if len(keys) > self.capacity:
+            keys, values = keys[: self.capacity], values[: self.capacity]
+        if self._count + len(keys) > self.capacity:
+            self._rebuild(self.capacity - len(keys), len(keys))
+        elif 2 * (self._count + len(keys)) > len(self._keys):
+            self._rebuild(self._count, len(keys))
+        self._insert(keys, values, np.full(len(keys), self._clock, dtype=np.int64))
+
+    def _rebuild(self, keep: int, incoming: int) -> None:
+        """Rehash the ``keep`` newest entries into a table with room for ``incoming`` more."""
+
+        used = np.flatnonzero(self._used)
+        if len(used) > keep:
+            used = used[np.argpartition(-self._stamps[used], keep - 1)[:keep]] if keep else used[:0]
+        keys, values, stamps = self._keys[used], self._values[used], self._stamps[used]
+        slots = _power_of_two(2 * (len(keys) + incoming))
+        # Grow geometrically, but never beyond what the capacity can fill.
+        slots = max(slots, min(2 * len(self._keys), _power_of_two(2 * self.capacity)))
+        self._allocate(slots)
+        self._count = 0
+        self._insert(keys, values, stamps)
+
+    def _insert(self, keys: ArrayLike, values: ArrayLike, stamps: ArrayLike) -> None:
+        """Place keys that are not yet in the table.
+
+        Repeated keys (identical genomes in one batch) land in the same slot.
+        """
+
+        pending = np.arange(len(keys))
+        slots = (keys & self._mask).astype(np.intp)
+        while len(pending):
+            probe = slots[pending]
+            free = ~self._used[probe]
+            # Several keys may claim the same free slot; the last write wins.
+            self._keys[probe[free]] = keys[pending[free]]
+            won = free & (self._keys[probe] == keys[pending])
+            claimed = probe[won]
+            self._used[claimed] = True
+            self._values[claimed] = values[pending[won]]
+            self._stamps[claimed] = stamps[pending[won]]
+            pending = pending[~won]
+            slots[pending] = (slots[pending] + 1) & int(self._mask)
+        self._count = int(np.count_nonzero(self._used))
+
+    def clear(self) -> None:
+        """Drop every entry; the hit and miss counters are kept."""
+
+        self._count = 0
+        self._allocate(8)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self),
+            "capacity": self.capacity,
+        }
+
+
+__all__ = ["FitnessCache", "genome_hash"]
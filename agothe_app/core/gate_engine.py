@@ -0,0 +1,130 @@
+"""Batched unitary evolution with precompiled gate sequences.
+
+``ConsciousnessAxiom.apply_unitary`` performs a matmul and a renormalisation
+per call and per agent.  A :class:`GateSequence` instead fuses a list of gates
+that is known ahead of time into a single matrix and applies it to a whole
+population with one matmul.  When the fused matrix is verified unitary the
+renormalisation is skipped, optionally correcting floating point drift every
+few applications.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from .quantum_consciousness import (
+    AgentPopulation,
+    ConsciousnessAxiom,
+    Rows,
+    _normalize_rows,
+    _resolve_rows,
+)
+
+ArrayLike = np.ndarray
+
+
+class GateSequence:
+    """Ordered list of gates fused into one matrix on first use.
+
+    Parameters
+    ----------
+    gates:
+        Square matrices applied in order, so the first gate acts first.
+    renormalize_every:
+        When the fused matrix is unitary, renormalise the states only every
+        ``renormalize_every`` applications to correct accumulated rounding
+        drift.  ``None`` never renormalises unitary sequences.
+    atol:
+        Tolerance used when verifying that the fused matrix is unitary.
+    """
+
+    def __init__(
+        self,
+        gates: Iterable[ArrayLike] = (),
+        renormalize_every: Optional[int] = None,
+        atol: float = 1e-10,
+    ) -> None:
+        self.gates: List[ArrayLike] = [np.asarray(gate, dtype=complex) for gate in gates]
+        self.renormalize_every = renormalize_every
+        self.atol = atol
+        self.applications = 0
+        self._matrix: Optional[ArrayLike] = None
+        self._unitary = False
+
+    def append(self, gate: ArrayLike) -> "GateSequence":
+        """Add a gate at the end of the sequence."""
+
+        self.gates.append(np.asarray(gate, dtype=complex))
+        self._matrix = None
+        return self
+
+    def __len__(self) -> int:
+        return len(self.gates)
+
+    # ------------------------------------------------------------------
+    def compile(self) -> ArrayLike:
+        """Return the fused matrix ``G_n … G_2 G_1`` and cache it."""
+
+        if self._matrix is None:
+            if not self.gates:
+                raise ValueError("Cannot compile an empty gate sequence")
+            matrix = self.gates[0]
+            for gate in self.gates[1:]:
+                matrix = gate @ matrix
+            identity = np.eye(len(matrix))
+            self._unitary = bool(
+                np.allclose(matrix.conj().T @ matrix, identity, atol=self.atol)
+            )
+            self._matrix = matrix
+        return self._matrix
+
+    @property
+    def is_unitary(self) -> bool:
+        self.compile()
+        return self._unitary
+
+    def apply(
+        self,
+        population: Union[AgentPopulation, ConsciousnessAxiom, Iterable[ConsciousnessAxiom]],
+        rows: Rows = None,
+        repeats: int = 1,
+    ) -> ArrayLike:
+        """Apply the sequence ``repeats`` times to the selected agents.
+
+        The repeated sequence is folded into a single matrix power, so the
+        states are touched by exactly one matmul.  Returns the new states.
+        """
+
+        if isinstance(population, ConsciousnessAxiom):
+            population = [population]
+        population, selected, gathered = _resolve_rows(population, rows)
+        matrix = self.compile()
+        if repeats != 1:
+            matrix = np.linalg.matrix_power(matrix, repeats)
+        index = population._rows(selected)
+        states = population._states[index] @ matrix.T.astype(population.complex_dtype)
+
+        self.applications += repeats
+        if not self._unitary:
+            states = _normalize_rows(states)
+        elif self.renormalize_every and self.applications >= self.renormalize_every:
+            states = _normalize_rows(states)
+            self.applications = 0
+        population.set_states(states, index)
+        if gathered is not None:
+            population._scatter(gathered)
+        return states
+
+
+def random_unitary(dim: int, rng: Optional[np.random.Generator] = None) -> ArrayLike:
+    """Draw a Haar-random ``dim × dim`` unitary via a QR decomposition."""
+
+    rng = rng or np.random.default_rng()
+    z = rng.standard_normal((dim, dim)) + 1j * rng.standard_normal((dim, dim))
+    q, r = np.linalg.qr(z)
+    return q * (np.diag(r) / np.abs(np.diag(r)))
+
+
+__all__ = ["GateSequence", "random_unitary"]
@@ -0,0 +1,280 @@
+"""Island-model evolution across worker processes.
+
+The population is split into ``K`` contiguous islands.  The states, intents
+and agent type codes of all islands live in shared-memory arrays, so each
+worker process attaches to its slice, evolves it for ``migration_interval``
+generations with its own copy of the protocol and writes the result back in
+place.  Between epochs the parent process copies the elite rows of every
+island over the worst rows of its neighbours according to the migration
+topology:
+
+* ``"ring"`` – island ``i`` receives from island ``i - 1``,
+* ``"full"`` – every island receives from every other island,
+* ``"random"`` – every island receives from one other island drawn per epoch.
+
+Each island and epoch uses a seed spawned from one entropy value drawn from
+the protocol's generator, so a run is reproducible for a given protocol seed
+regardless of the number of worker processes.
+
+Only states, intents, agent types and labels travel between islands; memory
+banks, per-agent learning rates and entanglements are not carried over.
+
+Island runs cannot be checkpointed: a checkpoint holds one population and the
+state of one protocol, so :func:`evolve_islands` rejects a protocol with a
+``checkpoint_path`` rather than letting every worker overwrite it with its own
+island.
+"""
+
+from __future__ import annotations
+
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .precision import precision
+from .quantum_consciousness import _AGENT_TYPES, AgentPopulation, _type_code
+
+ArrayLike = np.ndarray
+TOPOLOGIES = ("ring", "full", "random")
+
+
+class _SharedArray:
+    """NumPy array backed by a named shared-memory block."""
+
+    def __init__(self, block: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str) -> None:
+        self.block = block
+        self.array: ArrayLike = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @classmethod
+    def create(cls, source: ArrayLike) -> "_SharedArray":
+        block = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+        shared = cls(block, source.shape, source.dtype.str)
+        shared.array[...] = source
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, Tuple[int, ...], str]) -> "_SharedArray":
+        name, shape, dtype = spec
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype)
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        return self.block.name, self.array.shape, self.array.dtype.str
+
+    def close(self) -> None:
+        del self.array
+        self.block.close()
+
+
+def migration_sources(islands: int, topology: str, rng: np.random.Generator) -> List[List[int]]:
+    """Islands sending migrants to each island under ``topology``."""
+
+    if topology == "ring":
+        return [[(island - 1) % islands] for island in range(islands)]
+    if topology == "full":
+        return [[other for other in range(islands) if other != island] for island in range(islands)]
+    if topology == "random":
+        offsets = rng.integers(1, islands, size=islands)
+        return [[int((island + offset) % islands)] for island, offset in enumerate(offsets)]
+    raise ValueError(f"Unknown migration topology '{topology}', expected one of {TOPOLOGIES}")
+
+
+def _evolve_island(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: evolve one island in place inside shared memory."""
+
+    blocks = {name: _SharedArray.attach(spec) for name, spec in task["arrays"].items()}
+    try:
+        start, stop = task["rows"]
+        states = blocks["states"].array[start:stop]
+        intents = blocks["intents"].array[start:stop]
+        kinds = blocks["kinds"].array[start:stop]
+        # Type codes depend on registration order, which may differ here.
+        local_codes = np.array([_type_code(cls) for cls in task["types"]], dtype=np.int8)
+
+        protocol = copy.copy(task["protocol"])
+        protocol.history = []
+        protocol.rng = np.random.default_rng(task["seed"])
+        if protocol.novelty is not None:
+            # Islands keep separate archives, also when run in one process.
+            protocol.novelty = copy.deepcopy(protocol.novelty)
+        if protocol.fitness_cache is not None:
+            protocol.fitness_cache = type(protocol.fitness_cache)(protocol.fitness_cache.capacity)
+        with precision(task["precision"]):
+            population = AgentPopulation.from_arrays(states, intents, labels=task["labels"])
+        population._kinds[: len(population)] = local_codes[kinds]
+        population = protocol.evolve_population(population, task["generations"], task["mutation_rate"])
+
+        parent_codes = np.zeros(len(_AGENT_TYPES), dtype=np.int8)
+        for code, cls in enumerate(_AGENT_TYPES):
+            if cls in task["types"]:
+                parent_codes[code] = task["types"].index(cls)
+        states[:] = population.states
+        intents[:] = population.intents
+        kinds[:] = parent_codes[population.kinds]
+
+        fitness = protocol.evaluate_population(population)
+        size = len(fitness)
+        elite = min(task["migrants"], size)
+        worst = min(task["worst"], size)
+        return {
+            "history": protocol.history,
+            "cache": (protocol.fitness_cache.hits, protocol.fitness_cache.misses)
+            if protocol.fitness_cache is not None
+            else (0, 0),
+            "labels": list(population.labels),
+            "elite": np.argpartition(-fitness, elite - 1)[:elite] if elite else np.zeros(0, int),
+            "worst": np.argpartition(fitness, worst - 1)[:worst] if worst else np.zeros(0, int),
+        }
+    finally:
+        for shared in blocks.values():
+            shared.close()
+
+
+def evolve_islands(
+    protocol: Any,
+    population: AgentPopulation,
+    islands: int = 4,
+    generations: int = 10,
+    migration_interval: int = 5,
+    migrants: int = 1,
+    topology: str = "ring",
+    mutation_rate: float = 0.1,
+    processes: Optional[int] = None,
+) -> AgentPopulation:
+    """Evolve ``population`` as ``islands`` sub-populations; see the module docs.
+
+    ``processes`` caps the worker pool (``None`` uses one per CPU) and ``0``
+    runs the islands in the calling process, which is handy for debugging.
+    The per-island events are appended to ``protocol.history`` with the
+    island number in their annotations.
+    """
+
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology '{topology}', expected one of {TOPOLOGIES}")
+    if protocol.checkpoint_path is not None:
+        raise ValueError("Island runs do not support checkpoints; clear the protocol's checkpoint_path")
+    size = len(population)
+    if islands < 1 or size < 2 * islands:
+        raise ValueError(f"Cannot split {size} agents into {islands} islands of at least two")
+    bounds = np.linspace(0, size, islands + 1).astype(int)
+    incoming = migrants * (islands - 1 if topology == "full" else 1) if islands > 1 else 0
+    entropy = int(protocol.rng.integers(2**63))
+    policy = "single" if population.complex_dtype == np.complex64 else "double"
+    types = list(_AGENT_TYPES)
+    labels = list(population.labels)
+
+    template = copy.copy(protocol)
+    template.history = []
+    template.rng = None
+    template.log_path = None
+    cache = protocol.fitness_cache
+    # Workers start from an empty cache, so do not ship ours to them.
+    template.fitness_cache = type(cache)(cache.capacity) if cache is not None else None
+
+    shared = {
+        "states": _SharedArray.create(np.ascontiguousarray(population.states)),
+        "intents": _SharedArray.create(np.ascontiguousarray(population.intents)),
+        "kinds": _SharedArray.create(np.ascontiguousarray(population.kinds)),
+    }
+    executor = ProcessPoolExecutor(processes) if processes != 0 else None
+    try:
+        done = 0
+        epoch = 0
+        while done < generations:
+            span = min(migration_interval, generations - done)
+            tasks = [
+                {
+                    "arrays": {name: array.spec for name, array in shared.items()},
+                    "rows": (int(bounds[island]), int(bounds[island + 1])),
+                    "types": types,
+                    "labels": labels[bounds[island] : bounds[island + 1]],
+                    "protocol": template,
+                    "seed": np.random.SeedSequence(entropy, spawn_key=(island, epoch)),
+                    "precision": policy,
+                    "generations": span,
+                    "mutation_rate": mutation_rate,
+                    "migrants": migrants,
+                    "worst": incoming,
+                }
+                for island in range(islands)
+            ]
+            results = list(executor.map(_evolve_island, tasks)) if executor else [
+                _evolve_island(task) for task in tasks
+            ]
+            for island, result in enumerate(results):
+                labels[bounds[island] : bounds[island + 1]] = result["labels"]
+            _merge_history(protocol, results, done)
+            done += span
+            epoch += 1
+            if done < generations and islands > 1:
+                _migrate(shared, bounds, results, labels, migration_sources(islands, topology, protocol.rng))
+
+        with precision(policy):
+            evolved = AgentPopulation.from_arrays(
+                shared["states"].array, shared["intents"].array, labels=labels, seed=population.seed
+            )
+        evolved._kinds[:size] = shared["kinds"].array
+        return evolved
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        for array in shared.values():
+            block = array.block
+            array.close()
+            block.unlink()
+
+
+def _merge_history(protocol: Any, results: Sequence[Dict[str, Any]], offset: int) -> None:
+    """Append island events ordered by generation, then island."""
+
+    events = []
+    cache = protocol.fitness_cache
+    for island, result in enumerate(results):
+        if cache is not None:
+            cache.hits += result["cache"][0]
+            cache.misses += result["cache"][1]
+        for event in result["history"]:
+            event.generation += offset
+            event.annotations["island"] = float(island)
+            events.append(event)
+    events.sort(key=lambda event: (event.generation, event.annotations["island"]))
+    for event in events:
+        protocol._record(event)
+
+
+def _migrate(
+    shared: Dict[str, _SharedArray],
+    bounds: ArrayLike,
+    results: Sequence[Dict[str, Any]],
+    labels: List[str],
+    sources: List[List[int]],
+) -> None:
+    """Copy elite rows over the worst rows of the receiving islands."""
+
+    elites = [result["elite"] + bounds[island] for island, result in enumerate(results)]
+    # Snapshot every elite first so a migrant is never overwritten before it moves.
+    payload = {
+        island: (
+            {name: array.array[rows].copy() for name, array in shared.items()},
+            [labels[row] for row in rows.tolist()],
+        )
+        for island, rows in enumerate(elites)
+    }
+    for island, senders in enumerate(sources):
+        slots = results[island]["worst"] + bounds[island]
+        position = 0
+        for sender in senders:
+            rows, names = payload[sender]
+            count = min(len(names), len(slots) - position)
+            targets = slots[position : position + count]
+            for name, array in shared.items():
+                array.array[targets] = rows[name][:count]
+            for target, label in zip(targets.tolist(), names[:count]):
+                labels[target] = label
+            position += count
+
+
+__all__ = ["TOPOLOGIES", "evolve_islands", "migration_sources"]
@@ -0,0 +1,459 @@
+"""Population-wide cosine similarity index over agent memories.
+
+Every stored memory vector is addressed by the ``(row, key)`` pair of the agent
+that holds it.  Vectors are grouped by dimensionality and kept normalised in a
+contiguous matrix, so small populations are answered exactly by a single
+matrix-vector product.  Once a group grows past ``exact_threshold`` entries a
+random-projection LSH index (sign of random hyperplanes, several tables) is
+maintained alongside the matrix and queries only re-rank the candidates found
+in the query's bucket and in the ``probes`` neighbouring buckets of every table
+most likely to hold near neighbours (query-directed multi-probe: the buckets
+reached by flipping the bits whose hyperplanes pass closest to the query).
+
+All tables live in one sorted array of ``(table, bucket)`` keys with the slot
+of every entry alongside, so the probed buckets are gathered with two
+``searchsorted`` calls and a single ``np.unique``.  Vectors added after the
+array was built are kept in a short list that every query re-ranks as well, and
+the array is rebuilt once that list reaches an eighth of the group.
+
+LSH trades recall for speed.  Whenever the tables are (re)built the group
+calibrates itself against exact search on a sample of its own vectors: it picks
+the smallest number of probes whose recall@k reaches ``recall_target`` (0.9 by
+default), then times those queries against brute force and keeps LSH only if
+it is faster.  When no probe count reaches the target without re-ranking more
+than ``max_candidates`` of the group, or when brute force wins the timing, the
+group stays exact.  Low-dimensional random memories (e.g. 16 dimensions) have
+too few near neighbours per bucket for LSH to pay off and are served exactly;
+clustered or higher-dimensional memories, which are the case LSH is built for,
+need few probes and are served from the tables.  ``recall_target=None``
+disables the calibration and always probes ``probes`` buckets.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ArrayLike = np.ndarray
+Match = Tuple[int, str, float]
+
+
+class _DimensionGroup:
+    """Normalised vectors of one dimensionality plus their LSH tables."""
+
+    def __init__(self, dim: int, n_tables: int, n_bits: int, rng: np.random.Generator) -> None:
+        # Neighbouring buckets probed per table, and whether LSH is used at all.
+        self.probes = 0
+        self.use_tables = True
+        self.calibrated_size = 0
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=float)
+        self.alive = np.zeros(0, dtype=bool)
+        self.owners: List[Optional[Tuple[int, str]]] = []
+        self.slots: Dict[Tuple[int, str], int] = {}
+        self.free: List[int] = []
+        self.planes = rng.standard_normal((n_tables, dim, n_bits))
+        self.weights = 1 << np.arange(n_bits, dtype=np.int64)
+        # Table number in the high bits of a bucket key, bucket code in the low bits.
+        self.offsets = np.arange(n_tables, dtype=np.int64)[:, None] << n_bits
+        # Sorted bucket keys of every (vector, table) entry and the entry slots.
+        self.tables: Optional[ArrayLike] = None
+        self.table_slots = np.zeros(0, dtype=np.intp)
+        # Slots added since the tables were built.
+        self.recent: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    # ------------------------------------------------------------------
+    def _hash(self, vectors: ArrayLike) -> ArrayLike:
+        """LSH codes of ``vectors`` with shape ``(n, n_tables)``."""
+
+        bits = np.einsum("nd,tdb->ntb", vectors, self.planes) > 0
+        return bits @ self.weights
+
+    def _slot(self) -> int:
+        if self.free:
+            return self.free.pop()
+        slot = len(self.owners)
+        self._grow(slot + 1)
+        self.owners.append(None)
+        return slot
+
+    def _grow(self, needed: int) -> None:
+        used = len(self.owners)
+        if needed <= len(self.vectors):
+            return
+        capacity = max(8, 2 * len(self.vectors), needed)
+        for name in ("vectors", "alive"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:used] = old[:used]
+            setattr(self, name, new)
+
+    def add(self, owner: Tuple[int, str], unit: ArrayLike) -> None:
+        self.remove(owner)
+        slot = self._slot()
+        self.vectors[slot] = unit
+        self.alive[slot] = True
+        self.owners[slot] = owner
+        self.slots[owner] = slot
+        if self.tables is not None:
+            self._added([slot])
+
+    def add_many(self, owners: List[Tuple[int, str]], units: ArrayLike) -> None:
+        """Add distinct, not yet indexed owners, hashing them in one call."""
+
+        count = len(owners)
+        reused = [self.free.pop() for _ in range(min(count, len(self.free)))]
+        start = len(self.owners)
+        fresh = count - len(reused)
+        self._grow(start + fresh)
+        self.owners.extend([None] * fresh)
+        slots = np.array(reused + list(range(start, start + fresh)), dtype=np.intp)
+        self.vectors[slots] = units
+        self.alive[slots] = True
+        for owner, slot in zip(owners, slots.tolist()):
+            self.owners[slot] = owner
+            self.slots[owner] = slot
+        if self.tables is not None:
+            self._added(slots.tolist())
+
+    def _added(self, slots: List[int]) -> None:
+        self.recent.extend(slots)
+        if len(self.recent) > max(64, len(self) // 8):
+            self.build_tables()
+
+    def load(self, owners: List[Tuple[int, str]], units: ArrayLike) -> None:
+        """Bulk-load an empty group without hashing vectors one by one."""
+
+        count = len(owners)
+        self.vectors = np.array(units, dtype=float).reshape(count, self.dim)
+        self.alive = np.ones(count, dtype=bool)
+        self.owners = list(owners)
+        self.slots = {owner: slot for slot, owner in enumerate(owners)}
+
+    def remove(self, owner: Tuple[int, str]) -> None:
+        slot = self.slots.pop(owner, None)
+        if slot is None:
+            return
+        self.alive[slot] = False
+        self.vectors[slot] = 0.0
+        self.owners[slot] = None
+        # Stale table entries are dropped by the alive mask at query time.
+        self.free.append(slot)
+
+    def build_tables(self) -> None:
+        """Hash every live vector in one pass and sort the bucket keys."""
+
+        slots = np.flatnonzero(self.alive)
+        keys = (self._hash(self.vectors[slots]) | self.offsets.T).ravel()
+        order = np.argsort(keys, kind="stable")
+        self.tables = keys[order]
+        self.table_slots = np.repeat(slots, len(self.planes))[order]
+        self.recent = []
+
+    def exact_scores(self, unit: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+        """Slots and cosine scores of every live vector."""
+
+        if len(self) == len(self.owners):
+            # No removed slots: score the used prefix without gathering it.
+            return np.arange(len(self)), self.vectors[: len(self)] @ unit
+        slots = np.flatnonzero(self.alive)
+        return slots, self.vectors[slots] @ unit
+
+    def probe_codes(self, unit: ArrayLike, probes: int) -> ArrayLike:
+        """``(n_tables, probes + 1)`` bucket codes to visit, most likely first.
+
+        Flipping bit ``b`` moves the query across hyperplane ``b``; the cost of
+        a set of flips is the sum of the query's distances to those planes.
+        Only subsets of the ``m`` closest planes are considered, which holds
+        the cheapest ``probes`` sets as long as ``2**m > probes``.
+        """
+
+        projections = np.einsum("d,tdb->tb", unit, self.planes)
+        codes = (projections > 0) @ self.weights
+        if not probes:
+            return codes[:, None]
+        n_bits = len(self.weights)
+        m = min(n_bits, probes.bit_length() + 1)
+        closest = np.argsort(np.abs(projections), axis=1)[:, :m]
+        margins = np.take_along_axis(np.abs(projections), closest, axis=1)
+        subsets = (np.arange(1 << m)[:, None] >> np.arange(m)) & 1
+        order = np.argsort(margins @ subsets.T, axis=1, kind="stable")[:, : probes + 1]
+        masks = np.einsum("tpm,tm->tp", subsets[order], self.weights[closest])
+        return codes[:, None] ^ masks
+
+    def candidates(self, unit: ArrayLike, probes: Optional[int] = None) -> ArrayLike:
+        """Live slots in the probed buckets of every table, plus recent ones."""
+
+        probes = self.probes if probes is None else probes
+        if self.tables is None:
+            return np.zeros(0, dtype=np.intp)
+        wanted = (self.probe_codes(unit, probes) | self.offsets).ravel()
+        low = np.searchsorted(self.tables, wanted, side="left")
+        lengths = np.searchsorted(self.tables, wanted, side="right") - low
+        total = int(lengths.sum())
+        # Concatenate the [low, low + length) ranges without a Python loop.
+        starts = np.repeat(low - (np.cumsum(lengths) - lengths), lengths)
+        found = self.table_slots[starts + np.arange(total)]
+        if self.recent:
+            found = np.concatenate([found, self.recent])
+        found = np.unique(found)
+        return found[self.alive[found]]
+
+    def _query_seconds(self, queries: ArrayLike, k: int, probes: Optional[int]) -> float:
+        """Best of two timings of top-``k`` searches, by LSH or (``None``) exactly."""
+
+        best = float("inf")
+        for _ in range(2):
+            start = time.perf_counter()
+            for slot in queries.tolist():
+                unit = self.vectors[slot]
+                if probes is None:
+                    _, scores = self.exact_scores(unit)
+                else:
+                    found = self.candidates(unit, probes)
+                    scores = self.vectors[found] @ unit
+                if len(scores) > k:
+                    np.argpartition(-scores, k - 1)[:k]
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def calibrate(
+        self,
+        k: int,
+        recall_target: float,
+        max_probes: int,
+        max_candidates: float,
+        rng: np.random.Generator,
+        sample: int = 64,
+    ) -> None:
+        """Pick the fewest probes reaching ``recall_target`` on stored vectors.
+
+        Sampled vectors query the group with themselves left out of both the
+        exact and the LSH answers.  If no probe count up to ``max_probes``
+        reaches the target within ``max_candidates`` (a fraction of the
+        group), or if the chosen probe count answers the sample more slowly
+        than brute force, queries fall back to brute force.
+        """
+
+        self.calibrated_size = len(self)
+        slots = np.flatnonzero(self.alive)
+        k = min(k, len(slots) - 1)
+        if k <= 0:
+            self.use_tables = False
+            return
+        queries = rng.choice(slots, min(sample, len(slots)), replace=False)
+        exact = []
+        for slot in queries.tolist():
+            scores = self.vectors[slots] @ self.vectors[slot]
+            top = slots[np.argpartition(-scores, k)[: k + 1]]
+            exact.append(set(top.tolist()) - {slot})
+        probes = 0
+        while True:
+            hits = 0
+            seen = 0
+            for slot, truth in zip(queries.tolist(), exact):
+                found = self.candidates(self.vectors[slot], probes)
+                seen += len(found)
+                hits += len(truth.intersection(found.tolist()))
+            recall = hits / max(1, sum(len(truth) for truth in exact))
+            if seen / len(queries) > max_candidates * len(slots):
+                break
+            if recall >= recall_target:
+                self.probes = probes
+                self.use_tables = self._query_seconds(queries, k, probes) < self._query_seconds(
+                    queries, k, None
+                )
+                return
+            if probes >= max_probes:
+                break
+            probes = max(1, 2 * probes)
+        self.probes = max_probes
+        self.use_tables = False
+
+
+class MemoryIndex:
+    """Cosine top-k index over the memories of a population.
+
+    Parameters
+    ----------
+    exact_threshold:
+        Groups with at most this many vectors are searched by brute force.
+    n_tables, n_bits:
+        Number of LSH tables and hyperplanes per table used for larger groups.
+    seed:
+        Seed of the random hyperplanes, so queries are reproducible.
+    probes:
+        Neighbouring buckets probed per table when ``recall_target`` is ``None``.
+    recall_target:
+        Recall@``calibration_k`` each LSH group is calibrated to; see the
+        module docs.  ``None`` keeps ``probes`` fixed.
+    max_probes, max_candidates:
+        Limits of the calibration: the largest probe count tried and the
+        fraction of a group that may be re-ranked before brute force wins.
+    calibration_k:
+        ``k`` used when measuring recall during calibration.
+    """
+
+    def __init__(
+        self,
+        exact_threshold: int = 2048,
+        n_tables: int = 8,
+        n_bits: int = 10,
+        seed: Optional[int] = 0,
+        probes: int = 0,
+        recall_target: Optional[float] = 0.9,
+        max_probes: int = 32,
+        max_candidates: float = 0.25,
+        calibration_k: int = 10,
+    ) -> None:
+        self.exact_threshold = exact_threshold
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.probes = probes
+        self.recall_target = recall_target
+        self.max_probes = max_probes
+        self.max_candidates = max_candidates
+        self.calibration_k = calibration_k
+        self._rng = np.random.default_rng(seed)
+        self._groups: Dict[int, _DimensionGroup] = {}
+        self._dims: Dict[Tuple[int, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._dims)
+
+    # ------------------------------------------------------------------
+    def add(self, row: int, key: str, vector: ArrayLike) -> None:
+        """Index (or re-index) the memory ``key`` held by agent ``row``."""
+
+        self.remove(row, key)
+        try:
+            vector = np.asarray(vector, dtype=float).ravel()
+        except (TypeError, ValueError):
+            return
+        if not len(vector):
+            return
+        norm = np.linalg.norm(vector)
+        unit = vector / norm if norm > 0 else vector
+        group = self._groups.get(len(vector))
+        if group is None:
+            group = _DimensionGroup(len(vector), self.n_tables, self.n_bits, self._rng)
+            self._groups[len(vector)] = group
+        owner = (row, key)
+        group.add(owner, unit)
+        self._dims[owner] = len(vector)
+        self._maintain(group)
+
+    def add_many(self, rows: Sequence[int], keys: Sequence[str], vectors: ArrayLike) -> None:
+        """Index one ``(m, w)`` block of memories, one ``(row, key)`` per vector."""
+
+        owners = list(zip(rows, keys))
+        vectors = np.asarray(vectors, dtype=float).reshape(len(owners), -1)
+        dim = vectors.shape[1]
+        if not owners or not dim:
+            return
+        if len(set(owners)) != len(owners):
+            # Later duplicates replace earlier ones, exactly as with add().
+            for (row, key), vector in zip(owners, vectors):
+                self.add(row, key, vector)
+            return
+        for owner in owners:
+            if owner in self._dims:
+                self.remove(*owner)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        group = self._groups.get(dim)
+        if group is None:
+            group = _DimensionGroup(dim, self.n_tables, self.n_bits, self._rng)
+            self._groups[dim] = group
+        group.add_many(owners, vectors / norms)
+        self._dims.update(dict.fromkeys(owners, dim))
+        self._maintain(group)
+
+    def extend(self, entries: Iterable[Tuple[int, str, ArrayLike]]) -> None:
+        """Index many ``(row, key, vector)`` entries into an empty index."""
+
+        if self._dims:
+            for row, key, vector in entries:
+                self.add(row, key, vector)
+            return
+        grouped: Dict[int, Tuple[List[Tuple[int, str]], List[ArrayLike]]] = {}
+        for row, key, vector in entries:
+            try:
+                vector = np.asarray(vector, dtype=float).ravel()
+            except (TypeError, ValueError):
+                continue
+            if len(vector):
+                owners, vectors = grouped.setdefault(len(vector), ([], []))
+                owners.append((row, key))
+                vectors.append(vector)
+        for dim, (owners, vectors) in grouped.items():
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            group = _DimensionGroup(dim, self.n_tables, self.n_bits, self._rng)
+            group.load(owners, matrix / norms)
+            self._maintain(group)
+            self._groups[dim] = group
+            self._dims.update(dict.fromkeys(group.slots, dim))
+
+    def _maintain(self, group: _DimensionGroup) -> None:
+        """Build the LSH tables of a grown group and keep its calibration fresh."""
+
+        if len(group) <= self.exact_threshold:
+            return
+        if group.tables is None:
+            group.build_tables()
+        elif self.recall_target is None or len(group) < 2 * group.calibrated_size:
+            return
+        if self.recall_target is None:
+            group.probes = self.probes
+            return
+        group.calibrate(
+            self.calibration_k, self.recall_target, self.max_probes, self.max_candidates, self._rng
+        )
+
+    def remove(self, row: int, key: str) -> None:
+        dim = self._dims.pop((row, key), None)
+        if dim is not None:
+            self._groups[dim].remove((row, key))
+
+    def query(self, vector: ArrayLike, k: int = 5) -> List[Match]:
+        """Return up to ``k`` ``(row, key, similarity)`` matches, best first.
+
+        Only memories with the same dimensionality as ``vector`` are compared.
+        """
+
+        vector = np.asarray(vector, dtype=float).ravel()
+        group = self._groups.get(len(vector))
+        if group is None or not len(group) or k <= 0:
+            return []
+        norm = np.linalg.norm(vector)
+        unit = vector / norm if norm > 0 else vector
+
+        slots = None
+        if group.tables is not None and group.use_tables and len(group) > self.exact_threshold:
+            slots = group.candidates(unit)
+            if len(slots) < k:
+                slots = None
+        if slots is not None:
+            scores = group.vectors[slots] @ unit
+        else:
+            slots, scores = group.exact_scores(unit)
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        matches: List[Match] = []
+        for position in top.tolist():
+            row, key = group.owners[slots[position]]  # type: ignore[misc]
+            matches.append((row, key, float(scores[position])))
+        return matches
+
+
+__all__ = ["MemoryIndex"]
@@ -0,0 +1,211 @@
+"""Multi-qubit tensor-product states with memory-bounded simulation.
+
+An ``n`` qubit state is stored as a tensor of shape ``(2,) * n`` rather than a
+flat vector.  A ``k`` qubit gate is applied by contracting its
+``(2,) * 2k`` reshaped form with the ``k`` target axes, so no
+``2**n × 2**n`` matrix is ever built and the cost of one gate is
+``O(2**n · 2**k)``.  Qubit 0 is the most significant bit, matching
+``np.kron`` ordering and ``|q0 q1 … q(n-1)⟩`` labels.
+
+Before allocating a state the number of bytes it needs, including the
+temporaries of a gate contraction, is checked against a memory budget.  The
+budget defaults to half of the physical memory and can be overridden with the
+``AGOTHE_MEMORY_BUDGET`` environment variable (in bytes).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = np.ndarray
+
+# A gate contraction holds the input, the contracted result and the
+# transposed output at the same time.
+_WORKSPACE_FACTOR = 3
+_FALLBACK_BUDGET = 4 * 1024**3
+
+
+def memory_budget() -> int:
+    """Number of bytes simulations may use for state vectors."""
+
+    configured = os.environ.get("AGOTHE_MEMORY_BUDGET")
+    if configured:
+        return int(configured)
+    try:
+        physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return _FALLBACK_BUDGET
+    return physical // 2
+
+
+def check_memory_budget(
+    n_qubits: int,
+    count: int = 1,
+    dtype: Union[type, np.dtype] = complex,
+    budget: Optional[int] = None,
+) -> int:
+    """Raise ``MemoryError`` when ``count`` states of ``n_qubits`` do not fit.
+
+    Returns the number of bytes the simulation is expected to need.
+    """
+
+    required = _WORKSPACE_FACTOR * count * (1 << n_qubits) * np.dtype(dtype).itemsize
+    budget = memory_budget() if budget is None else budget
+    if required > budget:
+        raise MemoryError(
+            f"{count} state(s) of {n_qubits} qubits need about {required / 1024**2:.1f} MiB, "
+            f"exceeding the memory budget of {budget / 1024**2:.1f} MiB"
+        )
+    return required
+
+
+def qubit_count(dim: int) -> int:
+    """Number of qubits represented by a state vector of length ``dim``."""
+
+    n_qubits = int(dim).bit_length() - 1
+    if dim < 2 or 1 << n_qubits != dim:
+        raise ValueError(f"State dimension {dim} is not a power of two")
+    return n_qubits
+
+
+def apply_gate_rows(states: ArrayLike, gate: ArrayLike, qubits: Sequence[int]) -> ArrayLike:
+    """Apply a ``k`` qubit ``gate`` to the given qubits of every row of ``states``.
+
+    ``states`` has shape ``(m, 2**n)`` and ``gate`` shape ``(2**k, 2**k)``.
+    Returns a new ``(m, 2**n)`` array.
+    """
+
+    states = np.asarray(states)
+    rows, dim = states.shape
+    n_qubits = qubit_count(dim)
+    qubits = [int(qubit) for qubit in qubits]
+    k = len(qubits)
+    if len(set(qubits)) != k or not all(0 <= qubit < n_qubits for qubit in qubits):
+        raise ValueError(f"Invalid target qubits {qubits} for a {n_qubits} qubit state")
+    gate = np.asarray(gate, dtype=np.result_type(states.dtype, np.complex64))
+    if gate.shape != (1 << k, 1 << k):
+        raise ValueError(f"A gate on {k} qubit(s) must have shape {(1 << k, 1 << k)}")
+
+    tensor = states.reshape((rows,) + (2,) * n_qubits)
+    axes = [qubit + 1 for qubit in qubits]
+    contracted = np.tensordot(tensor, gate.reshape((2,) * (2 * k)), axes=(axes, list(range(k, 2 * k))))
+    # tensordot appends the gate's output axes; move them back into place.
+    result = np.moveaxis(contracted, list(range(n_qubits + 1 - k, n_qubits + 1)), axes)
+    return np.ascontiguousarray(result).reshape(rows, dim)
+
+
+class MultiQubitState:
+    """State of ``n_qubits`` qubits stored as a ``(2,) * n`` tensor.
+
+    The object behaves like a flat state vector under ``np.asarray``, so it can
+    be passed directly to :class:`~agothe_app.core.quantum_consciousness.ConsciousnessAxiom`
+    whose ``measure`` and ``coherence`` then operate on all ``2**n`` amplitudes.
+    """
+
+    def __init__(
+        self,
+        n_qubits: int,
+        amplitudes: Optional[ArrayLike] = None,
+        budget: Optional[int] = None,
+    ) -> None:
+        check_memory_budget(n_qubits, budget=budget)
+        self.n_qubits = n_qubits
+        if amplitudes is None:
+            tensor = np.zeros((2,) * n_qubits, dtype=complex)
+            tensor[(0,) * n_qubits] = 1.0
+        else:
+            amplitudes = np.asarray(amplitudes, dtype=complex)
+            if amplitudes.size != 1 << n_qubits:
+                raise ValueError(f"Expected {1 << n_qubits} amplitudes, got {amplitudes.size}")
+            tensor = amplitudes.reshape((2,) * n_qubits)
+            tensor = tensor / np.linalg.norm(tensor)
+        self.tensor = tensor
+
+    @classmethod
+    def from_bloch(
+        cls, angles: Iterable[Tuple[float, float]], budget: Optional[int] = None
+    ) -> "MultiQubitState":
+        """Product state with one ``(theta, phi)`` Bloch angle pair per qubit."""
+
+        angles = list(angles)
+        check_memory_budget(len(angles), budget=budget)
+        vector = np.ones(1, dtype=complex)
+        for theta, phi in angles:
+            qubit = np.array([np.cos(theta / 2), np.exp(1j * phi) * np.sin(theta / 2)])
+            vector = np.multiply.outer(vector, qubit).reshape(-1)
+        return cls(len(angles), vector, budget=budget)
+
+    # ------------------------------------------------------------------
+    @property
+    def vector(self) -> ArrayLike:
+        """Flat ``2**n`` view over the amplitudes."""
+
+        return self.tensor.reshape(-1)
+
+    def __array__(self, dtype=None, copy=None) -> ArrayLike:
+        vector = self.vector
+        return vector if dtype is None else vector.astype(dtype)
+
+    def __len__(self) -> int:
+        return 1 << self.n_qubits
+
+    def apply_gate(self, gate: ArrayLike, qubits: Union[int, Sequence[int]]) -> "MultiQubitState":
+        """Apply a one or two (or ``k``) qubit gate in place."""
+
+        qubits = [qubits] if isinstance(qubits, (int, np.integer)) else list(qubits)
+        updated = apply_gate_rows(self.vector[None, :], gate, qubits)
+        self.tensor = updated.reshape((2,) * self.n_qubits)
+        return self
+
+    def probabilities(self) -> ArrayLike:
+        return np.abs(self.vector) ** 2
+
+    def marginal(self, qubit: int) -> ArrayLike:
+        """Probabilities of ``|0⟩`` and ``|1⟩`` for a single qubit."""
+
+        probabilities = np.abs(self.tensor) ** 2
+        axes = tuple(axis for axis in range(self.n_qubits) if axis != qubit)
+        return probabilities.sum(axis=axes)
+
+    def measure(
+        self, qubit: Optional[int] = None, rng: Optional[np.random.Generator] = None
+    ) -> int:
+        """Measure one qubit (or all when ``qubit`` is ``None``) and collapse."""
+
+        rng = rng or np.random.default_rng()
+        if qubit is None:
+            probabilities = self.probabilities()
+            outcome = int(rng.choice(len(probabilities), p=probabilities / probabilities.sum()))
+            tensor = np.zeros_like(self.vector)
+            tensor[outcome] = 1.0
+            self.tensor = tensor.reshape((2,) * self.n_qubits)
+            return outcome
+        marginal = self.marginal(qubit)
+        outcome = int(rng.random() * marginal.sum() >= marginal[0])
+        index = [slice(None)] * self.n_qubits
+        index[qubit] = 1 - outcome
+        self.tensor[tuple(index)] = 0.0
+        self.tensor /= np.linalg.norm(self.tensor)
+        return outcome
+
+    def coherence(self) -> float:
+        """Coherence score using the same definition as the agents."""
+
+        probabilities = self.probabilities()
+        entropy = -np.sum(probabilities * np.log(probabilities + 1e-12))
+        return float(np.exp(-entropy))
+
+    def __repr__(self) -> str:  # pragma: no cover - repr used for debugging
+        return f"MultiQubitState(n_qubits={self.n_qubits})"
+
+
+__all__ = [
+    "MultiQubitState",
+    "apply_gate_rows",
+    "check_memory_budget",
+    "memory_budget",
+    "qubit_count",
+]
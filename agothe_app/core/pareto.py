@@ -0,0 +1,287 @@
+"""Non-dominated sorting and crowding distance for multi-objective evolution.
+
+Objectives are ``(N, M)`` arrays where every column is maximised, like the
+scalar fitness elsewhere in :mod:`agothe_app.core`.
+
+* :func:`non_dominated_ranks` assigns every row its front (``0`` is the
+  Pareto front).  Rows are visited in lexicographic order, so every row is
+  placed after all rows that could dominate it, and the front is found by a
+  binary search over the fronts built so far.  For two objectives each front
+  is summarised by its largest second objective and the whole sort costs
+  ``O(N log N)``; for three objectives each front keeps a staircase of its
+  second and third objectives (``O(N log² N)``); with more objectives rows
+  are placed in batches checked with vectorised comparisons against the
+  front members, which grows with the front sizes (fine for tens of
+  thousands of rows).
+* :func:`crowding_distance` is the NSGA-II density estimate, computed for
+  all fronts at once with one sort per objective (``O(M N log N)``).
+* :func:`pareto_fitness` folds both into one scalar that orders rows by front
+  first and by crowding distance second, so the selection operators of
+  :mod:`agothe_app.core.selection` perform NSGA-II's crowded comparison.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+import numpy as np
+
+ArrayLike = np.ndarray
+
+
+def _as_objectives(objectives: ArrayLike) -> ArrayLike:
+    values = np.asarray(objectives, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.ndim != 2:
+        raise ValueError(f"Objectives must have shape (N, M), got {values.shape}")
+    return values
+
+
+def non_dominated_ranks(objectives: ArrayLike) -> ArrayLike:
+    """Front index of every row; equal rows share a front."""
+
+    values = _as_objectives(objectives)
+    size, count = values.shape
+    ranks = np.zeros(size, dtype=np.intp)
+    if size == 0:
+        return ranks
+    if count == 1:
+        # A single objective orders rows completely: one front per distinct value.
+        distinct, inverse = np.unique(-values[:, 0], return_inverse=True)
+        return inverse.reshape(size).astype(np.intp)
+
+    order = np.lexsort(tuple(-values[:, column] for column in reversed(range(count))))
+    ordered = values[order]
+    duplicate = np.zeros(size, dtype=bool)
+    duplicate[1:] = np.all(ordered[1:] == ordered[:-1], axis=1)
+    if count == 2:
+        sorted_ranks = _sweep_two(ordered[:, 1].tolist(), duplicate.tolist())
+    elif count == 3:
+        sorted_ranks = _sweep_three(ordered[:, 1].tolist(), ordered[:, 2].tolist(), duplicate.tolist())
+    else:
+        sorted_ranks = _sweep(ordered)
+    ranks[order] = sorted_ranks
+    return ranks
+
+
+def first_front(objectives: ArrayLike) -> ArrayLike:
+    """Rows of the Pareto front in ascending order.
+
+    For up to two objectives this is a single sort plus a running maximum;
+    otherwise it falls back to :func:`non_dominated_ranks`.
+    """
+
+    values = _as_objectives(objectives)
+    size, count = values.shape
+    if size == 0 or count > 2:
+        return np.flatnonzero(non_dominated_ranks(values) == 0)
+    if count == 1:
+        return np.flatnonzero(values[:, 0] == values[:, 0].max())
+    order = np.lexsort((-values[:, 1], -values[:, 0]))
+    second = values[order, 1]
+    best = np.maximum.accumulate(second)
+    keep = np.ones(size, dtype=bool)
+    # A row is dominated by an earlier row with a larger second objective, or
+    # an equal one paired with a larger first objective.
+    keep[1:] = second[1:] > best[:-1]
+    ties = np.flatnonzero(~keep[1:] & (second[1:] == best[:-1])) + 1
+    if len(ties):
+        first = values[order, 0]
+        # Rows equal to the running best only survive as exact duplicates of it.
+        holder = np.maximum.accumulate(np.where(keep, np.arange(size), 0))
+        same = (first[ties] == first[holder[ties - 1]]) & (second[ties] == second[holder[ties - 1]])
+        keep[ties[same]] = True
+    return np.sort(order[keep])
+
+
+def _sweep_two(second: List[float], duplicate: List[bool]) -> List[int]:
+    """Two-objective sort: rows arrive with the first objective descending.
+
+    A front dominates the next row exactly when its latest member has a
+    larger second objective.  Those values never increase from one front to
+    the next, so ``keys`` (their negation) is sorted for ``bisect``.
+    """
+
+    keys: List[float] = []
+    ranks: List[int] = []
+    for value, same in zip(second, duplicate):
+        if same:
+            ranks.append(ranks[-1])
+            continue
+        front = bisect_right(keys, -value)
+        if front == len(keys):
+            keys.append(-value)
+        else:
+            keys[front] = -value
+        ranks.append(front)
+    return ranks
+
+
+def _sweep_three(second: List[float], third: List[float], duplicate: List[bool]) -> List[int]:
+    """Three-objective sort with a staircase per front.
+
+    Every earlier row is at least as good on the first objective, so a front
+    dominates the next (distinct) row when one member is at least as good on
+    the other two.  Each front keeps the 2-D maxima of those two objectives
+    sorted by the second one ascending (and hence the third descending), which
+    answers that question with one ``bisect``.
+    """
+
+    fronts: List[Tuple[List[float], List[float]]] = []
+    ranks: List[int] = []
+
+    def dominated(front: int, b: float, c: float) -> bool:
+        seconds, thirds = fronts[front]
+        position = bisect_left(seconds, b)
+        return position < len(seconds) and -thirds[position] >= c
+
+    for b, c, same in zip(second, third, duplicate):
+        if same:
+            ranks.append(ranks[-1])
+            continue
+        low, high = 0, len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            if dominated(middle, b, c):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(fronts):
+            fronts.append(([], []))
+        seconds, thirds = fronts[low]
+        # Drop the maxima the new row covers; they sit right before its slot.
+        stop = bisect_left(seconds, b)
+        if stop < len(seconds) and seconds[stop] == b:
+            stop += 1
+        start = bisect_left(thirds, -c, 0, stop)
+        seconds[start:stop] = [b]
+        thirds[start:stop] = [-c]
+        ranks.append(low)
+    return ranks
+
+
+def _sweep(ordered: ArrayLike, batch: int = 256) -> ArrayLike:
+    """Efficient non-dominated sort with binary search for ``M > 3``.
+
+    A row dominated by some member of front ``k`` is also dominated by a
+    member of every earlier front, which makes the binary search valid.  Rows
+    are placed ``batch`` at a time: all rows of a batch search the fronts of
+    earlier batches together, then dominance inside the batch is resolved
+    with one ``(B, B)`` comparison.
+    """
+
+    size, count = ordered.shape
+    ranks = np.zeros(size, dtype=np.intp)
+    members: List[ArrayLike] = []
+    sizes: List[int] = []
+    for start in range(0, size, batch):
+        rows = ordered[start : start + batch]
+        low = np.zeros(len(rows), dtype=np.intp)
+        high = np.full(len(rows), len(members), dtype=np.intp)
+        while True:
+            active = np.flatnonzero(low < high)
+            if not len(active):
+                break
+            middle = (low[active] + high[active]) // 2
+            for front in np.unique(middle).tolist():
+                picked = active[middle == front]
+                hit = _dominated_by(members[front][: sizes[front]], rows[picked])
+                low[picked[hit]] = front + 1
+                high[picked[~hit]] = front
+
+        # Earlier rows of the batch may dominate later ones; propagate until stable.
+        inside = _dominance(rows, rows)
+        placed = low
+        while True:
+            chained = np.where(inside, placed[:, None] + 1, 0).max(axis=0)
+            updated = np.maximum(low, chained)
+            if np.array_equal(updated, placed):
+                break
+            placed = updated
+
+        for front in np.unique(placed).tolist():
+            joining = rows[placed == front]
+            if front == len(members):
+                members.append(np.empty((max(8, len(joining)), count)))
+                sizes.append(0)
+            needed = sizes[front] + len(joining)
+            if needed > len(members[front]):
+                grown = np.empty((max(needed, 2 * len(members[front])), count))
+                grown[: sizes[front]] = members[front][: sizes[front]]
+                members[front] = grown
+            members[front][sizes[front] : needed] = joining
+            sizes[front] = needed
+        ranks[start : start + len(rows)] = placed
+    return ranks
+
+
+def _dominance(block: ArrayLike, rows: ArrayLike) -> ArrayLike:
+    """``(len(block), len(rows))`` matrix of "block row dominates row"."""
+
+    ahead = block[:, None, :]
+    behind = rows[None, :, :]
+    return np.all(ahead >= behind, axis=2) & np.any(ahead > behind, axis=2)
+
+
+def _dominated_by(block: ArrayLike, rows: ArrayLike) -> ArrayLike:
+    """Whether each of ``rows`` is dominated by some row of ``block``."""
+
+    hit = np.zeros(len(rows), dtype=bool)
+    # Chunk the front so the comparison tensor stays small.
+    step = max(1, (1 << 20) // max(1, len(rows) * block.shape[1]))
+    for start in range(0, len(block), step):
+        hit |= _dominance(block[start : start + step], rows).any(axis=0)
+    return hit
+
+
+def crowding_distance(objectives: ArrayLike, ranks: ArrayLike) -> ArrayLike:
+    """NSGA-II crowding distance of every row within its front.
+
+    Boundary rows of every objective get ``inf``; interior rows sum the gap
+    between their neighbours normalised by the front's range.
+    """
+
+    values = _as_objectives(objectives)
+    size, count = values.shape
+    distance = np.zeros(size)
+    if size == 0:
+        return distance
+    ranks = np.asarray(ranks)
+    for column in range(count):
+        order = np.lexsort((values[:, column], ranks))
+        sorted_values = values[order, column]
+        sorted_ranks = ranks[order]
+        first = np.ones(size, dtype=bool)
+        first[1:] = sorted_ranks[1:] != sorted_ranks[:-1]
+        last = np.ones(size, dtype=bool)
+        last[:-1] = first[1:]
+        starts = np.flatnonzero(first)
+        stops = np.flatnonzero(last)
+        span = np.repeat(sorted_values[stops] - sorted_values[starts], stops - starts + 1)
+        gap = np.zeros(size)
+        gap[1:-1] = sorted_values[2:] - sorted_values[:-2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = np.where(span > 0, gap / span, 0.0)
+        contribution[first | last] = np.inf
+        distance[order] += contribution
+    return distance
+
+
+def pareto_fitness(objectives: ArrayLike) -> ArrayLike:
+    """Scalar ``-rank + crowding`` with crowding squashed into ``[0, 0.5]``.
+
+    Rows of the Pareto front score in ``[0, 0.5]``, rows of front ``k`` in
+    ``[-k, -k + 0.5]``, so comparing scores is NSGA-II's crowded comparison.
+    """
+
+    values = _as_objectives(objectives)
+    ranks = non_dominated_ranks(values)
+    crowding = crowding_distance(values, ranks)
+    with np.errstate(invalid="ignore"):
+        squashed = np.where(np.isinf(crowding), 1.0, crowding / (1.0 + crowding))
+    return 0.5 * squashed - ranks
+
+
+__all__ = ["crowding_distance", "first_front", "non_dominated_ranks", "pareto_fitness"]
@@ -0,0 +1,68 @@
+"""Numeric precision policy for :mod:`agothe_app.core`.
+
+Populations allocate their state, intent and cache arrays with the dtypes of
+the active policy.  ``"double"`` (float64/complex128) is the default; the
+``"single"`` policy (float32/complex64) halves the memory footprint of every
+agent, which is plenty for the experiments run with this package.
+
+The policy is read when a population is created, so existing populations
+keep the precision they were built with::
+
+    from agothe_app.core.precision import precision
+
+    with precision("single"):
+        population = protocol.spawn_population(1_000_000)
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+_POLICIES: Dict[str, Tuple[np.dtype, np.dtype]] = {
+    "double": (np.dtype(np.float64), np.dtype(np.complex128)),
+    "single": (np.dtype(np.float32), np.dtype(np.complex64)),
+}
+_current = "double"
+
+
+def set_precision(name: str) -> None:
+    """Select the global precision policy (``"double"`` or ``"single"``)."""
+
+    global _current
+    if name not in _POLICIES:
+        raise ValueError(f"Unknown precision '{name}', expected one of {sorted(_POLICIES)}")
+    _current = name
+
+
+def get_precision() -> str:
+    return _current
+
+
+def real_dtype() -> np.dtype:
+    """Floating point dtype of the active policy."""
+
+    return _POLICIES[_current][0]
+
+
+def complex_dtype() -> np.dtype:
+    """Complex dtype of the active policy."""
+
+    return _POLICIES[_current][1]
+
+
+@contextmanager
+def precision(name: str) -> Iterator[None]:
+    """Temporarily switch the precision policy."""
+
+    previous = _current
+    set_precision(name)
+    try:
+        yield
+    finally:
+        set_precision(previous)
+
+
+__all__ = ["complex_dtype", "get_precision", "precision", "real_dtype", "set_precision"]
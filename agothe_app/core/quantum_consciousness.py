@@ -5,16 +5,34 @@ This module intentionally mixes real numerical algorithms with a touch of
 used by the web API, the CLI demo and the Streamlit dashboard.  Even though the
 physics here are highly simplified, the abstractions are powerful enough to run
 experiments and to drive believable simulations.
+
+Agents do not own their numerical data.  Every agent is a lightweight view over
+one row of an :class:`AgentPopulation`, which keeps all state vectors in a
+single contiguous complex ``(N, d)`` array and all intents in a float
+``(N, k)`` array.  Agents created on their own keep their single row in a
+small slotted record instead, and are moved into a private one-row population
+only when they use a population feature (entanglement registry, memory index,
+batch functions), so the classic object API stays as cheap as it used to be
+while large populations can be driven through the batched population methods.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, Optional
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
+from .entanglement import EntanglementRegistry
+from .memory_index import MemoryIndex
+from .multi_qubit import apply_gate_rows
+from .precision import complex_dtype, precision, real_dtype
+
 ArrayLike = np.ndarray
+Rows = Union[None, int, slice, Sequence, np.ndarray]
+RandomSource = Union[None, int, np.random.Generator]
+# A memory key, one key per row, or a function naming the key from the bank.
+MemoryKeys = Union[str, Sequence[str], Callable[[Dict[str, ArrayLike]], str]]
 
 
 def _normalize(state: ArrayLike) -> ArrayLike:
@@ -33,6 +51,23 @@ def _normalize(state: ArrayLike) -> ArrayLike:
     return state / norm
 
 
+def _normalize_rows(rows: ArrayLike) -> ArrayLike:
+    """Row-wise counterpart of :func:`_normalize` for ``(N, d)`` arrays.
+
+    Zero rows fall back to the first basis vector, exactly like the scalar
+    helper, but the dtype of ``rows`` is preserved.
+    """
+
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    zero = norms[:, 0] == 0
+    norms[zero] = 1.0
+    normalised = rows / norms
+    if zero.any():
+        normalised[zero] = 0
+        normalised[zero, 0] = 1
+    return normalised
+
+
 def create_bloch_state(theta: float, phi: float) -> ArrayLike:
     """Create a single qubit Bloch sphere state.
 
@@ -49,7 +84,1293 @@ def create_bloch_state(theta: float, phi: float) -> ArrayLike:
     )
 
 
-@dataclass
+def bloch_states(theta: ArrayLike, phi: ArrayLike, dtype: Any = complex) -> ArrayLike:
+    """Row-wise :func:`create_bloch_state` for arrays of angles, shape ``(N, 2)``."""
+
+    states = np.empty((len(theta), 2), dtype=dtype)
+    half = theta / 2
+    states[:, 0] = np.cos(half)
+    # Real and imaginary parts separately avoid a complex exponential.
+    magnitude = np.sin(half)
+    states[:, 1].real = np.cos(phi) * magnitude
+    states[:, 1].imag = np.sin(phi) * magnitude
+    return states
+
+
+# Agent classes are stored per row as small integer codes.  The built-in
+# classes are registered at import time (see the bottom of the module) so their
+# codes are stable; user subclasses are appended on first use.
+_AGENT_TYPES: List[type] = []
+
+
+def _type_code(cls: type) -> int:
+    try:
+        return _AGENT_TYPES.index(cls)
+    except ValueError:
+        _AGENT_TYPES.append(cls)
+        return len(_AGENT_TYPES) - 1
+
+
+def _mix_counts(
+    size: int, mix: Union[Sequence[type], Mapping[type, float]]
+) -> Tuple[List[type], ArrayLike]:
+    """Split ``size`` rows between the classes of ``mix`` by largest remainder."""
+
+    if isinstance(mix, Mapping):
+        classes = list(mix)
+        weights = np.asarray([mix[cls] for cls in classes], dtype=float)
+    else:
+        classes = list(mix)
+        weights = np.ones(len(classes))
+    if not classes or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("A type mix needs at least one class with a positive weight")
+    share = size * weights / weights.sum()
+    counts = np.floor(share).astype(np.int64)
+    # Hand the leftover rows to the largest fractional parts, earlier classes first.
+    counts[np.argsort(counts - share, kind="stable")[: size - int(counts.sum())]] += 1
+    return classes, counts
+
+
+class _LazyLabels(Sequence):
+    """Label column whose entries are produced on access.
+
+    Subclasses implement :meth:`_label`.  Supports the list operations the
+    population relies on (indexing, assignment, ``append`` and ``extend``);
+    edits are kept in memory.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._base = size
+        self._overrides: Dict[int, str] = {}
+        self._appended: List[str] = []
+
+    def _label(self, index: int) -> str:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return self._base + len(self._appended)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._check(index)
+        if index >= self._base:
+            return self._appended[index - self._base]
+        label = self._overrides.get(index)
+        return self._label(index) if label is None else label
+
+    def __setitem__(self, index: int, value: str) -> None:
+        index = self._check(index)
+        if index >= self._base:
+            self._appended[index - self._base] = value
+        else:
+            self._overrides[index] = value
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, value: str) -> None:
+        self._appended.append(value)
+
+    def extend(self, values: Iterable[str]) -> None:
+        self._appended.extend(values)
+
+    @property
+    def edited(self) -> bool:
+        return bool(self._overrides or self._appended)
+
+    def take(self, rows: ArrayLike) -> List[str]:
+        """Labels of ``rows`` as a plain list."""
+
+        return [self[row] for row in rows.tolist()]
+
+    def _check(self, index: int) -> int:
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("label index out of range")
+        return index
+
+
+class _BlockLabels(_LazyLabels):
+    """``"<prefix>_<row>"`` labels for rows laid out in per-class blocks."""
+
+    def __init__(self, bounds: ArrayLike, prefixes: List[str]) -> None:
+        super().__init__(int(bounds[-1]))
+        self._bounds = bounds
+        self._prefixes = prefixes
+
+    def _label(self, index: int) -> str:
+        block = int(np.searchsorted(self._bounds, index, side="right")) - 1
+        return f"{self._prefixes[block]}_{index}"
+
+    def take(self, rows: ArrayLike) -> List[str]:
+        if self.edited:
+            return super().take(rows)
+        prefixes = self._prefixes
+        blocks = np.searchsorted(self._bounds, rows, side="right") - 1
+        return [f"{prefixes[block]}_{row}" for block, row in zip(blocks.tolist(), rows.tolist())]
+
+
+class _ColumnMemories:
+    """Memory source giving row ``i`` row ``i`` of every ``(N, m)`` column."""
+
+    def __init__(self, columns: Dict[str, ArrayLike], size: int) -> None:
+        for key, column in columns.items():
+            if len(column) != size:
+                raise ValueError(f"Memory column '{key}' has {len(column)} rows, expected {size}")
+        self._columns = columns
+        self._size = size
+
+    def rows(self) -> List[int]:
+        return list(range(self._size))
+
+    def load(self, row: int) -> Dict[str, ArrayLike]:
+        if row >= self._size:
+            return {}
+        return {key: column[row].copy() for key, column in self._columns.items()}
+
+
+def _collapse_key(memory: Dict[str, ArrayLike]) -> str:
+    """Key of the next measurement trace of a :class:`RealityCollapseAxiom`."""
+
+    return f"collapse_{len(memory)}"
+
+
+def _store_keyed(memory: Dict[str, ArrayLike], keys: MemoryKeys, position: int, value: ArrayLike) -> str:
+    if isinstance(keys, str):
+        key = keys
+    elif callable(keys):
+        key = keys(memory)
+    else:
+        key = keys[position]
+    memory[key] = value
+    return key
+
+
+class _PendingMemories:
+    """Memory source layering bulk-stored blocks over another source.
+
+    :meth:`AgentPopulation.store_memories` keeps the memories of rows whose
+    bank was never read as ``(rows, keys, values)`` blocks.  A bank is built
+    on first access from the base source followed by every block mentioning
+    the row, in the order they were stored.
+    """
+
+    def __init__(self, base: Optional[Any]) -> None:
+        self.base = base
+        self.blocks: List[Tuple[ArrayLike, ArrayLike, ArrayLike, MemoryKeys, ArrayLike]] = []
+
+    def add(self, rows: ArrayLike, keys: MemoryKeys, values: ArrayLike) -> None:
+        order = np.argsort(rows, kind="stable")
+        self.blocks.append((rows, rows[order], order, keys, values))
+
+    def rows(self) -> List[int]:
+        found = set(self.base.rows()) if self.base is not None else set()
+        for rows, *_ in self.blocks:
+            found.update(np.unique(rows).tolist())
+        return sorted(found)
+
+    def load(self, row: int) -> Dict[str, ArrayLike]:
+        memory = self.base.load(row) if self.base is not None else {}
+        for _, sorted_rows, order, keys, values in self.blocks:
+            start, stop = np.searchsorted(sorted_rows, [row, row + 1])
+            for position in order[start:stop].tolist():
+                _store_keyed(memory, keys, position, values[position])
+        return memory
+
+    def load_all(self) -> Dict[int, Dict[str, ArrayLike]]:
+        """Every bank at once, replaying each block in a single pass."""
+
+        base = self.base
+        memories = {row: base.load(row) for row in base.rows()} if base is not None else {}
+        for rows, _, _, keys, values in self.blocks:
+            for position, row in enumerate(rows.tolist()):
+                memory = memories.get(row)
+                if memory is None:
+                    memory = memories[row] = {}
+                _store_keyed(memory, keys, position, values[position])
+        return memories
+
+
+class _AgentRow:
+    """Storage of a standalone agent: its one row kept in plain attributes.
+
+    It provides the row accessors agent views call on their population, so
+    creating and driving a single agent allocates two small arrays instead of
+    a whole :class:`AgentPopulation`.  :meth:`promote` moves the agent into a
+    private single-row population when it needs one.
+    """
+
+    __slots__ = ("_state", "_intent", "_label", "_memory", "_rate", "_coherence")
+
+    _entanglement: Optional[EntanglementRegistry] = None
+
+    def __init__(
+        self,
+        state: ArrayLike,
+        intent: Optional[ArrayLike],
+        label: str,
+        memory: Optional[Dict[str, ArrayLike]],
+    ) -> None:
+        state = _normalize(np.asarray(state).astype(complex)).astype(complex_dtype())
+        state.flags.writeable = False
+        self._state = state
+        self._intent = (
+            np.zeros(3, dtype=real_dtype()) if intent is None else np.array(intent, dtype=real_dtype())
+        )
+        self._label = label
+        self._memory: Optional[Dict[str, ArrayLike]] = None
+        self._rate = np.nan
+        self._coherence: Optional[float] = None
+        for key, value in (memory or {}).items():
+            self.store_memory(0, key, value)
+
+    def promote(self, agent: "ConsciousnessAxiom") -> "AgentPopulation":
+        """Move ``agent`` into a new single-row population and return it."""
+
+        with precision("single" if self._state.dtype == np.complex64 else "double"):
+            population = AgentPopulation(len(self._state), len(self._intent), capacity=1)
+        index = population.append(
+            self._state, self._intent, label=self._label, kind=type(agent), memory=self._memory
+        )
+        population._learning_rates[index] = self._rate
+        population._attach(agent, index)
+        return population
+
+    def _get_state(self, index: int) -> ArrayLike:
+        return self._state
+
+    def set_state(self, index: int, value: ArrayLike) -> None:
+        state = np.array(value, dtype=self._state.dtype).ravel()
+        state.flags.writeable = False
+        self._state = state
+        self._coherence = None
+
+    def _get_intent(self, index: int) -> ArrayLike:
+        return self._intent
+
+    def set_intent(self, index: int, value: ArrayLike) -> None:
+        value = np.asarray(value, dtype=float).ravel()
+        if len(value) == len(self._intent):
+            self._intent[:] = value
+        else:
+            self._intent = value.astype(self._intent.dtype)
+
+    def _get_label(self, index: int) -> str:
+        return self._label
+
+    def _set_label(self, index: int, value: str) -> None:
+        self._label = value
+
+    def _get_learning_rate(self, index: int) -> float:
+        return self._rate
+
+    def _set_learning_rate(self, index: int, value: float) -> None:
+        self._rate = float(value)
+
+    def _row_coherence(self, index: int) -> float:
+        if self._coherence is None:
+            probabilities = np.abs(self._state) ** 2
+            entropy = -np.sum(probabilities * np.log(probabilities + 1e-12))
+            self._coherence = float(self._intent.dtype.type(np.exp(-entropy)))
+        return self._coherence
+
+    def probabilities(self, rows: Rows = None) -> ArrayLike:
+        return (np.abs(self._state) ** 2).astype(self._intent.dtype)[None, :]
+
+    def memory_of(self, index: int) -> Dict[str, ArrayLike]:
+        if self._memory is None:
+            self._memory = {}
+        return self._memory
+
+    def store_memory(self, index: int, key: str, value: ArrayLike) -> None:
+        self.memory_of(index)[key] = np.asarray(value)
+
+    def forget_memory(self, index: int, key: str) -> None:
+        if self._memory is not None:
+            self._memory.pop(key, None)
+
+    def set_memory(self, index: int, memory: Dict[str, ArrayLike]) -> None:
+        self._memory = {key: np.asarray(value) for key, value in memory.items()}
+
+
+class AgentPopulation(Sequence):
+    """Struct-of-arrays container holding the data of many agents.
+
+    States live in one complex ``(N, d)`` array, intents in one float
+    ``(N, k)`` array and the agent class of every row in an ``int8`` column.
+    Indexing the population returns :class:`ConsciousnessAxiom` views which
+    read and write the underlying rows, so a population can be handed to any
+    code that expects a list of agents.
+
+    Measurement probabilities and coherence scores are cached per row.  Every
+    state write goes through :meth:`set_state`, :meth:`set_states`,
+    :meth:`apply_unitary` or :func:`measure_batch`, which mark the touched rows
+    dirty; the caches and the running population coherence are refreshed
+    lazily for the dirty rows only.
+
+    The batched methods (:meth:`apply_unitary`, :meth:`measure`,
+    :meth:`coherence` and :meth:`add_intent`) run as single NumPy calls over the
+    selected ``rows`` (all rows by default).
+    """
+
+    def __init__(
+        self,
+        state_dim: int = 2,
+        intent_dim: int = 3,
+        capacity: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.seed = seed
+        self._rng: Optional[np.random.Generator] = None
+        self.real_dtype = real_dtype()
+        self.complex_dtype = complex_dtype()
+        self._size = 0
+        self._states = np.zeros((capacity, state_dim), dtype=self.complex_dtype)
+        self._probabilities = np.zeros((capacity, state_dim), dtype=self.real_dtype)
+        self._coherence = np.zeros(capacity, dtype=self.real_dtype)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        self._pending: List[ArrayLike] = []
+        self._coherence_sum = 0.0
+        self._intents = np.zeros((capacity, intent_dim), dtype=self.real_dtype)
+        self._kinds = np.zeros(capacity, dtype=np.int8)
+        # NaN means "use the class default learning rate".
+        self._learning_rates = np.full(capacity, np.nan, dtype=self.real_dtype)
+        self.labels: List[str] = []
+        # Memory banks are allocated on first use; most agents never store one.
+        self._memories: Dict[int, Dict[str, ArrayLike]] = {}
+        # Optional lazy backing store (see agothe_app.core.snapshot) that
+        # materialises memory banks of loaded populations row by row.
+        self._memory_source: Optional[Any] = None
+        self._entanglement: Optional[EntanglementRegistry] = None
+        self._memory_index: Optional[MemoryIndex] = None
+        self._views: Dict[int, ConsciousnessAxiom] = {}
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_arrays(
+        cls,
+        states: ArrayLike,
+        intents: Optional[ArrayLike] = None,
+        labels: Optional[Iterable[str]] = None,
+        kinds: Union[None, type, Sequence[type]] = None,
+        seed: Optional[int] = None,
+    ) -> "AgentPopulation":
+        """Build a population directly from ``(N, d)`` and ``(N, k)`` arrays."""
+
+        states = np.asarray(states)
+        size, state_dim = states.shape
+        intents = np.zeros((size, 3)) if intents is None else np.asarray(intents)
+        population = cls(state_dim, intents.shape[1], capacity=size, seed=seed)
+        population._size = size
+        population._states[:] = _normalize_rows(states.astype(population.complex_dtype))
+        population._invalidate(slice(0, size))
+        population._intents[:] = intents
+        if kinds is None or isinstance(kinds, type):
+            population._kinds[:] = _type_code(kinds or ConsciousnessAxiom)
+        else:
+            population._kinds[:] = [_type_code(kind) for kind in kinds]
+        population.labels = list(labels) if labels is not None else ["agent"] * size
+        return population
+
+    @classmethod
+    def spawn(
+        cls,
+        size: int,
+        mix: Union[None, Sequence[type], Mapping[type, float]] = None,
+        rng: RandomSource = None,
+        intent_dim: int = 3,
+        normalize_intents: bool = False,
+        memories: Optional[Dict[str, ArrayLike]] = None,
+        seed: Optional[int] = None,
+    ) -> "AgentPopulation":
+        """Create ``size`` random single-qubit agents in bulk.
+
+        Bloch angles are drawn uniformly from ``[0, π)`` and intents from a
+        standard normal, each in a single call.  ``mix`` maps agent classes to
+        relative weights (a sequence of classes weighs them equally; the
+        default is :data:`DEFAULT_TYPE_MIX`) and every class gets one
+        contiguous block of rows.  Labels read ``"<label_prefix>_<row>"`` and
+        are generated on access.  ``memories`` maps memory keys to
+        ``(size, m)`` arrays; row ``i`` remembers row ``i`` of each, again
+        materialised only when a memory bank is first read.
+        """
+
+        generator = np.random.default_rng(rng)
+        classes, counts = _mix_counts(size, DEFAULT_TYPE_MIX if mix is None else mix)
+        population = cls(2, intent_dim, capacity=size, seed=seed)
+        dtype = population.real_dtype
+        angles = generator.random((2, size), dtype=dtype) * dtype.type(np.pi)
+        population._size = size
+        population._states[:] = bloch_states(angles[0], angles[1], population.complex_dtype)
+        population._invalidate(slice(0, size))
+        intents = generator.standard_normal((size, intent_dim), dtype=dtype)
+        population._intents[:] = _normalize_rows(intents) if normalize_intents else intents
+        codes = np.array([_type_code(kind) for kind in classes], dtype=np.int8)
+        population._kinds[:] = np.repeat(codes, counts)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        population.labels = _BlockLabels(bounds, [kind.label_prefix for kind in classes])  # type: ignore[assignment]
+        if memories:
+            population._memory_source = _ColumnMemories(
+                {key: np.asarray(values) for key, values in memories.items()}, size
+            )
+        return population
+
+    @classmethod
+    def from_agents(cls, agents: Iterable["ConsciousnessAxiom"]) -> "AgentPopulation":
+        """Gather ``agents`` into a new population.
+
+        The agents are rebound to the rows of the new population, so existing
+        references keep working and now see the shared storage.  Entanglements
+        between gathered agents are carried over as edges.
+        """
+
+        agents = list(agents)
+        population = cls._gather(agents)
+        moved: Dict[int, Tuple[AgentPopulation, Dict[int, int]]] = {}
+        for index, agent in enumerate(agents):
+            old_population, old_index = agent._population, agent._index
+            moved.setdefault(id(old_population), (old_population, {}))[1][old_index] = index
+            if isinstance(old_population, AgentPopulation):
+                old_population._views.pop(old_index, None)
+            population._attach(agent, index)
+        for old_population, mapping in moved.values():
+            if old_population._entanglement is not None:
+                population.entanglement.absorb(old_population._entanglement, mapping)
+        return population
+
+    @classmethod
+    def _gather(cls, agents: List["ConsciousnessAxiom"]) -> "AgentPopulation":
+        """Copy the rows of ``agents`` into a new population, leaving them bound."""
+
+        if not agents:
+            return cls()
+        state_dim = max(len(agent.state) for agent in agents)
+        intent_dim = max(len(agent.intent) for agent in agents)
+        population = cls(state_dim, intent_dim, capacity=len(agents))
+        for agent in agents:
+            index = population.append(
+                agent.state,
+                agent.intent,
+                label=agent.label,
+                kind=type(agent),
+                memory=agent.memory,
+            )
+            population._learning_rates[index] = agent._population._get_learning_rate(agent._index)
+        return population
+
+    def _scatter(self, agents: List["ConsciousnessAxiom"]) -> None:
+        """Write rows of a :meth:`_gather` copy back to the agents they came from.
+
+        States, intents and memories added or replaced in the copy are stored
+        on each agent's own population.
+        """
+
+        for row, agent in enumerate(agents):
+            target, index = agent._population, agent._index
+            target.set_state(index, self._states[row])
+            target.set_intent(index, self._intents[row])
+            memory = target.memory_of(index)
+            # memory_of also loads memories still pending in a bulk block.
+            for key, value in self.memory_of(row).items():
+                if memory.get(key) is not value:
+                    target.store_memory(index, key, value)
+
+    def append(
+        self,
+        state: ArrayLike,
+        intent: Optional[ArrayLike] = None,
+        label: str = "agent",
+        kind: Optional[type] = None,
+        memory: Optional[Dict[str, ArrayLike]] = None,
+        memory_entangled: Optional[Dict[str, ArrayLike]] = None,
+    ) -> int:
+        """Append one agent row and return its index."""
+
+        state = np.asarray(state).astype(complex)
+        if state.shape[0] != self.state_dim:
+            if self._size:
+                raise ValueError(
+                    f"State dimension {state.shape[0]} does not match population "
+                    f"dimension {self.state_dim}"
+                )
+            self._allocate_states(state.shape[0])
+        if intent is not None and len(intent) > self.intent_dim:
+            self._resize_intents(len(intent))
+        self._reserve(self._size + 1)
+        index = self._size
+        self._size += 1
+        self._states[index] = _normalize(state)
+        self._invalidate(index)
+        self._intents[index] = 0.0
+        if intent is not None:
+            intent = np.asarray(intent, dtype=float)
+            self._intents[index, : len(intent)] = intent
+        self._kinds[index] = _type_code(kind or ConsciousnessAxiom)
+        self.labels.append(label)
+        for key, value in (memory or {}).items():
+            self.store_memory(index, key, value)
+        if memory_entangled:
+            self.entanglement.set_memories(index, memory_entangled)
+        return index
+
+    def extend(
+        self,
+        states: ArrayLike,
+        intents: Optional[ArrayLike] = None,
+        kind: Optional[type] = None,
+        labels: Union[str, Sequence[str]] = "agent",
+    ) -> slice:
+        """Append many rows of one agent class and return their slice."""
+
+        states = np.asarray(states)
+        count = len(states)
+        if self._size == 0 and states.shape[1] != self.state_dim:
+            self._allocate_states(states.shape[1])
+        if intents is not None and intents.shape[1] > self.intent_dim:
+            self._resize_intents(intents.shape[1])
+        self._reserve(self._size + count)
+        rows = slice(self._size, self._size + count)
+        self._size += count
+        self._states[rows] = _normalize_rows(states.astype(self.complex_dtype))
+        self._invalidate(rows)
+        self._intents[rows] = 0.0
+        if intents is not None:
+            self._intents[rows, : intents.shape[1]] = intents
+        self._kinds[rows] = _type_code(kind or ConsciousnessAxiom)
+        self._learning_rates[rows] = np.nan
+        self.labels.extend([labels] * count if isinstance(labels, str) else labels)
+        return rows
+
+    def take(self, rows: Rows) -> "AgentPopulation":
+        """Copy the selected rows into a new population.
+
+        Memory banks are copied shallowly and entanglements between selected
+        rows are carried over; edges to rows that were left out become
+        self-loops, like in :meth:`from_agents`.
+        """
+
+        index = np.arange(self._size)[self._rows(rows)]
+        self._refresh()
+        population = type(self)(self.state_dim, self.intent_dim, capacity=len(index), seed=self.seed)
+        population.real_dtype, population.complex_dtype = self.real_dtype, self.complex_dtype
+        population._size = len(index)
+        for name in ("_states", "_probabilities", "_coherence", "_intents", "_kinds", "_learning_rates"):
+            setattr(population, name, getattr(self, name)[index])
+        population._dirty = np.zeros(len(index), dtype=bool)
+        population._coherence_sum = float(population._coherence.sum())
+        if isinstance(self.labels, _LazyLabels):
+            population.labels = self.labels.take(index)
+        else:
+            population.labels = [self.labels[row] for row in index.tolist()]
+
+        position = np.full(self._size, -1, dtype=np.intp)
+        position[index] = np.arange(len(index))
+        for row, memory in self.iter_memories():
+            if memory and position[row] >= 0:
+                population._memories[int(position[row])] = dict(memory)
+        if self._entanglement is not None and len(self._entanglement):
+            mapping = {int(row): int(new) for new, row in enumerate(index.tolist())}
+            population.entanglement.absorb(self._entanglement, mapping)
+        return population
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._states):
+            return
+        capacity = max(capacity, 2 * len(self._states), 8)
+        for name in (
+            "_states",
+            "_probabilities",
+            "_coherence",
+            "_dirty",
+            "_intents",
+            "_kinds",
+            "_learning_rates",
+        ):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            if name == "_learning_rates":
+                new[self._size :] = np.nan
+            setattr(self, name, new)
+
+    def _allocate_states(self, dim: int) -> None:
+        self._states = np.zeros((len(self._states), dim), dtype=self.complex_dtype)
+        self._probabilities = np.zeros((len(self._states), dim), dtype=self.real_dtype)
+
+    def _resize_intents(self, width: int) -> None:
+        resized = np.zeros((len(self._intents), width), dtype=self._intents.dtype)
+        keep = min(width, self.intent_dim)
+        resized[:, :keep] = self._intents[:, :keep]
+        self._intents = resized
+
+    # ------------------------------------------------------------------
+    # Sequence protocol and views
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self.agent(i) for i in range(*index.indices(self._size))]
+        return self.agent(index)
+
+    def __iter__(self) -> Iterator["ConsciousnessAxiom"]:
+        for index in range(self._size):
+            yield self.agent(index)
+
+    def agent(self, index: int) -> "ConsciousnessAxiom":
+        """Return the agent view for row ``index``."""
+
+        index = int(index)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("agent index out of range")
+        view = self._views.get(index)
+        if view is None:
+            cls = _AGENT_TYPES[self._kinds[index]]
+            view = cls.__new__(cls)
+            self._attach(view, index)
+        return view
+
+    def _attach(self, agent: "ConsciousnessAxiom", index: int) -> None:
+        agent._population = self
+        agent._index = index
+        self._views[index] = agent
+
+    # ------------------------------------------------------------------
+    # Array access
+    # ------------------------------------------------------------------
+    @property
+    def entanglement(self) -> EntanglementRegistry:
+        """Registry of memory entanglements between rows, created on first use."""
+
+        if self._entanglement is None:
+            self._entanglement = EntanglementRegistry()
+        return self._entanglement
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Random generator owned by the population, seeded with :attr:`seed`."""
+
+        if self._rng is None:
+            self._rng = np.random.default_rng(self.seed)
+        return self._rng
+
+    @property
+    def state_dim(self) -> int:
+        return self._states.shape[1]
+
+    @property
+    def intent_dim(self) -> int:
+        return self._intents.shape[1]
+
+    @property
+    def states(self) -> ArrayLike:
+        """Read-only ``(N, d)`` view over the state vectors of all agents.
+
+        Use :meth:`set_states` to write states so the caches stay valid.
+        """
+
+        states = self._states[: self._size]
+        states.flags.writeable = False
+        return states
+
+    @property
+    def intents(self) -> ArrayLike:
+        """``(N, k)`` view over the intent vectors of all agents."""
+
+        return self._intents[: self._size]
+
+    @property
+    def kinds(self) -> ArrayLike:
+        """``int8`` column with the agent class code of every row."""
+
+        return self._kinds[: self._size]
+
+    @property
+    def learning_rates(self) -> ArrayLike:
+        """Effective learning rate of every row.
+
+        Rows without an explicit rate use the ``default_learning_rate`` of
+        their agent class.
+        """
+
+        defaults = np.array(
+            [
+                getattr(kind, "default_learning_rate", QuantumLearningNetwork.default_learning_rate)
+                for kind in _AGENT_TYPES
+            ],
+            dtype=self.real_dtype,
+        )
+        rates = self._learning_rates[: self._size]
+        return np.where(np.isnan(rates), defaults[self.kinds], rates)
+
+    def set_learning_rates(self, rates: Union[float, ArrayLike], rows: Rows = None) -> None:
+        """Assign per-agent learning rates; ``NaN`` restores the class default."""
+
+        self._learning_rates[self._rows(rows)] = rates
+
+    def rows_of(self, cls: type) -> ArrayLike:
+        """Indices of the rows whose agent class is ``cls`` or a subclass."""
+
+        return np.flatnonzero(np.isin(self.kinds, self._codes(cls)))
+
+    def _rows(self, rows: Rows) -> Union[slice, ArrayLike]:
+        if rows is None:
+            return slice(0, self._size)
+        if isinstance(rows, slice):
+            return slice(*rows.indices(self._size))
+        return np.atleast_1d(np.asarray(rows, dtype=np.intp))
+
+    # Row accessors used by agent views; _AgentRow implements the same ones.
+    def _get_state(self, index: int) -> ArrayLike:
+        state = self._states[index]
+        state.flags.writeable = False
+        return state
+
+    def _get_intent(self, index: int) -> ArrayLike:
+        return self._intents[index]
+
+    def _get_label(self, index: int) -> str:
+        return self.labels[index]
+
+    def _set_label(self, index: int, value: str) -> None:
+        self.labels[index] = value
+
+    def _get_learning_rate(self, index: int) -> float:
+        return self._learning_rates[index]
+
+    def _set_learning_rate(self, index: int, value: float) -> None:
+        self._learning_rates[index] = value
+
+    def _row_coherence(self, index: int) -> float:
+        if self._dirty[index]:
+            self._refresh()
+        return float(self._coherence[index])
+
+    def set_state(self, index: int, value: ArrayLike) -> None:
+        """Overwrite the state vector of one row."""
+
+        value = np.asarray(value)
+        if value.shape != (self.state_dim,):
+            if self._size != 1:
+                raise ValueError(
+                    f"State shape {value.shape} does not match population "
+                    f"dimension {self.state_dim}"
+                )
+            self._allocate_states(len(value))
+        self._states[index] = value
+        self._invalidate(index)
+
+    def set_states(self, values: ArrayLike, rows: Rows = None) -> None:
+        """Overwrite the state vectors of the selected rows in bulk."""
+
+        index = self._rows(rows)
+        self._states[index] = values
+        self._invalidate(index)
+
+    def set_intent(self, index: int, value: ArrayLike) -> None:
+        """Overwrite the intent vector of one row.
+
+        Intents longer than the population width widen every row with zeros so
+        dimensions stay consistent across agents; shorter intents are padded.
+        A single-row population simply adopts the new width.
+        """
+
+        value = np.asarray(value, dtype=float).ravel()
+        if len(value) != self.intent_dim and (self._size == 1 or len(value) > self.intent_dim):
+            self._resize_intents(len(value))
+        row = self._intents[index]
+        row[:] = 0.0
+        row[: len(value)] = value
+
+    # ------------------------------------------------------------------
+    # Batched operations
+    # ------------------------------------------------------------------
+    def apply_unitary(self, matrix: ArrayLike, rows: Rows = None) -> ArrayLike:
+        """Apply ``matrix`` to the selected states with one matmul."""
+
+        index = self._rows(rows)
+        matrix = np.asarray(matrix, dtype=self.complex_dtype)
+        updated = _normalize_rows(self._states[index] @ matrix.T)
+        self._states[index] = updated
+        self._invalidate(index)
+        return updated
+
+    def apply_gate(
+        self, gate: ArrayLike, qubits: Union[int, Sequence[int]], rows: Rows = None
+    ) -> ArrayLike:
+        """Apply a ``k`` qubit gate to the selected multi-qubit states.
+
+        States of dimension ``2**n`` are treated as ``n`` qubit tensors, so
+        the gate is contracted with the target axes without ever building a
+        ``2**n × 2**n`` matrix.
+        """
+
+        qubits = [qubits] if isinstance(qubits, (int, np.integer)) else list(qubits)
+        index = self._rows(rows)
+        updated = apply_gate_rows(self._states[index], gate, qubits)
+        self.set_states(updated, index)
+        return updated
+
+    def measure(
+        self,
+        rows: Rows = None,
+        basis: Optional[Iterable[ArrayLike]] = None,
+        rng: RandomSource = None,
+    ) -> ArrayLike:
+        """Collapse the selected states; see :func:`measure_batch`."""
+
+        return measure_batch(self, basis=basis, rng=rng, rows=rows)
+
+    def coherence(self, rows: Rows = None) -> ArrayLike:
+        """Vector of coherence scores for the selected agents."""
+
+        self._refresh()
+        return np.array(self._coherence[self._rows(rows)])
+
+    def probabilities(self, rows: Rows = None) -> ArrayLike:
+        """Measurement probabilities ``|ψ|²`` of the selected agents."""
+
+        self._refresh()
+        return np.array(self._probabilities[self._rows(rows)])
+
+    def mean_coherence(self) -> float:
+        """Mean coherence of the population, updated incrementally."""
+
+        if not self._size:
+            return 0.0
+        self._refresh()
+        return self._coherence_sum / self._size
+
+    # ------------------------------------------------------------------
+    # Cache maintenance
+    # ------------------------------------------------------------------
+    def invalidate(self, rows: Rows = None) -> None:
+        """Mark rows as changed after writing to the state buffer directly."""
+
+        self._invalidate(self._rows(rows))
+
+    def _invalidate(self, index: Union[int, slice, ArrayLike]) -> None:
+        if isinstance(index, slice):
+            index = np.arange(self._size)[index]
+        index = np.atleast_1d(index)
+        self._dirty[index] = True
+        self._pending.append(index)
+        if len(self._pending) > 4096:
+            self._pending = [np.flatnonzero(self._dirty[: self._size])]
+
+    def _refresh(self) -> None:
+        """Recompute the cached diagnostics of the dirty rows only."""
+
+        if not self._pending:
+            return
+        if sum(len(rows) for rows in self._pending) * 8 > self._size:
+            # Scanning the dirty flags is O(N) and beats sorting many indices.
+            rows = np.flatnonzero(self._dirty[: self._size])
+        else:
+            rows = np.unique(np.concatenate(self._pending))
+            rows = rows[self._dirty[rows]]
+        self._pending = []
+        if not len(rows):
+            return
+        probabilities = np.abs(self._states[rows]) ** 2
+        entropy = -np.sum(probabilities * np.log(probabilities + 1e-12), axis=1)
+        coherence = np.exp(-entropy)
+        self._coherence_sum += float(coherence.sum() - self._coherence[rows].sum())
+        self._probabilities[rows] = probabilities
+        self._coherence[rows] = coherence
+        self._dirty[rows] = False
+        if len(rows) == self._size:
+            # A full refresh resynchronises the running sum exactly.
+            self._coherence_sum = float(self._coherence[: self._size].sum())
+
+    def add_intent(
+        self, delta: ArrayLike, weight: Union[float, ArrayLike] = 1.0, rows: Rows = None
+    ) -> ArrayLike:
+        """Blend ``delta`` into the selected intents and renormalise them.
+
+        ``delta`` may be a single ``(k,)`` direction shared by all agents or an
+        ``(N, k)`` array; ``weight`` may be a scalar or one weight per agent.
+        """
+
+        delta = np.asarray(delta, dtype=float)
+        width = delta.shape[-1]
+        if width > self.intent_dim:
+            self._resize_intents(width)
+        elif width < self.intent_dim:
+            padding = [(0, 0)] * (delta.ndim - 1) + [(0, self.intent_dim - width)]
+            delta = np.pad(delta, padding)
+        index = self._rows(rows)
+        weight = np.asarray(weight, dtype=float)
+        if weight.ndim:
+            weight = weight[:, None]
+        intents = self._intents[index].copy()
+        intents[:, width:] = 0.0
+        updated = _normalize_rows(intents + weight * delta)
+        self._intents[index] = updated
+        return updated
+
+    # ------------------------------------------------------------------
+    # Memories
+    # ------------------------------------------------------------------
+    def store_memory(self, index: int, key: str, value: ArrayLike) -> None:
+        """Store a memory on row ``index`` and keep the memory index current."""
+
+        value = np.asarray(value)
+        self.memory_of(index)[key] = value
+        if self._memory_index is not None:
+            self._memory_index.add(index, key, value)
+
+    def store_memories(self, rows: Sequence[int], keys: MemoryKeys, values: ArrayLike) -> None:
+        """Store row ``i`` of the ``(m, w)`` block ``values`` on ``rows[i]``.
+
+        ``keys`` is one key for every row, one key per row, or a function
+        returning the key from the row's memory bank (evaluated just before
+        the value is added).  The block is copied once.  Rows whose memory
+        bank was already read get the value right away; for the others the
+        block is kept as is and replayed when their bank is first read, so
+        storing traces for a million agents costs a few array operations.
+        The memory index, if built, is updated in one batch.
+        """
+
+        rows = np.asarray(rows, dtype=np.intp).ravel()
+        block = np.array(values)
+        if self._memory_index is not None:
+            stored = [
+                _store_keyed(self.memory_of(row), keys, position, block[position])
+                for position, row in enumerate(rows.tolist())
+            ]
+            self._memory_index.add_many(rows.tolist(), stored, block)
+            return
+        loaded = np.fromiter(self._memories, dtype=np.intp, count=len(self._memories))
+        ready = np.isin(rows, loaded)
+        for position in np.flatnonzero(ready).tolist():
+            _store_keyed(self._memories[int(rows[position])], keys, position, block[position])
+        pending = np.flatnonzero(~ready)
+        if not len(pending):
+            return
+        if not isinstance(keys, str) and not callable(keys):
+            keys = [keys[position] for position in pending.tolist()]
+        source = self._memory_source
+        if not isinstance(source, _PendingMemories):
+            source = self._memory_source = _PendingMemories(source)
+        source.add(rows[pending], keys, block[pending])
+
+    def memory_of(self, index: int) -> Dict[str, ArrayLike]:
+        """Live memory dict of row ``index``, created on first access."""
+
+        memory = self._memories.get(index)
+        if memory is None:
+            source = self._memory_source
+            memory = self._memories[index] = {} if source is None else source.load(index)
+        return memory
+
+    def iter_memories(self) -> Iterator[Tuple[int, Dict[str, ArrayLike]]]:
+        """Yield ``(row, memory)`` for every row that holds a memory bank."""
+
+        source = self._memory_source
+        if isinstance(source, _PendingMemories):
+            for row, memory in source.load_all().items():
+                self._memories.setdefault(row, memory)
+            self._memory_source = None
+        elif source is not None:
+            for row in source.rows():
+                self.memory_of(row)
+            self._memory_source = None
+        yield from sorted(self._memories.items())
+
+    def forget_memory(self, index: int, key: str) -> None:
+        self.memory_of(index).pop(key, None)
+        if self._memory_index is not None:
+            self._memory_index.remove(index, key)
+
+    def set_memory(self, index: int, memory: Dict[str, ArrayLike]) -> None:
+        """Replace the whole memory bank of row ``index``."""
+
+        for key in list(self.memory_of(index)):
+            self.forget_memory(index, key)
+        for key, value in memory.items():
+            self.store_memory(index, key, value)
+
+    def entangle_memories(
+        self,
+        rows_a: Sequence[int],
+        rows_b: Sequence[int],
+        key: str,
+        strength: float = 0.5,
+    ) -> ArrayLike:
+        """Entangle many row pairs through memory ``key`` in one operation.
+
+        The combined vectors are blended and normalised as a single array and
+        stored once per pair in :attr:`entanglement`.
+        """
+
+        rows_a = np.asarray(rows_a, dtype=np.intp)
+        rows_b = np.asarray(rows_b, dtype=np.intp)
+        try:
+            first = np.array([self.memory_of(row)[key] for row in rows_a.tolist()], dtype=float)
+            second = np.array([self.memory_of(row)[key] for row in rows_b.tolist()], dtype=float)
+        except KeyError:
+            raise KeyError(f"Memory key '{key}' missing on one of the agents") from None
+        combined = _normalize_rows(strength * first + (1 - strength) * second)
+        self.entanglement.entangle_many(rows_a, rows_b, key, combined)
+        return combined
+
+    @property
+    def memory_index(self) -> MemoryIndex:
+        """Similarity index over all memories, built on first access.
+
+        Once built it is updated incrementally by :meth:`store_memory`,
+        :meth:`forget_memory` and :meth:`set_memory`.  Call
+        :meth:`rebuild_memory_index` after mutating memory dicts directly.
+        """
+
+        if self._memory_index is None:
+            self.rebuild_memory_index()
+        return self._memory_index  # type: ignore[return-value]
+
+    def rebuild_memory_index(self, **options: Any) -> MemoryIndex:
+        index = MemoryIndex(**options)
+        index.extend(
+            (row, key, value)
+            for row, memory in self.iter_memories()
+            for key, value in memory.items()
+        )
+        self._memory_index = index
+        return index
+
+    def find_similar_memories(
+        self, vector: ArrayLike, k: int = 5
+    ) -> List[Tuple["ConsciousnessAxiom", str, float]]:
+        """Return the ``k`` memories most cosine-similar to ``vector``.
+
+        Each match is an ``(agent, key, similarity)`` tuple, best first.
+        """
+
+        return [
+            (self.agent(row), key, score)
+            for row, key, score in self.memory_index.query(vector, k)
+        ]
+
+    @staticmethod
+    def _codes(cls: type) -> List[int]:
+        return [code for code, kind in enumerate(_AGENT_TYPES) if issubclass(kind, cls)]
+
+    def __repr__(self) -> str:  # pragma: no cover - repr used for debugging
+        return (
+            f"{self.__class__.__name__}(size={self._size}, "
+            f"state_dim={self.state_dim}, intent_dim={self.intent_dim})"
+        )
+
+
+def as_population(agents: Union[AgentPopulation, Iterable["ConsciousnessAxiom"]]):
+    """Return ``(population, rows)`` addressing ``agents`` in shared storage.
+
+    Populations are returned as-is.  A sequence of agents that are all views
+    over the same population is addressed through its row indices.  Agents
+    from several populations are copied into a fresh population; unlike
+    :meth:`AgentPopulation.from_agents` this leaves every agent bound to its
+    own population, so changes made to the copy do not reach them.
+    """
+
+    population, rows, _ = _address(agents)
+    return population, rows
+
+
+def _address(agents):
+    """:func:`as_population` plus the agents a gathered copy was made from."""
+
+    if isinstance(agents, AgentPopulation):
+        return agents, None, None
+    agents = list(agents)
+    if agents:
+        population = agents[0]._population
+        if all(agent._population is population for agent in agents):
+            # A standalone agent is promoted to a population of its own first.
+            population = agents[0].population
+            return population, np.array([agent._index for agent in agents], dtype=np.intp), None
+    return AgentPopulation._gather(agents), None, agents
+
+
+def measure_batch(
+    population: Union[AgentPopulation, Iterable["ConsciousnessAxiom"]],
+    basis: Optional[Iterable[ArrayLike]] = None,
+    rng: RandomSource = None,
+    rows: Rows = None,
+) -> ArrayLike:
+    """Collapse every selected agent in one vectorised pass.
+
+    Each agent draws one uniform number from ``rng`` which is compared against
+    its cumulative outcome probabilities, and the collapsed states are written
+    back into the population in place.
+
+    Parameters
+    ----------
+    population:
+        An :class:`AgentPopulation` or a sequence of agents.  Agents from
+        several populations are measured on a copy and the results written
+        back, so every agent stays bound to its own population.
+    basis:
+        Optional measurement basis shared by all agents, one basis vector per
+        row.  When ``None`` the computational basis is used.
+    rng:
+        A ``numpy.random.Generator`` or an integer seed.  Defaults to the
+        population's own generator so runs are reproducible per population.
+    rows:
+        Optional subset of population rows to measure.
+
+    Returns
+    -------
+    numpy.ndarray
+        The outcome index of every measured agent.
+    """
+
+    population, selected, gathered = _resolve_rows(population, rows)
+    if rng is None:
+        rng = population.rng
+    elif not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    index = population._rows(selected)
+    states = population._states[index]
+
+    if basis is None:
+        probabilities = np.abs(states) ** 2
+        outcome_states = np.eye(population.state_dim, dtype=complex)
+    else:
+        outcome_states = np.array(list(basis), dtype=complex)
+        probabilities = np.abs(states @ outcome_states.T) ** 2
+        outcome_states = _normalize_rows(outcome_states)
+
+    cumulative = np.cumsum(probabilities, axis=1)
+    draws = rng.random(len(cumulative)) * cumulative[:, -1]
+    outcomes = np.minimum(
+        (cumulative < draws[:, None]).sum(axis=1), len(outcome_states) - 1
+    )
+    population._states[index] = outcome_states[outcomes]
+    population._invalidate(index)
+
+    # Reality collapse agents keep a diagnostic trace of every measurement.
+    measured = np.arange(len(population))[index]
+    traced = np.flatnonzero(
+        np.isin(population._kinds[measured], AgentPopulation._codes(RealityCollapseAxiom))
+    )
+    if len(traced):
+        rows_traced = measured[traced]
+        traces = np.column_stack(
+            [outcomes[traced].astype(float), population.coherence(rows_traced)]
+        )
+        population.store_memories(rows_traced, _collapse_key, traces)
+    if gathered is not None:
+        population._scatter(gathered)
+    return outcomes
+
+
+def learn_batch(
+    agents: Union[AgentPopulation, Iterable["ConsciousnessAxiom"]],
+    rewards: Union[None, float, ArrayLike] = None,
+    rng: RandomSource = None,
+    learning_rates: Union[None, float, ArrayLike] = None,
+    rows: Rows = None,
+) -> ArrayLike:
+    """Run one :meth:`QuantumLearningNetwork.quantum_learn` step for many agents.
+
+    The random gradients of all agents are drawn from one generator in a
+    single call, biased by ``rewards`` (a scalar or one reward per agent) and
+    applied with one vectorised update and normalisation.
+
+    Parameters
+    ----------
+    agents:
+        An :class:`AgentPopulation` or a sequence of agents (from one or
+        several populations, see :func:`measure_batch`).  For a population
+        without explicit ``rows`` only the ``QuantumLearningNetwork`` rows learn.
+    rewards:
+        Optional scalar or per-agent reward vector.
+    rng:
+        A ``numpy.random.Generator`` or an integer seed.  Defaults to the
+        population's own generator.
+    learning_rates:
+        Optional scalar or per-agent learning rates overriding the rates
+        stored in the population.
+    rows:
+        Optional subset of population rows.
+
+    Returns
+    -------
+    numpy.ndarray
+        The updated ``(m, k)`` intents.
+    """
+
+    if isinstance(agents, AgentPopulation) and rows is None:
+        rows = agents.rows_of(QuantumLearningNetwork)
+    population, selected, gathered = _resolve_rows(agents, rows)
+    if rng is None:
+        rng = population.rng
+    elif not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    index = population._rows(selected)
+    intents = population._intents[index]
+
+    gradient = rng.standard_normal(intents.shape)
+    if rewards is not None:
+        rewards = np.asarray(rewards, dtype=float)
+        gradient += rewards[:, None] if rewards.ndim else rewards
+    if learning_rates is None:
+        rates = population.learning_rates[index]
+    else:
+        rates = np.broadcast_to(np.asarray(learning_rates, dtype=float), (len(intents),))
+    updated = _normalize_rows(intents + rates[:, None] * gradient)
+    population._intents[index] = updated
+    if gathered is not None:
+        population._scatter(gathered)
+    return updated
+
+
+def adapt_batch(
+    agents: Union[AgentPopulation, Iterable["ConsciousnessAxiom"]],
+    feedback: ArrayLike,
+    weights: Union[float, ArrayLike] = 1.0,
+    rows: Rows = None,
+) -> ArrayLike:
+    """Batched :meth:`QuantumLearningNetwork.adapt_from_feedback`.
+
+    ``feedback`` is a shared ``(k,)`` vector or one ``(m, k)`` row per agent
+    and ``weights`` a scalar or one weight per agent.
+    """
+
+    if isinstance(agents, AgentPopulation) and rows is None:
+        rows = agents.rows_of(QuantumLearningNetwork)
+    population, selected, gathered = _resolve_rows(agents, rows)
+    index = population._rows(selected)
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim:
+        weights = weights[:, None]
+    updated = _normalize_rows(population._intents[index] + weights * np.asarray(feedback))
+    population._intents[index] = updated
+    if gathered is not None:
+        population._scatter(gathered)
+    return updated
+
+
+def _resolve_rows(agents, rows: Rows):
+    """Population and rows to operate on, plus the agents to scatter results to."""
+
+    population, agent_rows, gathered = _address(agents)
+    if agent_rows is None:
+        return population, rows, gathered
+    if rows is not None:
+        agent_rows = agent_rows[rows]
+    return population, agent_rows, None
+
+
 class ConsciousnessAxiom:
     """Base class implementing a tiny "quantum consciousness" state machine.
 
@@ -57,20 +1378,99 @@ class ConsciousnessAxiom:
     associative memory.  While highly speculative, the API is intentionally
     pragmatic: each method returns data that can be easily serialised to JSON
     and consumed by the dashboard or the REST API.
+
+    Instances are views over one row of an :class:`AgentPopulation`.  An agent
+    created directly keeps its row in a lightweight record until it needs a
+    population of its own (see :attr:`population`).  Views only hold their
+    storage and row index in ``__slots__``.
     """
 
-    state: ArrayLike
-    intent: Optional[ArrayLike] = None
-    label: str = "agent"
-    memory: Dict[str, ArrayLike] = field(default_factory=dict)
-    memory_entangled: Dict[str, ArrayLike] = field(default_factory=dict)
+    __slots__ = ("_population", "_index")
 
-    def __post_init__(self) -> None:
-        self.state = _normalize(self.state.astype(complex))
-        if self.intent is None:
-            self.intent = np.zeros(3, dtype=float)
-        else:
-            self.intent = self.intent.astype(float)
+    # Prefix of the labels given by AgentPopulation.spawn.
+    label_prefix = "agent"
+
+    _population: Union[AgentPopulation, _AgentRow]
+    _index: int
+
+    def __init__(
+        self,
+        state: ArrayLike,
+        intent: Optional[ArrayLike] = None,
+        label: str = "agent",
+        memory: Optional[Dict[str, ArrayLike]] = None,
+        memory_entangled: Optional[Dict[str, ArrayLike]] = None,
+    ) -> None:
+        self._population = _AgentRow(state, intent, label, memory)
+        self._index = 0
+        if memory_entangled:
+            self.population.entanglement.set_memories(self._index, memory_entangled)
+
+    # ------------------------------------------------------------------
+    # Row accessors
+    # ------------------------------------------------------------------
+    @property
+    def population(self) -> AgentPopulation:
+        """The population whose row backs this agent.
+
+        A standalone agent is moved into a private single-row population on
+        first access.
+        """
+
+        population = self._population
+        if isinstance(population, _AgentRow):
+            population = population.promote(self)
+        return population
+
+    @property
+    def state(self) -> ArrayLike:
+        return self._population._get_state(self._index)
+
+    @state.setter
+    def state(self, value: ArrayLike) -> None:
+        self._population.set_state(self._index, value)
+
+    @property
+    def intent(self) -> ArrayLike:
+        return self._population._get_intent(self._index)
+
+    @intent.setter
+    def intent(self, value: ArrayLike) -> None:
+        self._population.set_intent(self._index, value)
+
+    @property
+    def label(self) -> str:
+        return self._population._get_label(self._index)
+
+    @label.setter
+    def label(self, value: str) -> None:
+        self._population._set_label(self._index, value)
+
+    @property
+    def memory(self) -> Dict[str, ArrayLike]:
+        return self._population.memory_of(self._index)
+
+    @memory.setter
+    def memory(self, value: Dict[str, ArrayLike]) -> None:
+        self._population.set_memory(self._index, value)
+
+    @property
+    def memory_entangled(self) -> Dict[str, ArrayLike]:
+        """Snapshot of the entangled memories held in the population registry."""
+
+        entanglement = self._population._entanglement
+        return {} if entanglement is None else entanglement.memories(self._index)
+
+    @memory_entangled.setter
+    def memory_entangled(self, value: Dict[str, ArrayLike]) -> None:
+        self.population.entanglement.set_memories(self._index, value)
+
+    @property
+    def entangled_partners(self) -> List["ConsciousnessAxiom"]:
+        """Agents of the same population entangled with this one."""
+
+        population = self.population
+        return [population.agent(row) for row in population.entanglement.partners(self._index)]
 
     # ------------------------------------------------------------------
     # Quantum state manipulation
@@ -81,6 +1481,16 @@ class ConsciousnessAxiom:
         self.state = _normalize(matrix @ self.state)
         return self.state
 
+    def apply_gate(self, gate: ArrayLike, qubits: Union[int, Sequence[int]]) -> ArrayLike:
+        """Apply a gate to some qubits of a ``2**n`` dimensional state.
+
+        See :class:`~agothe_app.core.multi_qubit.MultiQubitState`.
+        """
+
+        qubits = [qubits] if isinstance(qubits, (int, np.integer)) else list(qubits)
+        self.state = apply_gate_rows(self.state[None, :], gate, qubits)[0]
+        return self.state
+
     def measure(self, collapse_basis: Optional[Iterable[ArrayLike]] = None) -> int:
         """Perform a projective measurement and collapse the state.
 
@@ -113,36 +1523,39 @@ class ConsciousnessAxiom:
         """Blend a new intent direction into the agent."""
 
         delta = np.asarray(delta, dtype=float)
-        if delta.shape != self.intent.shape:
+        intent = self.intent
+        if delta.shape != intent.shape:
             # Resize intents so that dimensions stay consistent across agents.
             new_intent = np.zeros_like(delta)
-            size = min(len(delta), len(self.intent))
-            new_intent[:size] = self.intent[:size]
-            self.intent = new_intent
-        self.intent = _normalize(self.intent + weight * delta)
+            size = min(len(delta), len(intent))
+            new_intent[:size] = intent[:size]
+            intent = new_intent
+        self.intent = _normalize(intent + weight * delta).real
         return self.intent
 
     # ------------------------------------------------------------------
     # Memory utilities
     # ------------------------------------------------------------------
     def store_memory(self, key: str, value: ArrayLike) -> None:
-        self.memory[key] = np.asarray(value)
+        self._population.store_memory(self._index, key, value)
 
     def retrieve_memory(self, key: str) -> Optional[ArrayLike]:
         return self.memory.get(key)
 
     def forget_memory(self, key: str) -> None:
-        self.memory.pop(key, None)
+        self._population.forget_memory(self._index, key)
 
     # ------------------------------------------------------------------
     # Diagnostics and serialisation
     # ------------------------------------------------------------------
     def coherence(self) -> float:
-        """Return a pseudo coherence score derived from the state vector."""
+        """Return a pseudo coherence score derived from the state vector.
 
-        probabilities = np.abs(self.state) ** 2
-        entropy = -np.sum(probabilities * np.log(probabilities + 1e-12))
-        return float(np.exp(-entropy))
+        The score is cached by the population and only recomputed after the
+        state changed.
+        """
+
+        return self._population._row_coherence(self._index)
 
     def as_dict(self) -> Dict[str, Any]:
         return {
@@ -165,6 +1578,10 @@ class ConsciousnessAxiom:
 class QuantumMemoryNetwork(ConsciousnessAxiom):
     """Agent equipped with a differentiable associative memory bank."""
 
+    __slots__ = ()
+
+    label_prefix = "memory"
+
     def entangle_memory(
         self, other: "QuantumMemoryNetwork", key: str, strength: float = 0.5
     ) -> ArrayLike:
@@ -174,8 +1591,13 @@ class QuantumMemoryNetwork(ConsciousnessAxiom):
             raise KeyError(f"Memory key '{key}' missing on one of the agents")
         combined = strength * self.memory[key] + (1 - strength) * other.memory[key]
         combined = _normalize(np.asarray(combined, dtype=float))
-        self.memory_entangled[key] = combined
-        other.memory_entangled[key] = combined
+        if other._population is self._population:
+            self.population.entanglement.entangle(self._index, other._index, key, combined)
+        else:
+            # Agents in different populations cannot share an edge; each side
+            # keeps the combined vector as a partner-less entry instead.
+            self.population.entanglement.entangle(self._index, self._index, key, combined)
+            other.population.entanglement.entangle(other._index, other._index, key, combined)
         return combined
 
     def memory_similarity(self, key: str, target: ArrayLike) -> float:
@@ -188,11 +1610,33 @@ class QuantumMemoryNetwork(ConsciousnessAxiom):
         denom = float(np.linalg.norm(mem) * np.linalg.norm(target) + 1e-12)
         return numerator / denom
 
+    def find_similar_memories(
+        self, vector: ArrayLike, k: int = 5
+    ) -> List[Tuple[ConsciousnessAxiom, str, float]]:
+        """Search the memories of every agent in this agent's population."""
+
+        return self.population.find_similar_memories(vector, k)
+
 
 class QuantumLearningNetwork(QuantumMemoryNetwork):
     """Agent capable of updating its intent through a learning loop."""
 
-    learning_rate: float = 0.25
+    __slots__ = ()
+
+    label_prefix = "learner"
+
+    default_learning_rate: float = 0.25
+
+    @property
+    def learning_rate(self) -> float:
+        """Learning rate of this agent; defaults to ``default_learning_rate``."""
+
+        rate = self._population._get_learning_rate(self._index)
+        return type(self).default_learning_rate if np.isnan(rate) else float(rate)
+
+    @learning_rate.setter
+    def learning_rate(self, value: float) -> None:
+        self._population._set_learning_rate(self._index, value)
 
     def quantum_learn(self, reward: float | None = None) -> ArrayLike:
         """Perform one learning iteration.
@@ -206,36 +1650,63 @@ class QuantumLearningNetwork(QuantumMemoryNetwork):
         gradient = np.random.randn(*self.intent.shape)
         if reward is not None:
             gradient += reward
-        self.intent = _normalize(self.intent + self.learning_rate * gradient)
+        self.intent = _normalize(self.intent + self.learning_rate * gradient).real
         return self.intent
 
     def adapt_from_feedback(self, feedback: ArrayLike, weight: float = 1.0) -> None:
-        self.intent = _normalize(self.intent + weight * np.asarray(feedback))
+        self.intent = _normalize(self.intent + weight * np.asarray(feedback)).real
 
 
 class RealityCollapseAxiom(ConsciousnessAxiom):
     """Agent specialising in measurements and collapse operations."""
 
+    __slots__ = ()
+
+    label_prefix = "collapser"
+
     def measure(self, collapse_basis: Optional[Iterable[ArrayLike]] = None) -> int:
         outcome = super().measure(collapse_basis)
         # Measurements generate traces in memory for diagnostics.
         self.store_memory(
-            f"collapse_{len(self.memory)}",
+            _collapse_key(self.memory),
             np.array([outcome, self.coherence()], dtype=float),
         )
         return outcome
 
     def collapse_probability(self, outcome: int) -> float:
-        probabilities = np.abs(self.state) ** 2
+        probabilities = self._population.probabilities(self._index)[0]
         if outcome < 0 or outcome >= len(probabilities):
             return 0.0
         return float(probabilities[outcome])
 
 
+for _cls in (
+    ConsciousnessAxiom,
+    QuantumMemoryNetwork,
+    QuantumLearningNetwork,
+    RealityCollapseAxiom,
+):
+    _type_code(_cls)
+
+# Type mix of AgentPopulation.spawn: equal shares of the three specialised agents.
+DEFAULT_TYPE_MIX: Dict[type, float] = {
+    QuantumLearningNetwork: 1.0,
+    QuantumMemoryNetwork: 1.0,
+    RealityCollapseAxiom: 1.0,
+}
+
+
 __all__ = [
+    "AgentPopulation",
     "ConsciousnessAxiom",
+    "DEFAULT_TYPE_MIX",
     "QuantumLearningNetwork",
     "QuantumMemoryNetwork",
     "RealityCollapseAxiom",
+    "adapt_batch",
+    "as_population",
+    "bloch_states",
     "create_bloch_state",
+    "learn_batch",
+    "measure_batch",
 ]
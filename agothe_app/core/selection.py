@@ -0,0 +1,266 @@
+"""Selection operators for :class:`~agothe_app.core.darwin_evolution_protocol.DarwinEvolutionProtocol`.
+
+An operator looks at the fitness of every row and decides which rows survive
+unchanged and which pairs of rows parent the offspring that fill the rest of
+the next generation.  All operators are vectorised over the population and
+avoid a full sort:
+
+* ``truncation`` – the historical behaviour: the best 60% survive and parents
+  are drawn uniformly among them; ``TruncationSelection(elite_fraction=None)``
+  keeps the best ``(1 - pressure)·N`` rows (at least two) instead,
+* ``tournament`` – elites survive, parents win tournaments whose size grows
+  with the selection pressure (``O(N·t)``),
+* ``sus`` – elites survive, parents are drawn by stochastic universal
+  sampling over pressure-scaled fitness (``O(N)``),
+* ``rank`` – elites survive, parents are drawn by linear ranking with slope
+  ``1 + pressure``; ranks are resolved into ``B`` buckets with one
+  ``argpartition`` (``O(N log B)``),
+* ``plus`` / ``comma`` – (μ+λ) and (μ,λ) evolution strategies where the best
+  ``μ = (1 - pressure)·N`` rows parent ``λ = N`` offspring; ``plus`` keeps the
+  best ``N`` of parents and offspring, ``comma`` keeps the offspring only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Type, Union
+
+import numpy as np
+
+ArrayLike = np.ndarray
+
+# Fraction of each generation that survives into the next one.
+SURVIVAL_FRACTION = 0.6
+
+
+@dataclass
+class Selection:
+    """Outcome of one selection step."""
+
+    survivors: ArrayLike
+    parents: ArrayLike
+    # Keep only the best ``len(fitness)`` rows of survivors plus offspring.
+    trim: bool = False
+
+
+def top_rows(fitness: ArrayLike, count: int) -> ArrayLike:
+    """Indices of the ``count`` fittest rows in ascending row order, in ``O(N)``."""
+
+    size = len(fitness)
+    if count >= size:
+        return np.arange(size)
+    if count <= 0:
+        return np.zeros(0, dtype=np.intp)
+    selected = np.zeros(size, dtype=bool)
+    selected[np.argpartition(-fitness, count - 1)[:count]] = True
+    return np.flatnonzero(selected)
+
+
+class SelectionOperator:
+    """Base class; subclasses implement :meth:`parents`."""
+
+    name = ""
+
+    def __init__(self, elite_fraction: float = SURVIVAL_FRACTION) -> None:
+        self.elite_fraction = elite_fraction
+
+    def select(self, fitness: ArrayLike, pressure: float, rng: np.random.Generator) -> Selection:
+        size = len(fitness)
+        survivors = top_rows(fitness, min(size, max(2, int(size * self.elite_fraction))))
+        count = size - len(survivors)
+        return Selection(survivors, self.parents(fitness, 2 * count, pressure, rng).reshape(count, 2))
+
+    def parents(
+        self, fitness: ArrayLike, count: int, pressure: float, rng: np.random.Generator
+    ) -> ArrayLike:
+        """Draw ``count`` parent rows with replacement."""
+
+        raise NotImplementedError
+
+    def __repr__(self) -> str:  # pragma: no cover - repr used for debugging
+        return f"{self.__class__.__name__}()"
+
+
+class TruncationSelection(SelectionOperator):
+    """Best fraction survives; parents are uniform among the survivors.
+
+    The surviving fraction is ``elite_fraction``, :data:`SURVIVAL_FRACTION`
+    by default.  With ``elite_fraction=None`` it follows the selection
+    pressure as ``1 - pressure``.
+    """
+
+    name = "truncation"
+
+    def __init__(self, elite_fraction: Optional[float] = SURVIVAL_FRACTION) -> None:
+        super().__init__(elite_fraction)  # type: ignore[arg-type]
+
+    def survival_fraction(self, pressure: float) -> float:
+        if self.elite_fraction is not None:
+            return self.elite_fraction
+        return 1.0 - min(max(pressure, 0.0), 1.0)
+
+    def select(self, fitness: ArrayLike, pressure: float, rng: np.random.Generator) -> Selection:
+        size = len(fitness)
+        keep = min(size, max(2, int(size * self.survival_fraction(pressure))))
+        survivors = top_rows(fitness, keep)
+        parents = survivors[rng.integers(keep, size=(size - keep, 2))]
+        return Selection(survivors, parents)
+
+
+class TournamentSelection(SelectionOperator):
+    """Each parent is the fittest of ``size`` rows drawn at random.
+
+    Without an explicit ``size`` the tournament holds ``1 / (1 - pressure)``
+    contestants (at least two), so higher pressure favours fitter parents.
+    """
+
+    name = "tournament"
+
+    def __init__(self, size: Optional[int] = None, elite_fraction: float = SURVIVAL_FRACTION) -> None:
+        super().__init__(elite_fraction)
+        self.size = size
+
+    def tournament_size(self, pressure: float) -> int:
+        if self.size is not None:
+            return self.size
+        return max(2, int(round(1.0 / max(1.0 - pressure, 1e-3))))
+
+    def parents(
+        self, fitness: ArrayLike, count: int, pressure: float, rng: np.random.Generator
+    ) -> ArrayLike:
+        contestants = rng.integers(len(fitness), size=(count, self.tournament_size(pressure)))
+        winners = np.argmax(fitness[contestants], axis=1)
+        return contestants[np.arange(count), winners]
+
+
+class StochasticUniversalSampling(SelectionOperator):
+    """Fitness-proportional sampling with evenly spaced pointers.
+
+    Fitness is rescaled to ``[0, 1]`` and raised to the power
+    ``pressure / (1 - pressure)``: zero pressure samples uniformly and
+    pressure close to one approaches picking the best row only.
+    """
+
+    name = "sus"
+
+    def parents(
+        self, fitness: ArrayLike, count: int, pressure: float, rng: np.random.Generator
+    ) -> ArrayLike:
+        exponent = pressure / max(1.0 - pressure, 1e-3)
+        spread = float(np.ptp(fitness)) or 1.0
+        weights = ((fitness - fitness.min()) / spread + 1e-12) ** exponent
+        cumulative = np.cumsum(weights)
+        step = cumulative[-1] / count
+        pointers = rng.random() * step + step * np.arange(count)
+        chosen = np.minimum(np.searchsorted(cumulative, pointers, side="right"), len(fitness) - 1)
+        # The pointers come out in row order; shuffle so parent pairs mix.
+        return rng.permutation(chosen)
+
+
+class RankSelection(SelectionOperator):
+    """Linear ranking selection with slope ``1 + pressure``.
+
+    Rows are grouped into ``buckets`` rank bands with a single
+    ``argpartition``; a rank is drawn from the linear ranking distribution and
+    a row is picked uniformly from its band.  With ``buckets >= N`` this is
+    exact linear ranking.
+    """
+
+    name = "rank"
+
+    def __init__(self, buckets: int = 1024, elite_fraction: float = SURVIVAL_FRACTION) -> None:
+        super().__init__(elite_fraction)
+        self.buckets = buckets
+
+    def parents(
+        self, fitness: ArrayLike, count: int, pressure: float, rng: np.random.Generator
+    ) -> ArrayLike:
+        size = len(fitness)
+        slope = 1.0 + min(max(pressure, 0.0), 1.0)
+        # Inverse CDF of the density (2 - s) + 2 (s - 1) x on [0, 1), x = rank / N.
+        u = rng.random(count)
+        a = slope - 1.0
+        if a < 1e-12:
+            ranks = u
+        else:
+            b = 2.0 - slope
+            ranks = (-b + np.sqrt(b * b + 4.0 * a * u)) / (2.0 * a)
+        bands = min(self.buckets, size)
+        edges = (np.arange(1, bands) * size) // bands
+        order = np.argpartition(fitness, edges) if bands > 1 else np.arange(size)
+        bounds = np.concatenate([[0], edges, [size]])
+        band = np.minimum((ranks * bands).astype(np.intp), bands - 1)
+        start, stop = bounds[band], bounds[band + 1]
+        return order[start + (rng.random(count) * (stop - start)).astype(np.intp)]
+
+
+class _StrategySelection(SelectionOperator):
+    """Shared parent pool of the (μ+λ) and (μ,λ) strategies."""
+
+    plus = False
+
+    def __init__(self, mu: Optional[int] = None) -> None:
+        super().__init__()
+        self.mu = mu
+
+    def select(self, fitness: ArrayLike, pressure: float, rng: np.random.Generator) -> Selection:
+        size = len(fitness)
+        mu = self.mu or max(2, int(round(size * (1.0 - pressure))))
+        pool = top_rows(fitness, min(mu, size))
+        parents = pool[rng.integers(len(pool), size=(size, 2))]
+        survivors = pool if self.plus else np.zeros(0, dtype=np.intp)
+        return Selection(survivors, parents, trim=self.plus)
+
+
+class PlusSelection(_StrategySelection):
+    """(μ+λ): the best ``N`` of the μ parents and λ = N offspring survive."""
+
+    name = "plus"
+    plus = True
+
+
+class CommaSelection(_StrategySelection):
+    """(μ,λ): the next generation consists of the λ = N offspring only."""
+
+    name = "comma"
+
+
+SELECTION_OPERATORS: Dict[str, Type[SelectionOperator]] = {
+    cls.name: cls
+    for cls in (
+        TruncationSelection,
+        TournamentSelection,
+        StochasticUniversalSampling,
+        RankSelection,
+        PlusSelection,
+        CommaSelection,
+    )
+}
+
+
+def get_selection(selection: Union[str, SelectionOperator]) -> SelectionOperator:
+    """Return an operator instance from a name or pass an instance through."""
+
+    if isinstance(selection, SelectionOperator):
+        return selection
+    try:
+        return SELECTION_OPERATORS[selection]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown selection operator '{selection}', expected one of {sorted(SELECTION_OPERATORS)}"
+        ) from None
+
+
+__all__ = [
+    "CommaSelection",
+    "PlusSelection",
+    "RankSelection",
+    "SELECTION_OPERATORS",
+    "Selection",
+    "SelectionOperator",
+    "StochasticUniversalSampling",
+    "TournamentSelection",
+    "TruncationSelection",
+    "get_selection",
+    "top_rows",
+]
@@ -0,0 +1,407 @@
+"""Binary snapshots of agent populations.
+
+``ConsciousnessAxiom.as_dict`` turns every amplitude into a Python ``complex``,
+which is fine for one agent but far too slow for a large population.  A
+snapshot instead writes the population's NumPy buffers to a single file::
+
+    magic (8 bytes) | header length (uint64) | JSON header | aligned raw buffers
+
+The JSON header records the dimensions, the seed, the agent class names and
+the dtype, shape and offset of every buffer.  The buffers hold the states, the
+cached probabilities and coherence, the intents, the type and learning rate
+columns, the labels (packed UTF-8 with offsets), a packed arena with the
+memory banks and the entanglement edges.  Generated ``"<prefix>_<row>"``
+labels of populations built by ``AgentPopulation.from_arrays``/``spawn`` are
+stored as their ``(prefix, start, stop)`` blocks instead, and only the labels
+that were changed or appended since are packed, together with their rows.
+
+:func:`load_population` maps the file with ``np.memmap`` in copy-on-write
+mode, so opening even a million-agent snapshot only reads the header.  Agent
+views, labels and memory banks are materialised on first access, and writes
+to a loaded population never touch the file.
+
+Agent classes are stored by name rather than by their ``int8`` type code
+because the codes depend on the order in which classes were registered.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .entanglement import EntanglementRegistry
+from .quantum_consciousness import (
+    _AGENT_TYPES,
+    AgentPopulation,
+    _BlockLabels,
+    _LazyLabels,
+    _type_code,
+)
+
+ArrayLike = np.ndarray
+PathLike = Union[str, "os.PathLike[str]"]
+
+MAGIC = b"AGOTHEP1"
+FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _align(offset: int, alignment: int = _ALIGNMENT) -> int:
+    return -(-offset // alignment) * alignment
+
+
+# ----------------------------------------------------------------------
+# Ragged arrays
+# ----------------------------------------------------------------------
+def _pack_values(values: List[ArrayLike]) -> Tuple[Dict[str, ArrayLike], List[str]]:
+    """Pack arrays of any dtype and shape into one byte arena plus index columns."""
+
+    dtypes: List[str] = []
+    dtype_ids: Dict[str, int] = {}
+    count = len(values)
+    codes = np.zeros(count, dtype=np.int16)
+    offsets = np.zeros(count, dtype=np.int64)
+    ndims = np.zeros(count, dtype=np.int8)
+    shape_starts = np.zeros(count, dtype=np.int64)
+    shapes: List[int] = []
+    chunks: List[bytes] = []
+    position = 0
+    for i, value in enumerate(values):
+        value = np.ascontiguousarray(value)
+        if value.dtype.hasobject:
+            raise TypeError(f"Cannot snapshot memory values of dtype {value.dtype}")
+        name = value.dtype.str
+        if name not in dtype_ids:
+            dtype_ids[name] = len(dtypes)
+            dtypes.append(name)
+        codes[i] = dtype_ids[name]
+        aligned = _align(position, 16)
+        if aligned != position:
+            chunks.append(b"\0" * (aligned - position))
+        offsets[i] = aligned
+        ndims[i] = value.ndim
+        shape_starts[i] = len(shapes)
+        shapes.extend(value.shape)
+        chunks.append(value.tobytes())
+        position = aligned + value.nbytes
+    arrays = {
+        "dtype": codes,
+        "offset": offsets,
+        "ndim": ndims,
+        "shape_start": shape_starts,
+        "shape": np.asarray(shapes, dtype=np.int64),
+        "data": np.frombuffer(b"".join(chunks), dtype=np.uint8),
+    }
+    return arrays, dtypes
+
+
+class _RaggedValues:
+    """Read side of :func:`_pack_values`; values are views into the arena."""
+
+    def __init__(self, arrays: Dict[str, ArrayLike], dtypes: List[str]) -> None:
+        self._arrays = arrays
+        self._dtypes = [np.dtype(name) for name in dtypes]
+
+    def __getitem__(self, i: int) -> ArrayLike:
+        arrays = self._arrays
+        dtype = self._dtypes[arrays["dtype"][i]]
+        start = int(arrays["shape_start"][i])
+        shape = tuple(int(n) for n in arrays["shape"][start : start + int(arrays["ndim"][i])])
+        offset = int(arrays["offset"][i])
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        return arrays["data"][offset : offset + nbytes].view(dtype).reshape(shape)
+
+
+# ----------------------------------------------------------------------
+# Lazy columns
+# ----------------------------------------------------------------------
+class _PackedLabels(_LazyLabels):
+    """Label column decoded on access from packed UTF-8 bytes."""
+
+    def __init__(self, offsets: ArrayLike, data: ArrayLike) -> None:
+        super().__init__(len(offsets) - 1)
+        self._offsets = offsets
+        self._data = data
+
+    def _label(self, index: int) -> str:
+        start, stop = int(self._offsets[index]), int(self._offsets[index + 1])
+        return bytes(self._data[start:stop]).decode("utf-8")
+
+    def packed(self) -> Optional[Tuple[ArrayLike, ArrayLike]]:
+        """The original buffers when no label was changed or added."""
+
+        if self.edited:
+            return None
+        return self._offsets, self._data
+
+
+class _MemoryArena:
+    """Memory banks of a snapshot, decoded one row at a time."""
+
+    def __init__(self, rows: ArrayLike, keys: ArrayLike, names: List[str], values: _RaggedValues):
+        self._rows = rows
+        self._keys = keys
+        self._names = names
+        self._values = values
+
+    def rows(self) -> List[int]:
+        return np.unique(self._rows).tolist()
+
+    def load(self, row: int) -> Dict[str, ArrayLike]:
+        start = int(np.searchsorted(self._rows, row, side="left"))
+        stop = int(np.searchsorted(self._rows, row, side="right"))
+        return {
+            self._names[self._keys[entry]]: self._values[entry] for entry in range(start, stop)
+        }
+
+
+# ----------------------------------------------------------------------
+# Agent classes
+# ----------------------------------------------------------------------
+def _class_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve_class(name: str) -> type:
+    module_name, _, qualname = name.partition(":")
+    try:
+        target: Any = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"Snapshot refers to unknown agent class '{name}'") from exc
+    return target
+
+
+# ----------------------------------------------------------------------
+# Saving
+# ----------------------------------------------------------------------
+def _pack_labels(labels: Iterable[str]) -> Tuple[ArrayLike, ArrayLike]:
+    encoded = [label.encode("utf-8") for label in labels]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(label) for label in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _label_buffers(labels: Any) -> Tuple[Dict[str, ArrayLike], Optional[List[str]]]:
+    """Label buffers of a snapshot and the block prefixes, if any.
+
+    :class:`_BlockLabels` are written as their block bounds; only overridden
+    and appended labels are encoded, under ``labels.rows``.
+    """
+
+    if isinstance(labels, _BlockLabels):
+        rows = sorted(labels._overrides)
+        explicit = [labels._overrides[row] for row in rows] + labels._appended
+        rows.extend(range(labels._base, len(labels)))
+        arrays = {"labels.bounds": np.asarray(labels._bounds, dtype=np.int64)}
+        arrays["labels.rows"] = np.asarray(rows, dtype=np.int64)
+        arrays["labels.offsets"], arrays["labels.data"] = _pack_labels(explicit)
+        return arrays, list(labels._prefixes)
+    packed = labels.packed() if isinstance(labels, _PackedLabels) else None
+    if packed is None:
+        packed = _pack_labels(labels)
+    return {"labels.offsets": packed[0], "labels.data": packed[1]}, None
+
+
+def _load_labels(
+    buffer: Callable[[str], ArrayLike], prefixes: Optional[List[str]]
+) -> _LazyLabels:
+    offsets, data = buffer("labels.offsets"), buffer("labels.data")
+    if prefixes is None:
+        return _PackedLabels(offsets, data)
+    labels = _BlockLabels(buffer("labels.bounds"), prefixes)
+    explicit = _PackedLabels(offsets, data)
+    for position, row in enumerate(buffer("labels.rows").tolist()):
+        if row < len(labels):
+            labels[row] = explicit[position]
+        else:
+            labels.append(explicit[position])
+    return labels
+
+
+def save_population(
+    population: AgentPopulation, path: PathLike, extra: Optional[Dict[str, Any]] = None
+) -> None:
+    """Write ``population`` to ``path`` as a binary snapshot.
+
+    ``extra`` is any JSON serialisable metadata to keep in the header; it is
+    returned under the ``"extra"`` key by :func:`read_header`.
+    """
+
+    population._refresh()
+    size = len(population)
+    arrays: Dict[str, ArrayLike] = {
+        "states": population._states[:size],
+        "probabilities": population._probabilities[:size],
+        "coherence": population._coherence[:size],
+        "intents": population._intents[:size],
+        "kinds": population._kinds[:size],
+        "learning_rates": population._learning_rates[:size],
+    }
+    label_arrays, label_prefixes = _label_buffers(population.labels)
+    arrays.update(label_arrays)
+
+    memory_keys: Dict[str, int] = {}
+    memory_rows: List[int] = []
+    memory_key_ids: List[int] = []
+    memory_values: List[ArrayLike] = []
+    for row, memory in population.iter_memories():
+        for key, value in memory.items():
+            memory_rows.append(row)
+            memory_key_ids.append(memory_keys.setdefault(key, len(memory_keys)))
+            memory_values.append(np.asarray(value))
+    arrays["memory.rows"] = np.asarray(memory_rows, dtype=np.int64)
+    arrays["memory.keys"] = np.asarray(memory_key_ids, dtype=np.int32)
+    packed, memory_dtypes = _pack_values(memory_values)
+    arrays.update({f"memory.values.{name}": value for name, value in packed.items()})
+
+    entanglement_keys: List[str] = []
+    entanglement_dtypes: List[str] = []
+    registry = population._entanglement
+    if registry is not None and len(registry):
+        alive = np.flatnonzero(registry._alive[: registry._count])
+        arrays["entanglement.src"] = registry._src[alive]
+        arrays["entanglement.dst"] = registry._dst[alive]
+        arrays["entanglement.keys"] = registry._key[alive]
+        packed, entanglement_dtypes = _pack_values([registry._vectors[edge] for edge in alive.tolist()])
+        arrays.update({f"entanglement.values.{name}": value for name, value in packed.items()})
+        entanglement_keys = list(registry.keys)
+
+    codes = np.unique(arrays["kinds"]).tolist()
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    seed = population.seed
+    header = {
+        "format": FORMAT_VERSION,
+        "size": size,
+        "state_dim": population.state_dim,
+        "intent_dim": population.intent_dim,
+        "seed": int(seed) if isinstance(seed, (int, np.integer)) else None,
+        "coherence_sum": population._coherence_sum,
+        "agent_types": {str(code): _class_name(_AGENT_TYPES[code]) for code in codes},
+        "label_prefixes": label_prefixes,
+        "memory_keys": list(memory_keys),
+        "memory_dtypes": memory_dtypes,
+        "entanglement_keys": entanglement_keys,
+        "entanglement_dtypes": entanglement_dtypes,
+        "arrays": layout,
+        "extra": extra,
+    }
+    encoded = json.dumps(header).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(encoded))
+    with open(path, "wb") as handle:
+        handle.write(_PREFIX.pack(MAGIC, len(encoded)))
+        handle.write(encoded)
+        for name, array in arrays.items():
+            handle.seek(data_start + layout[name]["offset"])
+            handle.write(np.ascontiguousarray(array).data)
+        handle.truncate(data_start + offset)
+
+
+# ----------------------------------------------------------------------
+# Loading
+# ----------------------------------------------------------------------
+def read_header(path: PathLike) -> Dict[str, Any]:
+    """Return the JSON header of a snapshot without mapping its buffers."""
+
+    with open(path, "rb") as handle:
+        return _read_header(handle)[0]
+
+
+def _read_header(handle) -> Tuple[Dict[str, Any], int]:
+    prefix = handle.read(_PREFIX.size)
+    if len(prefix) != _PREFIX.size:
+        raise ValueError("File is too short to be a population snapshot")
+    magic, length = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("Not a population snapshot")
+    header = json.loads(handle.read(length).decode("utf-8"))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {header.get('format')}")
+    return header, _align(_PREFIX.size + length)
+
+
+def load_population(path: PathLike, mmap: bool = True) -> AgentPopulation:
+    """Open a snapshot written by :func:`save_population`.
+
+    With ``mmap=True`` (the default) the buffers are memory mapped in
+    copy-on-write mode and nothing but the header is read up front.  Pass
+    ``mmap=False`` to read the whole file into memory instead.
+    """
+
+    with open(path, "rb") as handle:
+        header, data_start = _read_header(handle)
+    if mmap:
+        raw = np.asarray(np.memmap(path, dtype=np.uint8, mode="c"))
+    else:
+        raw = np.fromfile(path, dtype=np.uint8)
+
+    def buffer(name: str) -> ArrayLike:
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        return raw[start : start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    def ragged(prefix: str, dtypes: List[str]) -> _RaggedValues:
+        fields = ("dtype", "offset", "ndim", "shape_start", "shape", "data")
+        return _RaggedValues({field: buffer(f"{prefix}.{field}") for field in fields}, dtypes)
+
+    population = AgentPopulation(header["state_dim"], header["intent_dim"], seed=header["seed"])
+    states = buffer("states")
+    intents = buffer("intents")
+    population.complex_dtype = states.dtype
+    population.real_dtype = intents.dtype
+    population._size = header["size"]
+    population._states = states
+    population._probabilities = buffer("probabilities")
+    population._coherence = buffer("coherence")
+    population._dirty = np.zeros(header["size"], dtype=bool)
+    population._coherence_sum = header["coherence_sum"]
+    population._intents = intents
+    population._learning_rates = buffer("learning_rates")
+
+    kinds = buffer("kinds")
+    mapping = {int(code): _type_code(_resolve_class(name)) for code, name in header["agent_types"].items()}
+    if any(code != current for code, current in mapping.items()):
+        table = np.zeros(max(mapping) + 1, dtype=np.int8)
+        for code, current in mapping.items():
+            table[code] = current
+        kinds = table[kinds]
+    population._kinds = kinds
+    population.labels = _load_labels(buffer, header.get("label_prefixes"))  # type: ignore[assignment]
+
+    if len(buffer("memory.rows")):
+        population._memory_source = _MemoryArena(
+            buffer("memory.rows"),
+            buffer("memory.keys"),
+            header["memory_keys"],
+            ragged("memory.values", header["memory_dtypes"]),
+        )
+    if "entanglement.src" in header["arrays"]:
+        registry = EntanglementRegistry()
+        values = ragged("entanglement.values", header["entanglement_dtypes"])
+        keys = header["entanglement_keys"]
+        for edge, (src, dst, key) in enumerate(
+            zip(
+                buffer("entanglement.src").tolist(),
+                buffer("entanglement.dst").tolist(),
+                buffer("entanglement.keys").tolist(),
+            )
+        ):
+            registry.entangle(src, dst, keys[key], values[edge])
+        population._entanglement = registry
+    return population
+
+
+__all__ = ["load_population", "read_header", "save_population"]
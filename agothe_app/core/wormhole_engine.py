@@ -9,11 +9,30 @@ Integrates with Agothe's quantum consciousness framework.
 
 from __future__ import annotations
 
+import os
+import struct
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.spatial.distance import pdist, squareform
-from typing import Dict, List, Tuple, Optional
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import pdist
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Optional, Union
 import pandas as pd
 
+try:  # Optional: enables the Parquet ledger format.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+WORMHOLE_BACKENDS = ("auto", "dense", "kdtree")
+ENSEMBLE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# (count, mean, co-moment matrix) of a set of node rows.
+Moments = Tuple[float, np.ndarray, np.ndarray]
+
 
 class WormholeEngine:
     """
@@ -43,12 +62,17 @@ class WormholeEngine:
         "Cognition": "#9b59b6"
     }
     
+    # Above this many nodes "auto" switches from the condensed distance
+    # matrix to the k-d tree radius query.
+    DENSE_MAX_NODES = 2048
+    
     def __init__(
         self, 
         dim: int = 5,
         delta_threshold: float = 0.0215,
         phi_target: float = 0.85,
-        learning_rate: float = 0.05
+        learning_rate: float = 0.05,
+        backend: str = "auto"
     ):
         """
         Initialize the wormhole formation engine.
@@ -58,11 +82,16 @@ class WormholeEngine:
             delta_threshold: Maximum distance for wormhole formation
             phi_target: Target coherence (Φ) value
             learning_rate: Node evolution step size
+            backend: Pair search used by compute_wormholes ("auto", "dense"
+                or "kdtree")
         """
+        if backend not in WORMHOLE_BACKENDS:
+            raise ValueError(f"Unknown wormhole backend '{backend}', expected one of {WORMHOLE_BACKENDS}")
         self.dim = dim
         self.delta_threshold = delta_threshold
         self.phi_target = phi_target
         self.learning_rate = learning_rate
+        self.backend = backend
         
     def compute_phi(self, nodes: np.ndarray) -> float:
         """
@@ -82,36 +111,223 @@ class WormholeEngine:
         C = np.corrcoef(nodes, rowvar=False)
         return float(np.nanmean(C[np.triu_indices_from(C, 1)]))
     
-    def compute_wormholes(self, nodes: np.ndarray) -> Tuple[np.ndarray, int]:
+    def compute_phi_pairs(self, nodes: np.ndarray) -> Dict[Tuple[str, str], float]:
+        """
+        Correlation of every dimension pair, keyed by DIMENSION_LABELS.
+        
+        compute_phi is the mean of these values.
+        
+        Args:
+            nodes: N×D array of node positions
+            
+        Returns:
+            {(label_a, label_b): correlation} for every pair a < b
+        """
+        if len(nodes) < 2:
+            return {}
+        return _label_pairs(np.corrcoef(nodes, rowvar=False), self.DIMENSION_LABELS)
+    
+    def compute_phi_batch(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        compute_phi of every replica of an ensemble at once.
+        
+        Args:
+            nodes: R×N×D array of node positions
+            
+        Returns:
+            R-length array of Φ values
+        """
+        nodes = np.asarray(nodes, dtype=float)
+        if nodes.shape[1] < 2:
+            return np.zeros(len(nodes))
+        centred = nodes - nodes.mean(axis=1, keepdims=True)
+        cov = np.einsum("rnd,rne->rde", centred, centred)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+            C = np.clip(cov / (scale[:, :, None] * scale[:, None, :]), -1, 1)
+        i, j = np.triu_indices(nodes.shape[2], 1)
+        # Sum the pairs column by column instead of with nanmean: NumPy
+        # reduces a single contiguous row in a different order than a
+        # batch, and Φ of a replica must not depend on its batch.
+        total = np.zeros(len(nodes))
+        count = np.zeros(len(nodes))
+        for pair in C[:, i, j].T:
+            valid = ~np.isnan(pair)
+            total += np.where(valid, pair, 0.0)
+            count += valid
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Replicas with constant dimensions give NaN, as compute_phi does.
+            return total / count
+    
+    def compute_wormholes(
+        self, nodes: np.ndarray, backend: Optional[str] = None
+    ) -> Tuple[np.ndarray, int]:
         """
         Find all node pairs within wormhole threshold δ.
         
+        Every pair is reported once with i < j, sorted by (i, j).  Nodes at
+        exactly the same position do not form a wormhole.
+        
+        The "dense" backend scans the condensed distance matrix (O(N²)
+        memory); "kdtree" runs a radius query on a k-d tree, which needs
+        O(N + pairs) memory because δ is tiny.  "auto" uses the dense scan
+        up to DENSE_MAX_NODES nodes.
+        
+        Args:
+            nodes: N×D array of node positions
+            backend: Overrides the engine's backend for this call
+            
+        Returns:
+            (pairs, count) - P×2 array of [i,j] pairs and total count
+        """
+        nodes = np.asarray(nodes, dtype=float)
+        backend = backend or self.backend
+        if backend == "auto":
+            backend = "dense" if len(nodes) <= self.DENSE_MAX_NODES else "kdtree"
+        if backend == "dense":
+            pairs = self._dense_pairs(nodes)
+        elif backend == "kdtree":
+            pairs = self._kdtree_pairs(nodes)
+        else:
+            raise ValueError(f"Unknown wormhole backend '{backend}', expected one of {WORMHOLE_BACKENDS}")
+        return pairs, len(pairs)
+    
+    def _dense_pairs(self, nodes: np.ndarray) -> np.ndarray:
+        n = len(nodes)
+        if n < 2:
+            return np.zeros((0, 2), dtype=np.intp)
+        distances = pdist(nodes)
+        hits = np.flatnonzero((distances < self.delta_threshold) & (distances > 0))
+        # Row i of the condensed matrix starts at i·n - i·(i+1)/2.
+        starts = np.arange(n) * n - np.arange(n) * np.arange(1, n + 1) // 2
+        i = np.searchsorted(starts, hits, side="right") - 1
+        j = hits - starts[i] + i + 1
+        return np.column_stack([i, j]).astype(np.intp)
+    
+    def _kdtree_pairs(self, nodes: np.ndarray) -> np.ndarray:
+        if len(nodes) < 2:
+            return np.zeros((0, 2), dtype=np.intp)
+        candidates = cKDTree(nodes).query_pairs(self.delta_threshold, output_type="ndarray")
+        # query_pairs includes pairs at exactly δ; keep the strict bound.
+        distances = self.pair_distances(nodes, candidates)
+        pairs = candidates[(distances < self.delta_threshold) & (distances > 0)]
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        return pairs[order].astype(np.intp)
+    
+    def pair_distances(self, nodes: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+        """
+        Euclidean distance of every [i,j] pair.
+        
         Args:
             nodes: N×D array of node positions
+            pairs: P×2 array of node indices
             
         Returns:
-            (pairs, count) - array of [i,j] pairs and total count
+            P-length array of distances
         """
-        D = squareform(pdist(nodes))
-        idx = np.argwhere((D < self.delta_threshold) & (D > 0))
-        return idx, len(idx)
+        if len(pairs) == 0:
+            return np.zeros(0)
+        diff = nodes[pairs[:, 0]] - nodes[pairs[:, 1]]
+        return np.sqrt(np.einsum("pd,pd->p", diff, diff))
     
-    def evolve_nodes(self, nodes: np.ndarray, R: Optional[np.ndarray] = None) -> np.ndarray:
+    def evolve_nodes(
+        self,
+        nodes: np.ndarray,
+        R: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None,
+        noise: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Quantum drift step with optional rationality modulation.
         
+        Works on a single N×D configuration or an R×N×D ensemble.
+        
         Args:
             nodes: Current node positions
-            R: Optional rationality values (drive/stability)
+            R: Optional rationality values (drive/stability), one per node
+                or one per replica and node
+            rng: Generator for the drift (default: the global NumPy state)
+            noise: Standard normal draws shaped like nodes, used instead
+                of drawing from rng
             
         Returns:
             Updated node positions
         """
-        drift = self.learning_rate * np.random.normal(0, 1, nodes.shape)
+        if noise is None:
+            noise = (rng or np.random).normal(0, 1, nodes.shape)
+        drift = self.learning_rate * noise
         if R is not None:
-            drift *= R[:, np.newaxis]
+            drift *= R[..., np.newaxis]
         return nodes + drift
     
+    def run_ensemble(
+        self,
+        nodes: np.ndarray,
+        steps: int,
+        replicas: Optional[int] = None,
+        R: Optional[np.ndarray] = None,
+        seed: Optional[int] = None,
+        processes: Optional[int] = None,
+        block_size: int = 8,
+        wormholes: bool = True
+    ) -> "EnsembleRun":
+        """
+        Evolve many independent replicas of a simulation.
+        
+        Replicas are split into blocks of block_size and Φ of a block is
+        computed as one R×N×D tensor.  Every replica draws its drift from
+        its own generator, spawned from seed and the replica number, so a
+        run is reproducible for a given seed whatever the block_size and
+        the number of processes.  Φ and the wormhole
+        count are recorded for the initial positions and after every step.
+        
+        Args:
+            nodes: N×D start positions shared by all replicas, or R×N×D
+                positions per replica
+            steps: Number of evolve_nodes steps
+            replicas: Number of replicas when nodes is N×D
+            R: Rationality values, N or R×N
+            seed: Seed for the replica generators
+            processes: Worker processes (None: one per CPU, 0: run in the
+                calling process)
+            block_size: Replicas per block (does not change the results)
+            wormholes: Whether to count wormholes (the costly part)
+            
+        Returns:
+            EnsembleRun with (steps + 1)×R Φ and wormhole counts
+        """
+        nodes = np.asarray(nodes, dtype=float)
+        if nodes.ndim == 2:
+            nodes = np.broadcast_to(nodes, (replicas or 1,) + nodes.shape)
+        elif replicas is not None and replicas != len(nodes):
+            raise ValueError(f"Got {len(nodes)} replica positions for {replicas} replicas")
+        count = len(nodes)
+        entropy = np.random.SeedSequence(seed).entropy
+        tasks = []
+        for start in range(0, count, block_size):
+            stop = min(start + block_size, count)
+            tasks.append({
+                "engine": self,
+                "nodes": np.array(nodes[start:stop]),
+                "R": R[start:stop] if R is not None and np.ndim(R) == 2 else R,
+                "seeds": [
+                    np.random.SeedSequence(entropy, spawn_key=(replica,))
+                    for replica in range(start, stop)
+                ],
+                "steps": steps,
+                "wormholes": wormholes
+            })
+        if processes == 0 or len(tasks) <= 1:
+            results = [_simulate_block(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(processes) as executor:
+                results = list(executor.map(_simulate_block, tasks))
+        return EnsembleRun(
+            phi=np.concatenate([result["phi"] for result in results], axis=1),
+            wormholes=np.concatenate([result["wormholes"] for result in results], axis=1),
+            nodes=np.concatenate([result["nodes"] for result in results])
+        )
+    
     def get_node_colors(self, nodes: np.ndarray) -> np.ndarray:
         """
         Map emotion intensity (dim 1) to color scale.
@@ -159,51 +375,668 @@ class WormholeEngine:
             
         return nodes, R
     
-    def export_stats(self, timesteps: List[Dict]) -> pd.DataFrame:
+    def export_stats(
+        self,
+        timesteps: Union[List[Dict], "EnsembleRun"],
+        quantiles: Sequence[float] = ENSEMBLE_QUANTILES
+    ) -> pd.DataFrame:
         """
         Convert simulation history to DataFrame.
         
+        An EnsembleRun is summarised across replicas as one row per
+        (time, metric, quantile), with metric "phi" or "wormholes"; the
+        wormholes metric is left out when the run did not count them.
+        
         Args:
-            timesteps: List of {time, phi, wormholes, ...} dicts
+            timesteps: List of {time, phi, wormholes, ...} dicts, or the
+                result of run_ensemble
+            quantiles: Quantiles reported for an EnsembleRun
             
         Returns:
             Pandas DataFrame for analysis
         """
-        return pd.DataFrame(timesteps)
+        if not isinstance(timesteps, EnsembleRun):
+            return pd.DataFrame(timesteps)
+        q = np.asarray(quantiles, dtype=float)
+        frames = []
+        for metric in ("phi", "wormholes"):
+            values = getattr(timesteps, metric).astype(float)
+            if metric == "wormholes" and np.isnan(values).all():
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                summary = np.nanquantile(values, q, axis=1)
+            T = len(values)
+            frames.append(pd.DataFrame({
+                "time": np.tile(np.arange(T), len(q)),
+                "metric": metric,
+                "quantile": np.repeat(q, T),
+                "value": summary.ravel()
+            }))
+        return pd.concat(frames, ignore_index=True).sort_values(
+            ["metric", "time", "quantile"], ignore_index=True
+        )
 
 
-class WormholeLedger:
-    """Persistent storage for wormhole formation events."""
+class EnsembleRun(NamedTuple):
+    """Per-timestep results of WormholeEngine.run_ensemble."""
+    
+    phi: np.ndarray        # (steps + 1)×R Φ values
+    wormholes: np.ndarray  # (steps + 1)×R wormhole counts (NaN when not counted)
+    nodes: np.ndarray      # R×N×D final positions
+
+
+def _simulate_block(task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Worker entry point: evolve one block of replicas as a tensor."""
+    engine = task["engine"]
+    nodes = task["nodes"]
+    rngs = [np.random.default_rng(seed) for seed in task["seeds"]]
+    steps = task["steps"]
+    noise = np.empty(nodes.shape)
+    phi = np.empty((steps + 1, len(nodes)))
+    wormholes = np.full((steps + 1, len(nodes)), np.nan)
+    for t in range(steps + 1):
+        if t:
+            # Each replica fills its slice from its own generator, then the
+            # whole block moves in one step.
+            for replica, rng in zip(noise, rngs):
+                rng.standard_normal(out=replica)
+            nodes = engine.evolve_nodes(nodes, task["R"], noise=noise)
+        phi[t] = engine.compute_phi_batch(nodes)
+        if task["wormholes"]:
+            wormholes[t] = [engine.compute_wormholes(replica)[1] for replica in nodes]
+    return {"phi": phi, "wormholes": wormholes, "nodes": nodes}
+
+
+def _label_pairs(C: np.ndarray, labels: Dict[int, str]) -> Dict[Tuple[str, str], float]:
+    names = [labels.get(k, f"dim{k}") for k in range(len(C))]
+    i, j = np.triu_indices_from(C, 1)
+    return {(names[a], names[b]): float(C[a, b]) for a, b in zip(i.tolist(), j.tolist())}
+
+
+def _moments(rows: np.ndarray) -> Moments:
+    if len(rows) == 0:
+        dim = rows.shape[1]
+        return 0.0, np.zeros(dim), np.zeros((dim, dim))
+    mean = rows.mean(axis=0)
+    centred = rows - mean
+    return float(len(rows)), mean, centred.T @ centred
+
+
+def _merge(a: Moments, b: Moments) -> Moments:
+    """Chan et al. pairwise combination of two sets of moments."""
+    na, ma, Ma = a
+    nb, mb, Mb = b
+    n = na + nb
+    if n == 0:
+        return a
+    delta = mb - ma
+    return n, ma + delta * (nb / n), Ma + Mb + np.outer(delta, delta) * (na * nb / n)
+
+
+def _remove(total: Moments, part: Moments) -> Moments:
+    """Inverse of _merge: the moments of total without the rows of part."""
+    nt, mt, Mt = total
+    npart, mp, Mp = part
+    n = nt - npart
+    if n <= 0:
+        return 0.0, np.zeros_like(mt), np.zeros_like(Mt)
+    mean = (nt * mt - npart * mp) / n
+    delta = mp - mean
+    return n, mean, Mt - Mp - np.outer(delta, delta) * (n * npart / nt)
+
+
+def _correlation(moments: Moments) -> np.ndarray:
+    _, _, M = moments
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.sqrt(np.diag(M))
+        C = M / np.outer(scale, scale)
+    # np.corrcoef clips the same way to absorb rounding.
+    return np.clip(C, -1, 1)
+
+
+class StreamingPhi:
+    """
+    Online Φ-coherence from running means and co-moments.
+    
+    The estimator keeps the Welford/Chan moments (count, mean and
+    co-moment matrix) of the current node positions.  update() either
+    recomputes them in O(N·D²) or, when told which k nodes moved, swaps
+    those rows out and back in at O(k·D²).  Every refresh_every
+    incremental updates the moments are recomputed from scratch to stop
+    rounding errors from accumulating.
+    
+    By default Φ describes the current nodes and equals
+    WormholeEngine.compute_phi.  With window=W it pools the nodes of the
+    last W updates, and with decay=λ older updates are down-weighted by λ
+    per step.
+    """
+    
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        decay: Optional[float] = None,
+        labels: Optional[Dict[int, str]] = None,
+        refresh_every: int = 1024
+    ):
+        """
+        Args:
+            window: Number of updates pooled into Φ
+            decay: Per-update weight of the older history, in (0, 1)
+            labels: Dimension labels (default WormholeEngine.DIMENSION_LABELS)
+            refresh_every: Incremental updates between full recomputes
+        """
+        if window is not None and decay is not None:
+            raise ValueError("Use either a window or a decay, not both")
+        if decay is not None and not 0 < decay < 1:
+            raise ValueError("decay must lie in (0, 1)")
+        self.window = window
+        self.decay = decay
+        self.labels = WormholeEngine.DIMENSION_LABELS if labels is None else labels
+        self.refresh_every = refresh_every
+        self._nodes: Optional[np.ndarray] = None
+        self._current: Optional[Moments] = None
+        self._pooled: Optional[Moments] = None
+        self._history: deque = deque(maxlen=window)
+        self._incremental = 0
+    
+    def update(self, nodes: np.ndarray, moved: Optional[np.ndarray] = None) -> float:
+        """
+        Fold new node positions into the estimator.
+        
+        Args:
+            nodes: N×D array of node positions
+            moved: Indices of the only rows that changed since the last
+                update; None recomputes the moments of every row
+            
+        Returns:
+            The updated Φ
+        """
+        nodes = np.asarray(nodes, dtype=float)
+        incremental = (
+            moved is not None
+            and self._nodes is not None
+            and self._nodes.shape == nodes.shape
+            and self._incremental < self.refresh_every
+        )
+        if incremental:
+            moved = np.unique(np.asarray(moved, dtype=np.intp))
+            old, new = self._nodes[moved], nodes[moved]
+            self._current = _merge(_remove(self._current, _moments(old)), _moments(new))
+            self._nodes[moved] = new
+            self._incremental += 1
+        else:
+            self._nodes = nodes.copy()
+            self._current = _moments(nodes)
+            self._incremental = 0
+        
+        if self.window is not None:
+            self._history.append(self._current)
+            pooled = self._history[0]
+            for moments in list(self._history)[1:]:
+                pooled = _merge(pooled, moments)
+            self._pooled = pooled
+        elif self.decay is not None and self._pooled is not None:
+            n, mean, M = self._pooled
+            self._pooled = _merge((n * self.decay, mean, M * self.decay), self._current)
+        else:
+            self._pooled = self._current
+        return self.phi
+    
+    @property
+    def phi(self) -> float:
+        """Mean correlation across dimension pairs, like compute_phi."""
+        if self._pooled is None or self._pooled[0] < 2:
+            return 0.0
+        C = _correlation(self._pooled)
+        return float(np.nanmean(C[np.triu_indices_from(C, 1)]))
     
-    def __init__(self, filepath: str = "data/wormhole_ledger.csv"):
-        self.filepath = filepath
-        self.entries: List[Dict] = []
+    def phi_pairs(self) -> Dict[Tuple[str, str], float]:
+        """Correlation of every dimension pair, keyed by the labels."""
+        if self._pooled is None or self._pooled[0] < 2:
+            return {}
+        return _label_pairs(_correlation(self._pooled), self.labels)
+
+
+class WormholeDelta(NamedTuple):
+    """Wormholes formed and broken during one tracked timestep."""
+    
+    timestep: int
+    formed: np.ndarray
+    broken: np.ndarray
+    formed_distances: np.ndarray
+    broken_distances: np.ndarray
+    count: int
+    rebuilt: bool
+    
+    def summary(self) -> Dict:
+        """Scalar view of the delta, one row for export_stats."""
+        return {
+            "time": self.timestep,
+            "wormholes": self.count,
+            "formed": len(self.formed),
+            "broken": len(self.broken),
+            "rebuilt": self.rebuilt
+        }
+
+
+class WormholeTracker:
+    """
+    Incremental wormhole detection across evolve_nodes timesteps.
+    
+    The tracker keeps a Verlet neighbour list: every pair closer than
+    δ + skin when the list was built.  Until the two largest node
+    displacements since then add up to more than the skin, no other pair can
+    have come within δ, so a step only re-measures the listed candidates and
+    diffs them against the previous step.  Only formed and broken pairs are
+    reported (and recorded in the ledger, when one is attached).
+    """
+    
+    def __init__(
+        self,
+        engine: WormholeEngine,
+        skin: Optional[float] = None,
+        ledger: Optional["WormholeLedger"] = None
+    ):
+        """
+        Args:
+            engine: Engine providing δ and the distance helpers
+            skin: Verlet skin margin (default δ)
+            ledger: Optional ledger receiving every formed/broken event
+        """
+        self.engine = engine
+        self.skin = engine.delta_threshold if skin is None else skin
+        self.ledger = ledger
+        self.rebuilds = 0
+        self._reference: Optional[np.ndarray] = None
+        self._candidates = np.zeros((0, 2), dtype=np.intp)
+        self._active = np.zeros(0, dtype=bool)
+    
+    @property
+    def pairs(self) -> np.ndarray:
+        """Current wormholes as a P×2 array of [i,j] pairs with i < j."""
+        return self._candidates[self._active]
+    
+    def _needs_rebuild(self, nodes: np.ndarray) -> bool:
+        if self._reference is None or self._reference.shape != nodes.shape:
+            return True
+        if len(nodes) < 2:
+            return False
+        moved = np.linalg.norm(nodes - self._reference, axis=1)
+        return float(np.partition(moved, -2)[-2:].sum()) > self.skin
+    
+    def _rebuild(self, nodes: np.ndarray):
+        self._reference = nodes.copy()
+        self.rebuilds += 1
+        if len(nodes) < 2:
+            self._candidates = np.zeros((0, 2), dtype=np.intp)
+            return
+        radius = self.engine.delta_threshold + self.skin
+        candidates = cKDTree(nodes).query_pairs(radius, output_type="ndarray")
+        order = np.lexsort((candidates[:, 1], candidates[:, 0]))
+        self._candidates = candidates[order].astype(np.intp)
+    
+    def step(
+        self, nodes: np.ndarray, timestep: int, phi: Optional[float] = None
+    ) -> WormholeDelta:
+        """
+        Update the wormholes for new node positions.
+        
+        The first call reports every existing wormhole as formed.
+        
+        Args:
+            nodes: N×D array of node positions
+            timestep: Timestep recorded with the events
+            phi: Φ recorded in the ledger; computed only when events are
+                recorded and no value is given
+            
+        Returns:
+            WormholeDelta with the formed and broken pairs
+        """
+        nodes = np.asarray(nodes, dtype=float)
+        threshold = self.engine.delta_threshold
+        previous = self.pairs
+        rebuilt = self._needs_rebuild(nodes)
+        if rebuilt:
+            self._rebuild(nodes)
+        distances = self.engine.pair_distances(nodes, self._candidates)
+        active = (distances < threshold) & (distances > 0)
+        if rebuilt:
+            # The candidate list changed, so match pairs by key instead of slot.
+            n = len(nodes)
+            old_keys = previous[:, 0].astype(np.int64) * n + previous[:, 1]
+            new_keys = self._candidates[:, 0].astype(np.int64) * n + self._candidates[:, 1]
+            formed_mask = active & ~np.isin(new_keys, old_keys)
+            broken = previous[~np.isin(old_keys, new_keys[active])]
+        else:
+            formed_mask = active & ~self._active
+            broken = self._candidates[self._active & ~active]
+        self._active = active
         
+        formed = self._candidates[formed_mask]
+        formed_distances = distances[formed_mask]
+        broken_distances = self.engine.pair_distances(nodes, broken)
+        if self.ledger is not None and (len(formed) or len(broken)):
+            if phi is None:
+                phi = self.engine.compute_phi(nodes)
+            self.ledger.record_events(timestep, formed, formed_distances, phi)
+            self.ledger.record_events(timestep, broken, broken_distances, phi, event="broken")
+        return WormholeDelta(
+            timestep, formed, broken, formed_distances, broken_distances,
+            int(active.sum()), rebuilt
+        )
+
+
+LEDGER_FORMATS = ("auto", "parquet", "binary", "csv")
+LEDGER_EVENTS = ("formed", "broken")
+LEDGER_COLUMNS = {
+    "timestep": np.dtype("<i8"),
+    "node_i": np.dtype("<i8"),
+    "node_j": np.dtype("<i8"),
+    "distance": np.dtype("<f8"),
+    "phi": np.dtype("<f8"),
+    "event": np.dtype("i1")
+}
+# Columns with per-chunk min/max statistics used by load() to skip chunks.
+_LEDGER_INDEXED = ("timestep", "node_i", "node_j")
+# magic | rows | (min, max) of every indexed column
+_CHUNK_HEADER = struct.Struct("<8sQ6q")
+_CHUNK_MAGIC = b"AGOWLC01"
+_ROW_BYTES = sum(dtype.itemsize for dtype in LEDGER_COLUMNS.values())
+_LEDGER_SUFFIXES = {"parquet": ".parquet", "binary": ".bin", "csv": ".csv"}
+
+
+class WormholeLedger:
+    """
+    Append-only, columnar storage for wormhole formation events.
+    
+    Events are buffered in preallocated NumPy columns and flushed to disk
+    chunk_size rows at a time; save() flushes the partial chunk.  Existing
+    chunks are never rewritten.
+    
+    With pyarrow installed ("parquet") the ledger is a directory holding one
+    Parquet file (a single row group) per chunk.  Otherwise ("binary") it is
+    one file of chunks, each a fixed header with the row count and the
+    min/max of timestep, node_i and node_j, followed by the raw columns.
+    load() uses those statistics to skip chunks that cannot match its
+    filters.
+    
+    A filepath ending in ".csv" selects the "csv" format of earlier
+    releases: load() reads the existing file (rows without an event column
+    count as "formed") and flushed chunks are appended to it.  It has no
+    chunk statistics, so every load() reads the whole file.
+    
+    Changes from the CSV-only ledger: the default location is now
+    data/wormhole_ledger.parquet or .bin instead of
+    data/wormhole_ledger.csv (pass the CSV path to keep using it), the
+    in-memory ``entries`` list is gone (use load(), which also returns
+    unsaved events), and load() always returns the event column.
+    """
+    
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        chunk_size: int = 65536,
+        format: str = "auto"
+    ):
+        """
+        Args:
+            filepath: Ledger location (default data/wormhole_ledger.parquet
+                or data/wormhole_ledger.bin, depending on the format)
+            chunk_size: Rows buffered before a chunk is flushed
+            format: "parquet", "binary", "csv" or "auto" (CSV for a .csv
+                filepath, otherwise Parquet when available)
+        """
+        if format not in LEDGER_FORMATS:
+            raise ValueError(f"Unknown ledger format '{format}', expected one of {LEDGER_FORMATS}")
+        if format == "auto" and filepath is not None and filepath.lower().endswith(".csv"):
+            format = "csv"
+        elif format == "auto":
+            format = "parquet" if pq is not None else "binary"
+        if format == "parquet" and pq is None:
+            raise ImportError("The Parquet ledger format requires pyarrow")
+        self.format = format
+        self.filepath = filepath or "data/wormhole_ledger" + _LEDGER_SUFFIXES[format]
+        self.chunk_size = chunk_size
+        self._columns = {
+            name: np.empty(chunk_size, dtype=dtype) for name, dtype in LEDGER_COLUMNS.items()
+        }
+        self._fill = 0
+        # Rows already on disk, counted on first use of len().
+        self._stored: Optional[int] = None
+    
+    def __len__(self) -> int:
+        """Number of events in the ledger, flushed or not."""
+        if self._stored is None:
+            self._stored = sum(rows for _, rows, _ in self._chunks())
+        return self._stored + self._fill
+    
     def record_event(
         self,
         timestep: int,
         node_i: int,
         node_j: int,
         distance: float,
-        phi_coherence: float
+        phi_coherence: float,
+        event: str = "formed"
     ):
-        """Record a wormhole formation event."""
-        self.entries.append({
-            "timestep": timestep,
-            "node_i": node_i,
-            "node_j": node_j,
-            "distance": distance,
-            "phi": phi_coherence
-        })
+        """Record a wormhole formation (or, with event="broken", breakup) event."""
+        row = self._fill
+        columns = self._columns
+        columns["timestep"][row] = timestep
+        columns["node_i"][row] = node_i
+        columns["node_j"][row] = node_j
+        columns["distance"][row] = distance
+        columns["phi"][row] = phi_coherence
+        columns["event"][row] = LEDGER_EVENTS.index(event)
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self._flush()
+    
+    def record_events(
+        self,
+        timestep: int,
+        pairs: np.ndarray,
+        distances: np.ndarray,
+        phi_coherence: float,
+        event: str = "formed"
+    ):
+        """
+        Record one event per pair in bulk.
+        
+        Args:
+            timestep: Timestep of every event
+            pairs: P×2 array of [i,j] node pairs
+            distances: P-length array of pair distances
+            phi_coherence: Φ at this timestep
+            event: "formed" or "broken"
+        """
+        code = LEDGER_EVENTS.index(event)
+        start = 0
+        while start < len(pairs):
+            count = min(len(pairs) - start, self.chunk_size - self._fill)
+            rows = slice(self._fill, self._fill + count)
+            block = pairs[start:start + count]
+            self._columns["timestep"][rows] = timestep
+            self._columns["node_i"][rows] = block[:, 0]
+            self._columns["node_j"][rows] = block[:, 1]
+            self._columns["distance"][rows] = distances[start:start + count]
+            self._columns["phi"][rows] = phi_coherence
+            self._columns["event"][rows] = code
+            self._fill += count
+            start += count
+            if self._fill == self.chunk_size:
+                self._flush()
     
     def save(self):
-        """Persist ledger to CSV."""
-        df = pd.DataFrame(self.entries)
-        df.to_csv(self.filepath, index=False)
+        """Flush buffered events to the ledger."""
+        if self._fill:
+            self._flush()
     
-    def load(self) -> pd.DataFrame:
-        """Load existing ledger."""
+    def _flush(self):
+        columns = {name: column[:self._fill] for name, column in self._columns.items()}
+        directory = self.filepath if self.format == "parquet" else os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.format == "parquet":
+            part = len(self._parquet_parts())
+            table = pa.table(columns)
+            pq.write_table(table, os.path.join(self.filepath, f"part-{part:06d}.parquet"),
+                           row_group_size=len(table))
+        elif self.format == "csv":
+            self._append_csv(columns)
+        else:
+            stats = []
+            for name in _LEDGER_INDEXED:
+                stats += [int(columns[name].min()), int(columns[name].max())]
+            with open(self.filepath, "ab") as handle:
+                handle.write(_CHUNK_HEADER.pack(_CHUNK_MAGIC, self._fill, *stats))
+                for column in columns.values():
+                    handle.write(column.tobytes())
+        if self._stored is not None:
+            self._stored += self._fill
+        self._fill = 0
+    
+    def _csv_header(self) -> Optional[List[str]]:
+        """Columns of the existing CSV ledger, or None when there is none."""
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return None
         try:
-            return pd.read_csv(self.filepath)
-        except FileNotFoundError:
-            return pd.DataFrame()
\ No newline at end of file
+            return list(pd.read_csv(self.filepath, nrows=0).columns)
+        except pd.errors.EmptyDataError:
+            return None
+    
+    def _append_csv(self, columns: Dict[str, np.ndarray]):
+        header = self._csv_header()
+        names = list(LEDGER_COLUMNS) if header is None else header
+        unknown = set(names) - set(LEDGER_COLUMNS)
+        if unknown:
+            raise ValueError(f"CSV ledger {self.filepath} has unknown columns {sorted(unknown)}")
+        if "event" not in names and columns["event"].any():
+            raise ValueError(f"CSV ledger {self.filepath} has no event column to record broken events")
+        frame = pd.DataFrame(columns)
+        frame["event"] = np.array(LEDGER_EVENTS)[columns["event"].astype(np.intp)]
+        frame[names].to_csv(self.filepath, mode="a", header=header is None, index=False)
+    
+    def _parquet_parts(self) -> List[str]:
+        if not os.path.isdir(self.filepath):
+            return []
+        names = sorted(name for name in os.listdir(self.filepath) if name.endswith(".parquet"))
+        return [os.path.join(self.filepath, name) for name in names]
+    
+    def _chunks(self) -> Iterator[Tuple[Dict[str, Tuple[int, int]], int, Callable[[], Dict[str, np.ndarray]]]]:
+        """Yield (statistics, rows, reader) for every flushed chunk."""
+        if self.format == "csv":
+            if self._csv_header() is None:
+                return
+            with open(self.filepath, "rb") as handle:
+                rows = sum(1 for _ in handle) - 1
+            
+            def read_csv():
+                frame = pd.read_csv(self.filepath)
+                columns = {
+                    name: frame[name].to_numpy(dtype=dtype)
+                    for name, dtype in LEDGER_COLUMNS.items() if name != "event"
+                }
+                if "event" in frame:
+                    codes = frame["event"].map(LEDGER_EVENTS.index)
+                    columns["event"] = codes.to_numpy(dtype=LEDGER_COLUMNS["event"])
+                else:
+                    columns["event"] = np.zeros(len(frame), dtype=LEDGER_COLUMNS["event"])
+                return columns
+            yield {}, rows, read_csv
+            return
+        if self.format == "parquet":
+            for path in self._parquet_parts():
+                metadata = pq.ParquetFile(path).metadata
+                names = [metadata.schema.column(k).name for k in range(metadata.num_columns)]
+                stats = {}
+                for name in _LEDGER_INDEXED:
+                    column = metadata.row_group(0).column(names.index(name)).statistics
+                    if column is not None and column.has_min_max:
+                        stats[name] = (column.min, column.max)
+
+                def read(path=path):
+                    table = pq.read_table(path)
+                    return {name: table.column(name).to_numpy() for name in LEDGER_COLUMNS}
+                yield stats, metadata.num_rows, read
+            return
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, "rb") as handle:
+            while True:
+                header = handle.read(_CHUNK_HEADER.size)
+                if len(header) < _CHUNK_HEADER.size:
+                    return
+                magic, rows, *bounds = _CHUNK_HEADER.unpack(header)
+                if magic != _CHUNK_MAGIC:
+                    raise ValueError(f"Corrupt wormhole ledger chunk in {self.filepath}")
+                stats = {
+                    name: (bounds[2 * k], bounds[2 * k + 1]) for k, name in enumerate(_LEDGER_INDEXED)
+                }
+                offset = handle.tell()
+                handle.seek(rows * _ROW_BYTES, os.SEEK_CUR)
+                
+                def read(offset=offset, rows=rows):
+                    columns = {}
+                    with open(self.filepath, "rb") as chunk:
+                        chunk.seek(offset)
+                        for name, dtype in LEDGER_COLUMNS.items():
+                            columns[name] = np.fromfile(chunk, dtype=dtype, count=rows)
+                    return columns
+                yield stats, rows, read
+    
+    def load(
+        self,
+        timesteps: Optional[Tuple[Optional[int], Optional[int]]] = None,
+        nodes: Optional[Iterable[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Load recorded events, including ones not yet flushed.
+        
+        Args:
+            timesteps: Inclusive (first, last) timestep range; None on
+                either side leaves it open
+            nodes: Keep only events touching one of these nodes
+            
+        Returns:
+            DataFrame with one row per event
+        """
+        first, last = timesteps if timesteps is not None else (None, None)
+        wanted = None if nodes is None else np.unique(np.fromiter(nodes, dtype=np.int64))
+        
+        def overlaps(stats: Dict[str, Tuple[int, int]]) -> bool:
+            low, high = stats.get("timestep", (None, None))
+            if low is not None and ((first is not None and high < first) or
+                                    (last is not None and low > last)):
+                return False
+            if wanted is None:
+                return True
+            for name in ("node_i", "node_j"):
+                if name not in stats:
+                    return True
+                low, high = stats[name]
+                if np.searchsorted(wanted, low) < np.searchsorted(wanted, high, side="right"):
+                    return True
+            return False
+        
+        def select(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+            keep = np.ones(len(columns["timestep"]), dtype=bool)
+            if first is not None:
+                keep &= columns["timestep"] >= first
+            if last is not None:
+                keep &= columns["timestep"] <= last
+            if wanted is not None:
+                keep &= np.isin(columns["node_i"], wanted) | np.isin(columns["node_j"], wanted)
+            return {name: column[keep] for name, column in columns.items()}
+        
+        parts = [select(read()) for stats, _, read in self._chunks() if overlaps(stats)]
+        if self._fill:
+            parts.append(select({name: column[:self._fill] for name, column in self._columns.items()}))
+        columns = {
+            name: np.concatenate([part[name] for part in parts]) if parts else np.zeros(0, dtype)
+            for name, dtype in LEDGER_COLUMNS.items()
+        }
+        frame = pd.DataFrame(columns)
+        frame["event"] = np.array(LEDGER_EVENTS)[columns["event"].astype(np.intp)]
+        return frame
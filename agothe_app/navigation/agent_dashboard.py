@@ -9,6 +9,7 @@ from typing import Any, Dict, Iterable, List, Optional
 import numpy as np
 
 from ..core.quantum_consciousness import (
+    AgentPopulation,
     ConsciousnessAxiom,
     QuantumLearningNetwork,
     QuantumMemoryNetwork,
@@ -28,8 +29,15 @@ class AgentDashboard:
 
     # ------------------------------------------------------------------
     def overview(self) -> Dict[str, Any]:
-        coherence = float(np.mean([agent.coherence() for agent in self.agents]))
-        entangled = sum(1 for agent in self.agents if agent.memory_entangled)
+        if isinstance(self.agents, AgentPopulation):
+            # The population keeps a running coherence total and an
+            # entanglement registry, so the overview only pays for agents that
+            # changed since the last call.
+            coherence = self.agents.mean_coherence()
+            entangled = self.agents.entanglement.entangled_count()
+        else:
+            coherence = float(np.mean([agent.coherence() for agent in self.agents]))
+            entangled = sum(1 for agent in self.agents if agent.memory_entangled)
         return {
             "total_agents": len(self.agents),
             "active_agents": len(self.active_agents),
@@ -3,17 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Union
 
 import numpy as np
 
 from ..core.darwin_evolution_protocol import DarwinEvolutionProtocol
 from ..core.quantum_consciousness import (
+    AgentPopulation,
     ConsciousnessAxiom,
-    QuantumLearningNetwork,
-    QuantumMemoryNetwork,
-    RealityCollapseAxiom,
-    create_bloch_state,
 )
 from ..navigation.agent_dashboard import AgentDashboard
 from ..navigation.quantum_navigation import QuantumNavigation
@@ -75,31 +72,37 @@ class QuantumEnvironment:
         best = self.evolution_protocol.recursive_consciousness_evolution(
             self.agents, depth=generations, mutation_rate=mutation_rate
         )
-        return {
-            "best_agent": best.as_dict(),
-            "history": self.evolution_protocol.summary(),
-        }
+        return {"best_agent": best.as_dict(), **self.evolution_protocol.summary()}
+
+    def stream_evolution(self, generations: int, mutation_rate: float) -> Iterator[Dict[str, object]]:
+        """Yield one JSON friendly event per generation as evolution runs."""
+
+        for event in self.evolution_protocol.evolve_iter(
+            self.agents, generations=generations, mutation_rate=mutation_rate
+        ):
+            yield event.as_dict()
+
+
+def _initial_agents(
+    count: int = 4,
+    mix: Union[None, Sequence[type], Mapping[type, float]] = None,
+    seed: Optional[int] = None,
+) -> AgentPopulation:
+    # One bulk draw for states, intents and baseline memories; the agent
+    # types live in the population's int8 column and labels are generated
+    # on access, so nothing here loops per agent.
+    rng = np.random.default_rng(seed)
+    return AgentPopulation.spawn(
+        count, mix, rng=rng, memories={"baseline": rng.standard_normal((count, 3))}
+    )
 
 
-def _initial_agents(count: int = 4) -> List[ConsciousnessAxiom]:
-    agents: List[ConsciousnessAxiom] = []
-    for i in range(count):
-        theta, phi = np.random.rand(2) * np.pi
-        state = create_bloch_state(theta, phi)
-        intent = np.random.randn(3)
-        if i % 3 == 0:
-            agent = QuantumLearningNetwork(state, intent, label=f"learner_{i}")
-        elif i % 3 == 1:
-            agent = QuantumMemoryNetwork(state, intent, label=f"memory_{i}")
-        else:
-            agent = RealityCollapseAxiom(state, intent, label=f"collapser_{i}")
-        agent.store_memory("baseline", np.random.randn(3))
-        agents.append(agent)
-    return agents
-
-
-def create_environment(agent_count: int = 4) -> QuantumEnvironment:
-    agents = _initial_agents(agent_count)
+def create_environment(
+    agent_count: int = 4,
+    mix: Union[None, Sequence[type], Mapping[type, float]] = None,
+    seed: Optional[int] = None,
+) -> QuantumEnvironment:
+    agents = _initial_agents(agent_count, mix, seed)
     navigator = QuantumNavigation()
     navigator.quantum_menu(["Home", "Agents", "Quantum States", "Evolution", "Settings"])
     return QuantumEnvironment(agents=agents, navigator=navigator)
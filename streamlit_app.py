@@ -163,7 +163,10 @@ elif selected_route == "Quantum States":
     state_vector = np.array(details["state_vector"])
     probabilities = np.abs(state_vector) ** 2
 
-    state_fig = go.Figure(data=go.Bar(x=[f"|{i:02b}⟩" for i in range(len(probabilities))], y=probabilities))
+    n_qubits = max(1, (len(probabilities) - 1).bit_length())
+    state_fig = go.Figure(
+        data=go.Bar(x=[f"|{i:0{n_qubits}b}⟩" for i in range(len(probabilities))], y=probabilities)
+    )
     state_fig.update_layout(title="Measurement probabilities", xaxis_title="State", yaxis_title="Probability")
     st.plotly_chart(state_fig, use_container_width=True)
 
@@ -0,0 +1,126 @@
+"""
+Unit tests for the evolution protocol
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from agothe_app.core.darwin_evolution_protocol import DarwinEvolutionProtocol
+from agothe_app.core.diversity import NoveltySearch
+from agothe_app.core.quantum_consciousness import AgentPopulation
+
+
+def protocol(**kwargs):
+    return DarwinEvolutionProtocol(seed=7, **kwargs)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test suite for checkpoint / resume"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "run.ckpt")
+        self.population = AgentPopulation.spawn(60, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def interrupted_run(self, **kwargs):
+        """Stop a checkpointed run after six generations and resume it."""
+        events = protocol(checkpoint_path=self.path, checkpoint_every=3, **kwargs).evolve_iter(
+            self.population, generations=10
+        )
+        for _ in range(6):
+            next(events)
+        events.close()
+        resumed = protocol(**kwargs)
+        return resumed, resumed.resume(self.path)
+
+    def assertSameRun(self, expected, actual, expected_protocol, actual_protocol):
+        np.testing.assert_array_equal(expected.states, actual.states)
+        np.testing.assert_array_equal(expected.intents, actual.intents)
+        np.testing.assert_array_equal(expected.kinds, actual.kinds)
+        self.assertEqual(list(expected.labels), list(actual.labels))
+        self.assertEqual(
+            [event.as_dict() for event in expected_protocol.history],
+            [event.as_dict() for event in actual_protocol.history],
+        )
+
+    def test_resume_is_bit_identical(self):
+        """A resumed run ends exactly like an uninterrupted one"""
+        reference = protocol()
+        expected = reference.evolve_population(self.population, generations=10)
+        resumed, actual = self.interrupted_run()
+        self.assertSameRun(expected, actual, reference, resumed)
+
+    def test_resume_with_novelty_and_selection(self):
+        """Novelty archives and other operators are restored too"""
+        options = dict(selection="tournament", cache_size=1000)
+        reference = protocol(novelty=NoveltySearch(weight=0.2), **options)
+        expected = reference.evolve_population(self.population, generations=10)
+        resumed, actual = self.interrupted_run(novelty=NoveltySearch(weight=0.2), **options)
+        self.assertSameRun(expected, actual, reference, resumed)
+
+    def test_resume_rejects_plain_snapshot(self):
+        """Snapshots without checkpoint state cannot be resumed"""
+        from agothe_app.core.snapshot import save_population
+
+        save_population(self.population, self.path)
+        with self.assertRaises(ValueError):
+            protocol().resume(self.path)
+
+
+class TestIslands(unittest.TestCase):
+    """Test suite for island-model evolution"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.population = AgentPopulation.spawn(80, seed=2)
+
+    def evolve(self, processes, **kwargs):
+        return protocol(**kwargs).evolve_islands(
+            self.population, islands=4, generations=6, migration_interval=2, processes=processes
+        )
+
+    def test_same_result_for_any_process_count(self):
+        """Island runs do not depend on the worker pool"""
+        reference = self.evolve(0)
+        for processes in (1, 2):
+            evolved = self.evolve(processes)
+            np.testing.assert_array_equal(reference.states, evolved.states)
+            np.testing.assert_array_equal(reference.intents, evolved.intents)
+            np.testing.assert_array_equal(reference.kinds, evolved.kinds)
+            self.assertEqual(list(reference.labels), list(evolved.labels))
+
+    def test_population_size_kept(self):
+        """Islands keep the population size and leave the input untouched"""
+        states = self.population.states.copy()
+        evolved = self.evolve(0)
+        self.assertEqual(len(evolved), len(self.population))
+        np.testing.assert_array_equal(self.population.states, states)
+
+    def test_checkpoint_path_rejected(self):
+        """Island runs refuse to overwrite checkpoints"""
+        with self.assertRaises(ValueError):
+            self.evolve(0, checkpoint_path="unused.ckpt", checkpoint_every=1)
+
+
+class TestObjectives(unittest.TestCase):
+    """Test suite for multi-objective mode"""
+
+    def test_evaluate_agent_raises(self):
+        """A lone agent has no Pareto rank"""
+        from agothe_app.core.darwin_evolution_protocol import default_objectives
+
+        evolution = protocol(objectives=default_objectives)
+        with self.assertRaises(ValueError):
+            evolution.evaluate_agent(AgentPopulation.spawn(2, seed=0)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
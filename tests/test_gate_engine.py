@@ -0,0 +1,61 @@
+"""
+Unit tests for the fused gate-sequence engine
+"""
+
+import unittest
+
+import numpy as np
+
+from agothe_app.core.gate_engine import GateSequence
+from agothe_app.core.quantum_consciousness import AgentPopulation, QuantumLearningNetwork
+
+HADAMARD = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+PAULI_X = np.array([[0, 1], [1, 0]])
+
+
+class TestGateSequence(unittest.TestCase):
+    """Test suite for GateSequence.apply"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.sequence = GateSequence([HADAMARD, PAULI_X])
+        self.expected = PAULI_X @ HADAMARD @ np.array([1, 0])
+
+    def test_apply_to_standalone_agents(self):
+        """States of a plain list of agents are updated in place"""
+        agents = [QuantumLearningNetwork([1, 0]) for _ in range(3)]
+        states = self.sequence.apply(agents)
+        self.assertEqual(states.shape, (3, 2))
+        for agent in agents:
+            np.testing.assert_allclose(agent.state, self.expected)
+
+    def test_apply_to_mixed_agents(self):
+        """Agents from different populations each get their new state back"""
+        population = AgentPopulation.from_arrays(np.tile([1, 0], (4, 1)), np.zeros((4, 3)))
+        agents = [population[1], QuantumLearningNetwork([1, 0]), population[3]]
+        self.sequence.apply(agents)
+        for agent in agents:
+            np.testing.assert_allclose(agent.state, self.expected)
+        np.testing.assert_allclose(population[0].state, [1, 0])
+        np.testing.assert_allclose(population[2].state, [1, 0])
+
+    def test_apply_to_population_slice(self):
+        """Only the selected rows of a population change"""
+        population = AgentPopulation.from_arrays(np.tile([1, 0], (6, 1)), np.zeros((6, 3)))
+        self.sequence.apply(population, rows=slice(2, 4))
+        states = population.states
+        np.testing.assert_allclose(states[2:4], np.tile(self.expected, (2, 1)))
+        np.testing.assert_allclose(states[[0, 1, 4, 5]], np.tile([1, 0], (4, 1)))
+
+    def test_repeats_match_repeated_application(self):
+        """Folding repeats into a matrix power matches applying it repeatedly"""
+        once = AgentPopulation.from_arrays(np.tile([1, 0], (2, 1)), np.zeros((2, 3)))
+        folded = AgentPopulation.from_arrays(np.tile([1, 0], (2, 1)), np.zeros((2, 3)))
+        for _ in range(3):
+            self.sequence.apply(once)
+        self.sequence.apply(folded, repeats=3)
+        np.testing.assert_allclose(once.states, folded.states)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for the memory similarity index
+"""
+
+import unittest
+
+import numpy as np
+
+from agothe_app.core.memory_index import MemoryIndex
+
+
+def clustered(rng, count, dim=16, centres=50):
+    points = rng.standard_normal((centres, dim))
+    return points[rng.integers(centres, size=count)] + 0.1 * rng.standard_normal((count, dim))
+
+
+class TestMemoryIndex(unittest.TestCase):
+    """Test suite for MemoryIndex"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.rng = np.random.default_rng(0)
+
+    def test_small_index_is_exact(self):
+        """Below the threshold queries match brute force"""
+        vectors = self.rng.standard_normal((200, 8))
+        index = MemoryIndex()
+        index.extend((row, "m", vector) for row, vector in enumerate(vectors))
+        query = self.rng.standard_normal(8)
+        units = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(units @ query))[:5].tolist()
+        self.assertEqual([row for row, _, _ in index.query(query, 5)], expected)
+
+    def test_lsh_candidates_follow_updates(self):
+        """Added and removed memories are seen by table lookups"""
+        index = MemoryIndex(exact_threshold=256, recall_target=None, probes=2)
+        vectors = clustered(self.rng, 1000)
+        index.extend((row, "m", vector) for row, vector in enumerate(vectors))
+        group = index._groups[16]
+        self.assertIsNotNone(group.tables)
+        target = vectors[0] + 0.01
+        index.add(5000, "m", target)
+        self.assertEqual(index.query(target, 1)[0][0], 5000)
+        index.remove(5000, "m")
+        self.assertNotIn(5000, [row for row, _, _ in index.query(target, 10)])
+        for row in range(1001, 1300):
+            index.add(row, "m", vectors[row - 1001])
+        self.assertLessEqual(len(group.recent), len(group) // 8 + 64)
+        self.assertEqual(len(index), 1299)
+
+    def test_calibrated_recall(self):
+        """Calibrated queries reach the recall target on clustered memories"""
+        vectors = clustered(self.rng, 5000)
+        index = MemoryIndex(exact_threshold=1024)
+        index.extend((row, "m", vector) for row, vector in enumerate(vectors))
+        units = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        hits = 0
+        queries = clustered(np.random.default_rng(1), 50)
+        for query in queries:
+            exact = set(np.argsort(-(units @ query))[:10].tolist())
+            hits += len(exact.intersection(row for row, _, _ in index.query(query, 10)))
+        self.assertGreaterEqual(hits / 500, 0.85)
+
+
+if __name__ == "__main__":
+    unittest.main()
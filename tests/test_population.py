@@ -0,0 +1,88 @@
+"""
+Unit tests for AgentPopulation and the batched agent operations
+"""
+
+import unittest
+
+import numpy as np
+
+from agothe_app.core.quantum_consciousness import (
+    AgentPopulation,
+    QuantumLearningNetwork,
+    RealityCollapseAxiom,
+    learn_batch,
+    measure_batch,
+)
+
+
+def collapsers(size):
+    return AgentPopulation.from_arrays(
+        np.tile([1, 0], (size, 1)), np.zeros((size, 3)), kinds=RealityCollapseAxiom, seed=0
+    )
+
+
+class TestMeasureBatch(unittest.TestCase):
+    """Test suite for measure_batch memory traces"""
+
+    def test_population_traces(self):
+        """Every measured collapse agent keeps one trace per measurement"""
+        population = collapsers(5)
+        measure_batch(population)
+        measure_batch(population, rows=[1, 3])
+        self.assertEqual(sorted(population[0].memory), ["collapse_0"])
+        self.assertEqual(sorted(population[1].memory), ["collapse_0", "collapse_1"])
+        np.testing.assert_allclose(population[1].memory["collapse_1"], [0.0, 1.0])
+
+    def test_traces_match_single_agent_measure(self):
+        """Batched traces use the keys of RealityCollapseAxiom.measure"""
+        population = collapsers(2)
+        agent = RealityCollapseAxiom([1, 0])
+        for _ in range(3):
+            measure_batch(population)
+            agent.measure()
+        self.assertEqual(sorted(population[0].memory), sorted(agent.memory))
+
+    def test_mixed_agents_keep_traces(self):
+        """Agents from different populations get their traces back"""
+        population = collapsers(3)
+        agents = [population[0], RealityCollapseAxiom([0, 1]), population[2]]
+        outcomes = measure_batch(agents)
+        for agent, outcome in zip(agents, outcomes):
+            np.testing.assert_allclose(agent.memory["collapse_0"], [outcome, 1.0])
+        self.assertEqual(population[1].memory, {})
+
+    def test_traces_survive_take(self):
+        """Pending traces are carried over by take"""
+        population = collapsers(4)
+        measure_batch(population)
+        taken = population.take(np.array([3, 1]))
+        self.assertEqual(sorted(taken[0].memory), ["collapse_0"])
+
+
+class TestStandaloneAgents(unittest.TestCase):
+    """Test suite for agents created outside a population"""
+
+    def test_promotion_keeps_row(self):
+        """Moving an agent into a population keeps its data"""
+        agent = QuantumLearningNetwork([1, 1j], [1, 0, 0], label="solo", memory={"m": np.ones(2)})
+        agent.learning_rate = 0.5
+        coherence = agent.coherence()
+        population = agent.population
+        self.assertIsInstance(population, AgentPopulation)
+        self.assertEqual(agent.label, "solo")
+        self.assertEqual(agent.learning_rate, 0.5)
+        self.assertAlmostEqual(agent.coherence(), coherence)
+        np.testing.assert_allclose(agent.memory["m"], np.ones(2))
+
+    def test_learn_batch_updates_agents(self):
+        """learn_batch writes intents back to standalone agents"""
+        agents = [QuantumLearningNetwork([1, 0], [1, 0, 0]) for _ in range(3)]
+        before = [agent.intent.copy() for agent in agents]
+        learn_batch(agents, rewards=1.0, rng=0)
+        for agent, intent in zip(agents, before):
+            self.assertFalse(np.allclose(agent.intent, intent))
+            self.assertAlmostEqual(float(np.linalg.norm(agent.intent)), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
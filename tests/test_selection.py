@@ -0,0 +1,66 @@
+"""
+Unit tests for the selection operators
+"""
+
+import unittest
+
+import numpy as np
+
+from agothe_app.core.selection import (
+    SELECTION_OPERATORS,
+    TruncationSelection,
+    get_selection,
+    top_rows,
+)
+
+
+class TestSelectionOperators(unittest.TestCase):
+    """Test suite for the vectorised selection operators"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.fitness = np.random.default_rng(0).random(100)
+
+    def test_output_shapes(self):
+        """Every operator returns valid survivors and parent pairs"""
+        for name in SELECTION_OPERATORS:
+            with self.subTest(operator=name):
+                selection = get_selection(name).select(self.fitness, 0.65, np.random.default_rng(1))
+                size = len(self.fitness)
+                self.assertEqual(selection.parents.ndim, 2)
+                self.assertEqual(selection.parents.shape[1], 2)
+                self.assertTrue(np.all((selection.parents >= 0) & (selection.parents < size)))
+                self.assertTrue(np.all((selection.survivors >= 0) & (selection.survivors < size)))
+                if selection.trim:
+                    self.assertGreaterEqual(len(selection.survivors) + len(selection.parents), size)
+                else:
+                    self.assertEqual(len(selection.survivors) + len(selection.parents), size)
+
+    def test_truncation_default_fraction(self):
+        """Truncation keeps the historical 60% whatever the pressure"""
+        for pressure in (0.1, 0.65, 0.9):
+            selection = TruncationSelection().select(self.fitness, pressure, np.random.default_rng(0))
+            self.assertEqual(len(selection.survivors), 60)
+
+    def test_truncation_pressure_fraction(self):
+        """Without an elite fraction truncation follows the pressure"""
+        operator = TruncationSelection(elite_fraction=None)
+        for pressure, kept in ((0.3, 70), (0.65, 35), (0.99, 2)):
+            selection = operator.select(self.fitness, pressure, np.random.default_rng(0))
+            self.assertEqual(len(selection.survivors), kept)
+
+    def test_survivors_are_fittest(self):
+        """Truncation survivors are the top rows"""
+        selection = TruncationSelection().select(self.fitness, 0.5, np.random.default_rng(0))
+        expected = np.sort(np.argsort(-self.fitness)[:60])
+        np.testing.assert_array_equal(selection.survivors, expected)
+        np.testing.assert_array_equal(top_rows(self.fitness, 60), expected)
+
+    def test_unknown_operator(self):
+        """Unknown names raise ValueError"""
+        with self.assertRaises(ValueError):
+            get_selection("roulette")
+
+
+if __name__ == "__main__":
+    unittest.main()
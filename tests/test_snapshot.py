@@ -0,0 +1,89 @@
+"""
+Unit tests for binary population snapshots
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from agothe_app.core.precision import precision
+from agothe_app.core.quantum_consciousness import AgentPopulation, QuantumMemoryNetwork
+from agothe_app.core.snapshot import load_population, read_header, save_population
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test suite for save_population / load_population"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "population.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSamePopulation(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        np.testing.assert_array_equal(expected.states, actual.states)
+        np.testing.assert_array_equal(expected.intents, actual.intents)
+        np.testing.assert_array_equal(expected.kinds, actual.kinds)
+        np.testing.assert_array_equal(expected.coherence(), actual.coherence())
+        self.assertEqual(list(expected.labels), list(actual.labels))
+        for row in range(len(expected)):
+            self.assertIs(type(expected[row]), type(actual[row]))
+            self.assertEqual(getattr(expected[row], "learning_rate", None),
+                             getattr(actual[row], "learning_rate", None))
+            self.assertEqual(sorted(expected[row].memory), sorted(actual[row].memory))
+            for key, value in expected[row].memory.items():
+                np.testing.assert_array_equal(value, actual[row].memory[key])
+
+    def test_round_trip(self):
+        """States, labels, memories and entanglements survive a round trip"""
+        population = AgentPopulation.spawn(50, seed=1)
+        population[3].label = "renamed"
+        population[4].store_memory("grid", np.arange(12.0).reshape(3, 4))
+        population[7].store_memory("flags", np.array([True, False]))
+        population.append(np.array([0, 1]), [1, 0, 0], label="extra", kind=QuantumMemoryNetwork)
+        population.entanglement.entangle(1, 2, "shared", np.ones(3))
+        save_population(population, self.path, extra={"note": "test"})
+        self.assertEqual(read_header(self.path)["extra"], {"note": "test"})
+        for mmap in (True, False):
+            loaded = load_population(self.path, mmap=mmap)
+            self.assertSamePopulation(population, loaded)
+            np.testing.assert_array_equal(loaded[2].memory_entangled["shared"], np.ones(3))
+
+    def test_resave_loaded(self):
+        """A loaded and edited population saves and loads again"""
+        save_population(AgentPopulation.spawn(20, seed=2), self.path)
+        loaded = load_population(self.path)
+        loaded[0].label = "first"
+        loaded.set_learning_rates(0.5, rows=[1])
+        loaded[2].state = np.array([0, 1])
+        other = os.path.join(self.directory, "again.bin")
+        save_population(loaded, other)
+        self.assertSamePopulation(loaded, load_population(other))
+
+    def test_writes_do_not_touch_file(self):
+        """Edits to a memory-mapped population stay in memory"""
+        population = AgentPopulation.spawn(10, seed=3)
+        save_population(population, self.path)
+        loaded = load_population(self.path)
+        loaded[0].state = np.array([0, 1])
+        np.testing.assert_array_equal(load_population(self.path).states, population.states)
+
+    def test_single_precision(self):
+        """Single-precision populations keep their dtypes"""
+        with precision("single"):
+            population = AgentPopulation.spawn(10, seed=4)
+        save_population(population, self.path)
+        loaded = load_population(self.path)
+        self.assertEqual(loaded.states.dtype, np.complex64)
+        self.assertEqual(loaded.intents.dtype, np.float32)
+        self.assertSamePopulation(population, loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Unit tests for the wormhole engine
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from agothe_app.core.wormhole_engine import WormholeEngine, WormholeLedger
+
+
+class TestEnsemble(unittest.TestCase):
+    """Test suite for WormholeEngine.run_ensemble"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.engine = WormholeEngine()
+        self.nodes = np.random.default_rng(0).random((20, 5))
+        self.R = np.random.default_rng(1).random((6, 20))
+
+    def ensemble(self, **kwargs):
+        return self.engine.run_ensemble(self.nodes, 4, replicas=6, R=self.R, seed=3, **kwargs)
+
+    def test_results_independent_of_blocks(self):
+        """Replicas give the same results for any block size"""
+        reference = self.ensemble(processes=0, block_size=1)
+        for block_size in (2, 4, 8):
+            other = self.ensemble(processes=0, block_size=block_size)
+            np.testing.assert_array_equal(reference.phi, other.phi)
+            np.testing.assert_array_equal(reference.wormholes, other.wormholes)
+            np.testing.assert_array_equal(reference.nodes, other.nodes)
+
+    def test_results_independent_of_processes(self):
+        """A process pool reproduces the in-process run"""
+        reference = self.ensemble(processes=0, block_size=2)
+        pooled = self.ensemble(processes=2, block_size=2)
+        np.testing.assert_array_equal(reference.phi, pooled.phi)
+        np.testing.assert_array_equal(reference.nodes, pooled.nodes)
+
+    def test_uncounted_wormholes(self):
+        """Uncounted wormholes are NaN and left out of the stats"""
+        run = self.ensemble(processes=0, wormholes=False)
+        self.assertEqual(run.phi.shape, (5, 6))
+        self.assertTrue(np.isnan(run.wormholes).all())
+        stats = self.engine.export_stats(run)
+        self.assertEqual(set(stats["metric"]), {"phi"})
+
+    def test_counted_wormholes(self):
+        """Counted wormholes match compute_wormholes on the final nodes"""
+        run = self.ensemble(processes=0)
+        counts = [self.engine.compute_wormholes(replica)[1] for replica in run.nodes]
+        np.testing.assert_array_equal(run.wormholes[-1], counts)
+        self.assertEqual(set(self.engine.export_stats(run)["metric"]), {"phi", "wormholes"})
+
+
+class TestLedger(unittest.TestCase):
+    """Test suite for WormholeLedger"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def filled(self, name, format="binary"):
+        ledger = WormholeLedger(os.path.join(self.directory, name), chunk_size=4, format=format)
+        for t in range(5):
+            pairs = np.array([[t, t + 1], [t, t + 2]])
+            ledger.record_events(t, pairs, np.array([0.1, 0.2]) + t, 0.5)
+        ledger.record_event(5, 0, 9, 0.3, 0.6, event="broken")
+        return ledger
+
+    def test_read_back(self):
+        """Flushed and buffered events are all loaded, in order"""
+        ledger = self.filled("ledger.bin")
+        self.assertEqual(len(ledger), 11)
+        frame = ledger.load()
+        self.assertEqual(len(frame), 11)
+        self.assertEqual(frame["timestep"].tolist(), [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5])
+        self.assertEqual(frame["event"].iloc[-1], "broken")
+        ledger.save()
+        reopened = WormholeLedger(ledger.filepath, format="binary")
+        self.assertEqual(len(reopened), 11)
+        pd.testing.assert_frame_equal(reopened.load(), frame)
+
+    def test_filters(self):
+        """Timestep and node filters match filtering the full frame"""
+        ledger = self.filled("ledger.bin")
+        ledger.save()
+        frame = ledger.load()
+        window = ledger.load(timesteps=(1, 3))
+        self.assertEqual(sorted(set(window["timestep"])), [1, 2, 3])
+        touching = ledger.load(nodes=[9, 3])
+        expected = frame[frame["node_i"].isin([9, 3]) | frame["node_j"].isin([9, 3])]
+        pd.testing.assert_frame_equal(touching.reset_index(drop=True), expected.reset_index(drop=True))
+        self.assertEqual(len(ledger.load(timesteps=(None, -1))), 0)
+
+    def test_csv_ledger(self):
+        """CSV ledgers written by earlier releases stay readable"""
+        path = os.path.join(self.directory, "old.csv")
+        pd.DataFrame({"timestep": [1, 2], "node_i": [0, 3], "node_j": [1, 4],
+                      "distance": [0.1, 0.2], "phi": [0.5, 0.6]}).to_csv(path, index=False)
+        ledger = WormholeLedger(path)
+        self.assertEqual(ledger.format, "csv")
+        self.assertEqual(len(ledger), 2)
+        ledger.record_event(3, 5, 6, 0.3, 0.7)
+        ledger.save()
+        frame = WormholeLedger(path).load(nodes=[5])
+        self.assertEqual(frame["timestep"].tolist(), [3])
+        self.assertEqual(WormholeLedger(path).load()["event"].tolist(), ["formed"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()